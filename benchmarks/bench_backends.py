@@ -0,0 +1,55 @@
+import tempfile
+import timeit
+from pathlib import Path
+
+from paper_todo import journal
+from paper_todo.models import AppState, Task
+from paper_todo.sqlite_storage import SqliteBackend
+from paper_todo.storage import JsonBackend, StorageBackend
+
+
+def _state(backlog_size: int) -> AppState:
+    state = AppState()
+    for i, task in enumerate(state.tasks):
+        task.text = f"Task number {i + 1} with a realistic description"
+    state.backlog = [Task(text=f"Backlog task {i} with a realistic description") for i in range(backlog_size)]
+    state.timer.start(task_index=1, duration_minutes=30)
+    return state
+
+
+def _backends(tmp: Path) -> dict[str, StorageBackend]:
+    return {
+        "json": JsonBackend(tmp / "state.json"),
+        "sqlite": SqliteBackend(tmp / "state.db"),
+    }
+
+
+def _report(label: str, seconds: float, number: int) -> None:
+    print(f"{label:<32} {seconds / number * 1e6:9.1f} us")
+
+
+def _tick_update(backend: StorageBackend, state: AppState) -> None:
+    state.revision += 1
+    record = {**journal.timer_changed("timer_updated", state.timer), "rev": state.revision}
+    backend.write(state, [record], snapshot=False)
+
+
+def main(number: int = 500, backlog_sizes: tuple[int, ...] = (0, 1_000, 10_000)) -> None:
+    for backlog_size in backlog_sizes:
+        state = _state(backlog_size)
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, backend in _backends(Path(tmp)).items():
+                backend.write(state, [], snapshot=True)
+                label = f"{name} backlog={backlog_size}"
+                _report(f"{label} tick", timeit.timeit(lambda: _tick_update(backend, state), number=number), number)
+                _report(
+                    f"{label} snapshot",
+                    timeit.timeit(lambda: backend.write(state, [], snapshot=True), number=number // 10),
+                    number // 10,
+                )
+                _report(f"{label} load", timeit.timeit(backend.load, number=number // 10), number // 10)
+                backend.close()
+
+
+if __name__ == "__main__":
+    main()
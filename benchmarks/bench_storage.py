@@ -0,0 +1,53 @@
+import json
+import tempfile
+import timeit
+from pathlib import Path
+
+from paper_todo.models import AppState
+from paper_todo.storage import _encode_state, _parse_state_file, _write_state, orjson
+
+
+def _legacy_load(state_file: Path) -> AppState:
+    return AppState.model_validate(json.loads(state_file.read_text()))
+
+
+def _legacy_save(state: AppState, state_file: Path) -> None:
+    state_file.write_text(state.model_dump_json(indent=2))
+
+
+def _realistic_state() -> AppState:
+    state = AppState()
+    for i, task in enumerate(state.tasks):
+        task.text = f"Task number {i + 1} with a realistic description"
+        task.completed = i % 3 == 0
+    state.timer.start(task_index=1, duration_minutes=30)
+    return state
+
+
+def _report(label: str, seconds: float, number: int) -> None:
+    print(f"{label:<24} {seconds / number * 1e6:9.1f} us")
+
+
+def main(number: int = 2000) -> None:
+    state = _realistic_state()
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_file = Path(tmp) / "legacy.json"
+        compact_file = Path(tmp) / "state.json"
+        _legacy_save(state, legacy_file)
+        _write_state(state, compact_file)
+
+        print(f"json backend: {'orjson' if orjson is not None else 'json'}")
+        _report("legacy encode", timeit.timeit(lambda: state.model_dump_json(indent=2), number=number), number)
+        _report("compact encode", timeit.timeit(lambda: _encode_state(state), number=number), number)
+        _report("legacy save", timeit.timeit(lambda: _legacy_save(state, legacy_file), number=number), number)
+        _report("compact save", timeit.timeit(lambda: _write_state(state, compact_file), number=number), number)
+        _report("legacy load", timeit.timeit(lambda: _legacy_load(legacy_file), number=number), number)
+        _report(
+            "compact load",
+            timeit.timeit(lambda: _parse_state_file(compact_file.read_bytes()), number=number),
+            number,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+
+from textual.pilot import Pilot
+from textual.screen import Screen
+
+from paper_todo.animation import get_scheduler
+from paper_todo.app import PaperTodoApp, StartTimerConfirmScreen, TaskInputScreen
+from paper_todo.history import HistoryStore
+from paper_todo.models import AppState
+from paper_todo.notifications import Notifier, NullBackend
+from paper_todo.storage import save_state
+
+LAG_PROBE_MS = 5
+TERMINAL_SIZE = (120, 40)
+BREAK_SECONDS = 600
+
+Scenario = Callable[[PaperTodoApp, Pilot, argparse.Namespace], Awaitable[None]]
+SCENARIOS: dict[str, tuple[Callable[[], AppState], Scenario]] = {}
+
+
+def scenario(name: str, make_state: Callable[[], AppState]) -> Callable[[Scenario], Scenario]:
+    def register(run: Scenario) -> Scenario:
+        SCENARIOS[name] = (make_state, run)
+        return run
+
+    return register
+
+
+@dataclass
+class Samples:
+    # Seconds: frames applying widget state, frame applied to screen refreshed, every compositor pass,
+    # and how late an event-loop probe woke up.
+    apply: list[float] = field(default_factory=list)
+    present: list[float] = field(default_factory=list)
+    repaint: list[float] = field(default_factory=list)
+    loop_lag: list[float] = field(default_factory=list)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def summarize(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50_ms": _percentile(values, 50) * 1000,
+        "p95_ms": _percentile(values, 95) * 1000,
+        "p99_ms": _percentile(values, 99) * 1000,
+        "max_ms": max(values) * 1000,
+    }
+
+
+@contextmanager
+def _timed_repaints(samples: Samples) -> Iterator[None]:
+    originals = {name: getattr(Screen, name) for name in ("_compositor_refresh", "_refresh_layout")}
+
+    def timed(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                samples.repaint.append(time.perf_counter() - started)
+
+        return wrapper
+
+    for name, method in originals.items():
+        setattr(Screen, name, timed(method))
+    try:
+        yield
+    finally:
+        for name, method in originals.items():
+            setattr(Screen, name, method)
+
+
+async def _probe_loop_lag(samples: Samples) -> None:
+    interval = LAG_PROBE_MS / 1000
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        samples.loop_lag.append(max(0.0, loop.time() - started - interval))
+
+
+async def _wait_for(pilot: Pilot, condition: Callable[[], bool], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("scenario did not reach the expected state")
+        await pilot.pause(0.01)
+
+
+def _tasks_state() -> AppState:
+    state = AppState()
+    for i, task in enumerate(state.tasks[:5]):
+        task.text = f"Task number {i + 1} with a realistic description"
+    return state
+
+
+def _break_state() -> AppState:
+    state = _tasks_state()
+    state.timer.start(None, BREAK_SECONDS // 60, is_break=True)
+    return state
+
+
+@scenario("start_flow", _tasks_state)
+async def _start_flow(app: PaperTodoApp, pilot: Pilot, args: argparse.Namespace) -> None:
+    for _ in range(args.iterations):
+        await pilot.press("s")
+        await _wait_for(pilot, lambda: isinstance(app.screen, StartTimerConfirmScreen))
+        await pilot.press("enter")
+        await _wait_for(pilot, lambda: app.state.timer.running and app.progress_bar._bar_state == "running")
+        await pilot.press("e")
+        await _wait_for(pilot, lambda: not app.state.timer.running)
+
+
+@scenario("break_rainbow", _break_state)
+async def _break_rainbow(app: PaperTodoApp, pilot: Pilot, args: argparse.Namespace) -> None:
+    # The whole ten minutes of fill are replayed over --break-seconds while the rainbow loop runs.
+    steps = max(1, int(args.break_seconds * 10))
+    for step in range(steps + 1):
+        app.progress_bar.update_fill(BREAK_SECONDS * step // steps, BREAK_SECONDS)
+        await asyncio.sleep(args.break_seconds / steps)
+
+
+@scenario("theme_toggles", _tasks_state)
+async def _theme_toggles(app: PaperTodoApp, pilot: Pilot, args: argparse.Namespace) -> None:
+    for _ in range(args.iterations * 10):
+        await pilot.press("t")
+        await pilot.pause()
+
+
+@scenario("rapid_edits", _tasks_state)
+async def _rapid_edits(app: PaperTodoApp, pilot: Pilot, args: argparse.Namespace) -> None:
+    for edit in range(args.iterations * 6):
+        slot = edit % 6
+        await pilot.press(str(slot + 1))
+        await _wait_for(pilot, lambda: isinstance(app.screen, TaskInputScreen))
+        app.screen.query_one("#task-input").value = f"Edited task {edit}"
+        await pilot.press("enter")
+        await _wait_for(pilot, lambda: app.state.tasks[slot].text == f"Edited task {edit}")
+
+
+async def run_scenario(name: str, args: argparse.Namespace) -> dict:
+    make_state, run = SCENARIOS[name]
+    random.seed(args.seed)
+    samples = Samples()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["XDG_DATA_HOME"] = tmp
+        save_state(make_state())
+        app = PaperTodoApp(notifier=Notifier(NullBackend()), history=HistoryStore(Path(tmp) / "history.jsonl"))
+        async with app.run_test(size=TERMINAL_SIZE) as pilot:
+            await pilot.pause()
+            scheduler = get_scheduler()
+
+            def observe(apply: float, present: float) -> None:
+                samples.apply.append(apply)
+                samples.present.append(present)
+
+            scheduler.frame_observers.append(observe)
+            probe = asyncio.create_task(_probe_loop_lag(samples))
+
+            gc.collect()
+            gc_before = [generation["collections"] for generation in gc.get_stats()]
+            blocks_before = sys.getallocatedblocks()
+            if args.trace_malloc:
+                tracemalloc.start()
+            started = time.perf_counter()
+            with _timed_repaints(samples):
+                await run(app, pilot, args)
+                await pilot.pause()
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if args.trace_malloc else None
+            tracemalloc.stop()
+            blocks_after = sys.getallocatedblocks()
+            gc_after = [generation["collections"] for generation in gc.get_stats()]
+
+            probe.cancel()
+            scheduler.frame_observers.clear()
+
+    return {
+        "elapsed_s": elapsed,
+        "apply": summarize(samples.apply),
+        "present": summarize(samples.present),
+        "repaint": summarize(samples.repaint),
+        "loop_lag": summarize(samples.loop_lag),
+        "allocations": {
+            "net_blocks": blocks_after - blocks_before,
+            "gc_collections": [after - before for before, after in zip(gc_before, gc_after)],
+            "tracemalloc_peak_bytes": peak,
+        },
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="benchmarks.bench_ui", description="Report frame-time statistics for headless UI scenarios")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--iterations", type=int, default=3, help="repetitions within each scenario")
+    parser.add_argument("--break-seconds", type=float, default=5.0, help="wall time for the ten-minute break")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the duration and task rolls")
+    parser.add_argument("--trace-malloc", action="store_true", help="also record the tracemalloc peak (slower)")
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    names = args.scenarios or list(SCENARIOS)
+    if unknown := [name for name in names if name not in SCENARIOS]:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+    data_home = os.environ.get("XDG_DATA_HOME")
+    try:
+        report = {name: asyncio.run(run_scenario(name, args)) for name in names}
+    finally:
+        if data_home is None:
+            os.environ.pop("XDG_DATA_HOME", None)
+        else:
+            os.environ["XDG_DATA_HOME"] = data_home
+
+    document = json.dumps({"terminal_size": TERMINAL_SIZE, "scenarios": report}, indent=2)
+    if args.output:
+        args.output.write_text(document)
+    else:
+        print(document)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from paper_todo.animation import (
+    _ease_out_curve,
+    _knight_rider_frames,
+    generate_knight_rider_frames,
+    generate_slide_frames,
+)
+from paper_todo.models import MAX_TASKS, TASK_CHAR_LIMIT, AppState, Task, get_incomplete_task_indices
+from paper_todo.storage import load_state, save_state
+from paper_todo.theme import ThemeMode
+from paper_todo.widgets.progress_track import _render_track
+
+DEFAULT_BASELINE = Path(".benchmarks") / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+TRACK_WIDTHS = (40, 80, 160, 400)
+REPEAT = 5
+
+Setup = Callable[[Path], Callable[[], object]]
+BENCHMARKS: dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _realistic_state() -> AppState:
+    state = AppState()
+    for i, task in enumerate(state.tasks):
+        task.text = f"Task number {i + 1} with a realistic description"
+        task.completed = i % 3 == 0
+    state.backlog = [Task(text=f"Backlog task {i}") for i in range(20)]
+    state.timer.start(task_index=1, duration_minutes=30)
+    return state
+
+
+def _oversized_state() -> AppState:
+    state = _realistic_state()
+    state.backlog = [Task(text=f"{i:05d} ".ljust(TASK_CHAR_LIMIT, "x")) for i in range(10_000)]
+    return state
+
+
+@benchmark("knight_rider.cold")
+def _knight_rider_cold(tmp: Path) -> Callable[[], object]:
+    def run() -> object:
+        _knight_rider_frames.cache_clear()
+        return generate_knight_rider_frames(range(MAX_TASKS), final_index=3)
+
+    return run
+
+
+@benchmark("knight_rider.cached")
+def _knight_rider_cached(tmp: Path) -> Callable[[], object]:
+    return lambda: generate_knight_rider_frames(range(MAX_TASKS), final_index=3)
+
+
+@benchmark("slide_frames.cold")
+def _slide_frames_cold(tmp: Path) -> Callable[[], object]:
+    def run() -> object:
+        _ease_out_curve.cache_clear()
+        return generate_slide_frames(0.0, 1.0)
+
+    return run
+
+
+@benchmark("slide_frames.cached")
+def _slide_frames_cached(tmp: Path) -> Callable[[], object]:
+    return lambda: generate_slide_frames(0.0, 1.0)
+
+
+def _register_storage(label: str, make_state: Callable[[], AppState]) -> None:
+    @benchmark(f"save_state.{label}")
+    def _save(tmp: Path) -> Callable[[], object]:
+        state = make_state()
+        state_file = tmp / f"save-{label}.json"
+        return lambda: save_state(state, state_file)
+
+    @benchmark(f"load_state.{label}")
+    def _load(tmp: Path) -> Callable[[], object]:
+        state_file = tmp / f"load-{label}.json"
+        save_state(make_state(), state_file)
+        return lambda: load_state(state_file)
+
+
+_register_storage("realistic", _realistic_state)
+_register_storage("oversized", _oversized_state)
+
+
+@benchmark("incomplete_indices.state")
+def _incomplete_indices_state(tmp: Path) -> Callable[[], object]:
+    return _realistic_state().get_incomplete_task_indices
+
+
+@benchmark("incomplete_indices.scan")
+def _incomplete_indices_scan(tmp: Path) -> Callable[[], object]:
+    tasks = _realistic_state().tasks
+    return lambda: get_incomplete_task_indices(tasks)
+
+
+def _register_track(width: int) -> None:
+    # ProgressBarTimer._update_fill hands the string building to _render_track; __wrapped__ skips its cache.
+    render = _render_track.__wrapped__
+
+    @benchmark(f"track.fill.width={width}")
+    def _fill(tmp: Path) -> Callable[[], object]:
+        return lambda: render(width, width * 2 // 3, ThemeMode.DARK, False, 0)
+
+    @benchmark(f"track.rainbow.width={width}")
+    def _rainbow(tmp: Path) -> Callable[[], object]:
+        return lambda: render(width, width * 2 // 3, ThemeMode.DARK, True, 1)
+
+
+for _width in TRACK_WIDTHS:
+    _register_track(_width)
+
+
+def measure(func: Callable[[], object], repeat: int = REPEAT) -> dict:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return {"seconds": best / number, "number": number}
+
+
+def run_benchmarks(names: list[str], repeat: int = REPEAT) -> dict[str, dict]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            results[name] = measure(BENCHMARKS[name](Path(tmp)), repeat)
+    return results
+
+
+def compare(baseline: dict[str, dict], results: dict[str, dict], threshold: float) -> list[str]:
+    return [
+        name
+        for name, result in results.items()
+        if name in baseline and result["seconds"] > baseline[name]["seconds"] * (1 + threshold)
+    ]
+
+
+def _environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system()}
+
+
+def _report(name: str, result: dict, baseline: dict | None) -> None:
+    line = f"{name:<32} {result['seconds'] * 1e6:11.2f} us"
+    if baseline is not None:
+        line += f"  {result['seconds'] / baseline['seconds'] - 1:+7.1%}"
+    print(line)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="benchmarks.suite", description="Micro-benchmarks for the pure hot paths")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timing repeats; the fastest is kept")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file")
+    parser.add_argument("--check", action="store_true", help="fail if any result regresses past the threshold")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--output", type=Path, help="also write the results to this JSON file")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    names = [name for name in BENCHMARKS if args.filter in name]
+
+    baseline: dict[str, dict] = {}
+    if args.check:
+        try:
+            document = json.loads(args.baseline.read_text())
+        except (OSError, ValueError):
+            print(f"No baseline at {args.baseline}; record one with --save-baseline", file=sys.stderr)
+            return 2
+        baseline = document["results"]
+        if document.get("environment") != _environment():
+            print(f"warning: baseline was recorded on {document.get('environment')}", file=sys.stderr)
+
+    results = run_benchmarks(names, args.repeat)
+    for name, result in results.items():
+        _report(name, result, baseline.get(name))
+
+    document = {"environment": _environment(), "results": results}
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2))
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(document, indent=2))
+
+    if args.check:
+        regressions = compare(baseline, results, args.threshold)
+        for name in regressions:
+            print(f"REGRESSION {name}: more than {args.threshold:.0%} slower than baseline", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,15 @@
 import asyncio
+import math
+import time
+import weakref
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Callable
+from functools import lru_cache
+from itertools import accumulate, cycle, islice
+from typing import Callable, Iterable, Sequence, overload
+
+from paper_todo import tracing
 
 KNIGHT_RIDER_TOTAL_MS = 3200
 KNIGHT_RIDER_INITIAL_DELAY_MS = 34
@@ -8,9 +17,17 @@ KNIGHT_RIDER_FINAL_DELAY_MS = 250
 DECELERATION_EXPONENT = 1.5
 
 SLIDE_DURATION_MS = 400
+SLIDE_FPS = 30
 FADE_DURATION_MS = 250
 RAINBOW_CYCLE_MS = 100
 
+MIN_FRAME_INTERVAL_MS = 16
+MAX_FRAME_INTERVAL_MS = 250
+FRAME_COST_HEADROOM = 2.0
+FRAME_COST_SMOOTHING = 0.3
+
+FRAME_CACHE_SIZE = 64
+
 
 @dataclass(frozen=True)
 class AnimationFrame:
@@ -18,64 +35,327 @@ class AnimationFrame:
     delay_ms: float
 
 
+# Frames stored as flat index/delay arrays plus cumulative start offsets in ms.
+class FrameSequence(Sequence[AnimationFrame]):
+    __slots__ = ("_indices", "_delays", "_offsets")
+
+    def __init__(self, indices: Iterable[int], delays: Iterable[float]) -> None:
+        self._indices = array("q", indices)
+        self._delays = array("d", delays)
+        self._offsets = array("d", accumulate(self._delays, initial=0.0))
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[AnimationFrame]) -> "FrameSequence":
+        if isinstance(frames, FrameSequence):
+            return frames
+        return cls((frame.index for frame in frames), (frame.delay_ms for frame in frames))
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @overload
+    def __getitem__(self, i: int) -> AnimationFrame: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[AnimationFrame]: ...
+
+    def __getitem__(self, i: int | slice) -> AnimationFrame | list[AnimationFrame]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return AnimationFrame(index=self._indices[i], delay_ms=self._delays[i])
+
+    def index_at(self, i: int) -> int:
+        return self._indices[i]
+
+    def offset_ms(self, i: int) -> float:
+        return self._offsets[i]
+
+    @property
+    def offsets_ms(self) -> Sequence[float]:
+        return self._offsets
+
+    @property
+    def total_ms(self) -> float:
+        return self._offsets[-1]
+
+
+_EMPTY_FRAMES = FrameSequence((), ())
+
+
 def generate_knight_rider_frames(
-    positions: list[int],
+    positions: Sequence[int],
     *,
     final_index: int | None = None,
     num_cycles: int = 3,
     initial_delay_ms: float = KNIGHT_RIDER_INITIAL_DELAY_MS,
     final_delay_ms: float = KNIGHT_RIDER_FINAL_DELAY_MS,
     exponent: float = DECELERATION_EXPONENT,
-) -> list[AnimationFrame]:
+    total_ms: float = KNIGHT_RIDER_TOTAL_MS,
+) -> FrameSequence:
     if not positions:
-        return []
+        return _EMPTY_FRAMES
 
     if final_index is None:
         import random
         final_index = random.choice(positions)
 
-    sequence = []
-    for _ in range(num_cycles):
-        sequence.extend(positions)
-        if len(positions) > 2:
-            sequence.extend(reversed(positions[1:-1]))
+    return _knight_rider_frames(
+        tuple(positions), final_index, num_cycles, initial_delay_ms, final_delay_ms, exponent, total_ms
+    )
 
-    final_pos_in_sequence = None
-    for i in range(len(sequence) - 1, -1, -1):
-        if sequence[i] == final_index:
-            final_pos_in_sequence = i
-            break
 
-    if final_pos_in_sequence is not None:
-        sequence = sequence[: final_pos_in_sequence + 1]
-    else:
+@lru_cache(maxsize=FRAME_CACHE_SIZE)
+def _knight_rider_frames(
+    positions: tuple[int, ...],
+    final_index: int,
+    num_cycles: int,
+    initial_delay_ms: float,
+    final_delay_ms: float,
+    exponent: float,
+    total_ms: float,
+) -> FrameSequence:
+    try:
+        final_pos = positions.index(final_index)
+    except ValueError:
+        final_pos = None
+
+    # Cap the sweep so that, once delays are scaled into total_ms, the fastest frame is no
+    # shorter than MIN_FRAME_INTERVAL_MS. Large position sets are subsampled with a stride
+    # aligned to the final stop so it is always visited.
+    mean_delay_ms = initial_delay_ms + (final_delay_ms - initial_delay_ms) / (exponent + 1)
+    max_speedup = max(initial_delay_ms, MIN_FRAME_INTERVAL_MS) / MIN_FRAME_INTERVAL_MS
+    max_frames = max(1, int(total_ms * max_speedup / mean_delay_ms))
+    max_positions = max(2, max_frames // (2 * max(num_cycles, 1)) + 1)
+    stride = math.ceil(len(positions) / max_positions)
+    if stride > 1:
+        offset = final_pos % stride if final_pos is not None else 0
+        positions = positions[offset::stride]
+        if final_pos is not None:
+            final_pos //= stride
+
+    n = len(positions)
+    sweep = positions + positions[-2:0:-1] if n > 2 else positions
+    if final_pos is None or num_cycles < 1:
+        sequence = array("q", islice(cycle(sweep), len(sweep) * max(num_cycles, 0)))
         sequence.append(final_index)
+    else:
+        # Last visit of final_pos within a sweep: on the way back for interior positions.
+        last_visit = 2 * n - 2 - final_pos if n > 2 and 0 < final_pos < n - 1 else final_pos
+        num_frames = (num_cycles - 1) * len(sweep) + last_visit + 1
+        sequence = array("q", islice(cycle(sweep), num_frames))
 
     num_frames = len(sequence)
-    if num_frames == 0:
-        return []
+    span = max(num_frames - 1, 1)
+    delays = array(
+        "d",
+        (initial_delay_ms + (final_delay_ms - initial_delay_ms) * ((i / span) ** exponent) for i in range(num_frames)),
+    )
+    natural_ms = sum(delays)
+    if natural_ms > total_ms:
+        scale = total_ms / natural_ms
+        delays = array("d", (delay * scale for delay in delays))
+
+    return FrameSequence(sequence, delays)
+
+
+class FramePacer:
+    def __init__(
+        self,
+        *,
+        min_interval_ms: float = MIN_FRAME_INTERVAL_MS,
+        max_interval_ms: float = MAX_FRAME_INTERVAL_MS,
+        headroom: float = FRAME_COST_HEADROOM,
+        smoothing: float = FRAME_COST_SMOOTHING,
+    ) -> None:
+        self._min_interval = min_interval_ms / 1000
+        self._max_interval = max_interval_ms / 1000
+        self._headroom = headroom
+        self._smoothing = smoothing
+        self.frame_cost = 0.0
+
+    def record(self, cost: float) -> None:
+        self.frame_cost += (cost - self.frame_cost) * self._smoothing
+
+    @property
+    def interval(self) -> float:
+        return min(self._max_interval, max(self._min_interval, self.frame_cost * self._headroom))
+
+
+class Timeline:
+    def __init__(
+        self,
+        frames: Sequence[AnimationFrame],
+        on_frame: Callable[[int], None],
+        start: float,
+        future: asyncio.Future[int],
+    ) -> None:
+        self._frames = FrameSequence.from_frames(frames)
+        self._start = start
+        self.end = start + self._frames.total_ms / 1000
+        self._on_frame = on_frame
+        self._future = future
+        self._position = 0
+        self._last_applied = float("-inf")
+
+    @property
+    def done(self) -> bool:
+        return self._future.done()
 
-    frames = []
-    for i, pos in enumerate(sequence):
-        progress = i / max(num_frames - 1, 1)
-        delay = initial_delay_ms + (final_delay_ms - initial_delay_ms) * (progress**exponent)
-        frames.append(AnimationFrame(index=pos, delay_ms=delay))
+    def next_deadline(self, min_interval: float) -> float:
+        if self._position < len(self._frames):
+            deadline = self._start + self._frames.offset_ms(self._position) / 1000
+            return max(deadline, self._last_applied + min_interval)
+        return self.end
 
-    return frames
+    def advance(self, now: float, min_interval: float) -> bool:
+        # Only the latest due frame is applied; frames that are already late are dropped, and
+        # intermediate frames are held back while the terminal is slower than min_interval.
+        frames = self._frames
+        applied = False
+        elapsed_ms = (now - self._start) * 1000
+        due = bisect_right(frames.offsets_ms, elapsed_ms, lo=self._position, hi=len(frames))
+        previous = self._position
+        is_final = due == len(frames)
+        if due > self._position and (is_final or now - self._last_applied >= min_interval):
+            self._position = due
+            self._last_applied = now
+            with tracing.span("frame", "animation", position=due - 1, dropped=due - 1 - previous):
+                self._on_frame(frames.index_at(due - 1))
+            applied = True
+        if self._position == len(frames) and now >= self.end:
+            self._future.set_result(frames.index_at(-1))
+        return applied
+
+    def fail(self, exc: BaseException) -> None:
+        if not self._future.done():
+            self._future.set_exception(exc)
+
+    def cancel(self) -> None:
+        self._future.cancel()
+
+
+class RepeatingTimeline:
+    def __init__(self, interval_ms: float, on_tick: Callable[[int], None], start: float) -> None:
+        self._interval = interval_ms / 1000
+        self._on_tick = on_tick
+        self._start = start
+        self._tick = 0
+        self._last_applied = float("-inf")
+        self._cancelled = False
+
+    @property
+    def done(self) -> bool:
+        return self._cancelled
+
+    def next_deadline(self, min_interval: float) -> float:
+        return max(self._start + (self._tick + 1) * self._interval, self._last_applied + min_interval)
+
+    def advance(self, now: float, min_interval: float) -> bool:
+        tick = int((now - self._start) / self._interval + 1e-9)
+        if tick > self._tick and now - self._last_applied >= min_interval:
+            self._tick = tick
+            self._last_applied = now
+            with tracing.span("tick", "animation", tick=tick):
+                self._on_tick(tick)
+            return True
+        return False
+
+    def fail(self, exc: BaseException) -> None:
+        self.cancel()
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+
+class AnimationScheduler:
+    def __init__(self, loop: asyncio.AbstractEventLoop, pacer: FramePacer | None = None) -> None:
+        self._loop = loop
+        self._timelines: list[Timeline | RepeatingTimeline] = []
+        self._handle: asyncio.TimerHandle | None = None
+        self.pacer = pacer or FramePacer()
+        # Schedules a callback for after the next screen refresh (e.g. App.call_after_refresh),
+        # so frame cost covers painting and not just applying widget state.
+        self.presenter: Callable[[Callable[[], None]], object] | None = None
+        # Called with (apply_seconds, present_seconds) for every frame that changed widget state.
+        self.frame_observers: list[Callable[[float, float], None]] = []
+
+    def play(self, frames: Sequence[AnimationFrame], on_frame: Callable[[int], None]) -> asyncio.Future[int]:
+        future: asyncio.Future[int] = self._loop.create_future()
+        if not frames:
+            future.set_result(-1)
+            return future
+        self._add(Timeline(frames, on_frame, self._loop.time(), future))
+        return future
+
+    def repeat(self, interval_ms: float, on_tick: Callable[[int], None]) -> RepeatingTimeline:
+        timeline = RepeatingTimeline(interval_ms, on_tick, self._loop.time())
+        self._add(timeline)
+        return timeline
+
+    def _add(self, timeline: Timeline | RepeatingTimeline) -> None:
+        self._timelines.append(timeline)
+        self._run()
+
+    def _run(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        now = self._loop.time()
+        min_interval = self.pacer.interval
+        started = time.perf_counter()
+        applied = False
+        for timeline in list(self._timelines):
+            if timeline.done:
+                continue
+            try:
+                applied = timeline.advance(now, min_interval) or applied
+            except Exception as exc:
+                timeline.fail(exc)
+
+        if applied:
+            self._measure(started, time.perf_counter())
+
+        self._timelines = [timeline for timeline in self._timelines if not timeline.done]
+        if self._timelines:
+            next_deadline = min(timeline.next_deadline(min_interval) for timeline in self._timelines)
+            self._handle = self._loop.call_at(next_deadline, self._run)
+
+    def _measure(self, started: float, applied: float) -> None:
+        def presented() -> None:
+            finished = time.perf_counter()
+            self.pacer.record(finished - started)
+            for observer in self.frame_observers:
+                observer(applied - started, finished - applied)
+
+        if self.presenter is None:
+            presented()
+        else:
+            self.presenter(presented)
+
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AnimationScheduler]" = weakref.WeakKeyDictionary()
+
+
+def get_scheduler() -> AnimationScheduler:
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _schedulers[loop] = AnimationScheduler(loop)
+    return scheduler
 
 
 async def run_animation(
-    frames: list[AnimationFrame],
+    frames: Sequence[AnimationFrame],
     on_frame: Callable[[int], None],
 ) -> int:
-    if not frames:
-        return -1
+    return await get_scheduler().play(frames, on_frame)
 
-    for frame in frames:
-        on_frame(frame.index)
-        await asyncio.sleep(frame.delay_ms / 1000)
 
-    return frames[-1].index
+@lru_cache(maxsize=32)
+def _ease_out_curve(duration_ms: float, fps: int) -> tuple[float, ...]:
+    num_frames = max(1, int(duration_ms / 1000 * fps))
+    return tuple(1 - (1 - i / num_frames) ** 2 for i in range(num_frames + 1))
 
 
 def generate_slide_frames(
@@ -83,16 +363,17 @@ def generate_slide_frames(
     end_position: float,
     *,
     duration_ms: float = SLIDE_DURATION_MS,
-    fps: int = 30,
+    fps: int = SLIDE_FPS,
 ) -> list[float]:
-    num_frames = max(1, int(duration_ms / 1000 * fps))
-    positions = []
-    for i in range(num_frames + 1):
-        progress = i / num_frames
-        eased = 1 - (1 - progress) ** 2
-        pos = start_position + (end_position - start_position) * eased
-        positions.append(pos)
-    return positions
+    span = end_position - start_position
+    return [start_position + span * eased for eased in _ease_out_curve(duration_ms, fps)]
+
+
+@lru_cache(maxsize=32)
+def slide_timeline(duration_ms: float = SLIDE_DURATION_MS, fps: int = SLIDE_FPS) -> FrameSequence:
+    num_frames = len(_ease_out_curve(duration_ms, fps)) - 1
+    frame_ms = duration_ms / num_frames
+    return FrameSequence(range(num_frames + 1), [frame_ms] * num_frames + [0.0])
 
 
 RAINBOW_COLORS = [
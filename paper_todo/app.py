@@ -1,38 +1,38 @@
 import asyncio
-import subprocess
+from collections.abc import Mapping
 from pathlib import Path
 
-from textual import on, work
+from textual import events, on, work
+from textual.actions import ActionParseResult
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Vertical
+from textual.dom import DOMNode
 from textual.screen import ModalScreen
 from textual.widgets import Footer, Header, Input, Label, Static
 
-from paper_todo.animation import generate_knight_rider_frames, run_animation
-from paper_todo.models import MAX_TASKS, TASK_CHAR_LIMIT, AppState, Task
-from paper_todo.storage import load_state, save_state
+from paper_todo import journal, tracing
+from paper_todo.animation import SLIDE_DURATION_MS, generate_knight_rider_frames, get_scheduler, run_animation
+from paper_todo.daemon import DaemonClient
+from paper_todo.formatting import _format_duration, _format_timer_time
+from paper_todo.history import HistoryStore, SessionOutcome, SessionStats, aggregate_sessions
+from paper_todo.models import MAX_TASKS, TASK_CHAR_LIMIT, AppState, StateChange, Task
+from paper_todo.notifications import Notifier, TerminalBackend
+from paper_todo.storage import DEFAULT_FLUSH_INTERVAL, StateWriter, StorageError, load_state
 from paper_todo.theme import ThemeMode, detect_system_theme
-from paper_todo.widgets import ProgressBarTimer, TaskRow
+from paper_todo.watcher import StateWatcher
+from paper_todo.widgets import BacklogList, PerfHud, ProgressBarTimer, TaskRow
 from paper_todo.widgets.task_indicator import IndicatorState
 
+STATS_TOP_TASKS = 10
 
-def _send_notification(title: str, message: str, *, sound: str = "Glass") -> None:
-    script = f'display notification "{message}" with title "{title}" sound name "{sound}"'
-    subprocess.run(["osascript", "-e", script], check=False, capture_output=True)
 
+def _trace_state_change(change: StateChange) -> None:
+    tracing.instant(f"state {change.kind}", "state", field=change.field, index=change.index)
 
-def _format_timer_time(seconds: int) -> str:
-    minutes = seconds // 60
-    secs = seconds % 60
-    return f"{minutes:02d}:{secs:02d}"
 
-
-def _get_timer_status(timer) -> str:
-    if timer.running:
-        task_info = "Break time!" if timer.is_break else f"Task {(timer.task_index or 0) + 1}"
-        return f"▶ {task_info}"
-    return "Ready to start!"
+def _trace_frame_cost(apply_seconds: float, present_seconds: float) -> None:
+    tracing.counter("frame cost (ms)", "animation", apply=apply_seconds * 1000, present=present_seconds * 1000)
 
 
 def _calculate_duration_and_break(index: int) -> tuple[int, bool]:
@@ -51,29 +51,60 @@ class PaperTodoApp(App):
         Binding("4", "task_action(4)", show=False),
         Binding("5", "task_action(5)", show=False),
         Binding("6", "task_action(6)", show=False),
+        Binding("b,B", "backlog", "backlog", show=True),
         Binding("s,S", "start", "start", show=True),
         Binding("t,T", "toggle_theme", "theme", show=True),
+        Binding("p,P", "toggle_perf_hud", "perf", show=False),
+        Binding("h,H", "stats", "stats", show=True),
         Binding("c,C", "complete_and_end", "complete & end", show=True),
         Binding("e,E", "end_timer", "end", show=True),
         Binding("q,Q", "quit", "quit", show=True),
     ]
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        transition_ms: float = SLIDE_DURATION_MS,
+        notifier: Notifier | None = None,
+        history: HistoryStore | None = None,
+        daemon: DaemonClient | None = None,
+    ) -> None:
         super().__init__()
-        self.state = load_state()
+        self.transition_ms = transition_ms
+        self.notifier = notifier or Notifier()
+        self.history = history or HistoryStore()
+        self.daemon = daemon
+        self.state_writer: StateWriter | DaemonClient
+        self.state_watcher: StateWatcher | DaemonClient
+        if daemon is None:
+            self.state = load_state()
+            self.state_writer = StateWriter(flush_interval=flush_interval, journal=True)
+            self.state_watcher = StateWatcher(self.state_writer.watch_paths, self._on_external_change)
+        else:
+            # The daemon persists records and pushes other clients' changes, so it is both writer and watcher.
+            self.state = daemon.state
+            daemon.on_change = self._on_external_change
+            self.state_writer = self.state_watcher = daemon
         self.theme_mode = detect_system_theme()
         self.task_rows: list[TaskRow] = []
         self.progress_bar: ProgressBarTimer | None = None
+        self.perf_hud = PerfHud(self.state_writer.write_seconds, id="perf-hud")
         self.timer_worker = None
 
     @property
     def is_timer_active(self) -> bool:
         return self.state.timer.running
 
+    @property
+    def owns_timer(self) -> bool:
+        # A connected daemon sends the timer warnings and expires the timer instead.
+        return self.daemon is None or not self.daemon.connected
+
     def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:
         if action == "start":
             return None if self.is_timer_active else True
-        if action == "task_action":
+        if action in ("task_action", "backlog"):
             return None if self.is_timer_active else True
         if action in ("complete_and_end", "end_timer"):
             return True if self.is_timer_active else None
@@ -82,32 +113,99 @@ class PaperTodoApp(App):
     def compose(self) -> ComposeResult:
         yield Header()
         with Container(id="main-content"):
-            self.progress_bar = ProgressBarTimer(self.state, self.theme_mode)
+            self.progress_bar = ProgressBarTimer(self.state, self.theme_mode, transition_ms=self.transition_ms)
             yield self.progress_bar
             with Vertical(id="task-list"):
                 for i in range(MAX_TASKS):
-                    row = TaskRow(i, self.state.tasks[i])
+                    row = TaskRow(i, self.state)
                     self.task_rows.append(row)
                     yield row
+        yield self.perf_hud
         yield Footer()
 
     def _refresh_task_rows(self) -> None:
-        for i, row in enumerate(self.task_rows):
-            is_active = self.state.timer.task_index == i and self.state.timer.running
-            row.task_model = self.state.tasks[i]
-            row.refresh_display(is_active=is_active)
+        # Rows track state changes themselves; this only restores indicators after an animation.
+        for row in self.task_rows:
+            row.refresh_display()
 
     def on_mount(self) -> None:
+        self.state_writer.start()
+        self.state_watcher.start()
+        get_scheduler().presenter = self.call_after_refresh
+        if tracing.tracer is not None:
+            self.state.subscribe(_trace_state_change)
+            get_scheduler().frame_observers.append(_trace_frame_cost)
         self._apply_theme()
+        if isinstance(self.notifier.backend, TerminalBackend):
+            self.notifier.backend.attach(self)
         if self.state.timer.running:
-            self._refresh_task_rows()
             self.refresh_bindings()
             if self.progress_bar:
                 self.progress_bar.restore_timer_state()
             self.start_timer_worker()
 
     def on_unmount(self) -> None:
-        save_state(self.state)
+        self.state_watcher.stop()
+        get_scheduler().presenter = None
+        if _trace_frame_cost in get_scheduler().frame_observers:
+            get_scheduler().frame_observers.remove(_trace_frame_cost)
+        self.state_writer.mark_dirty(self.state)
+        self.state_writer.close()
+        if isinstance(self.notifier.backend, TerminalBackend):
+            self.notifier.backend.detach()
+        self.notifier.close()
+
+    async def on_event(self, event: events.Event) -> None:
+        if tracing.tracer is None or not isinstance(event, events.Key) or event.is_forwarded:
+            await super().on_event(event)
+            return
+        # Ends once the screen has been repainted with whatever the key changed.
+        key_to_paint = tracing.begin(f"key {event.key}", "input")
+        with tracing.span(f"dispatch {event.key}", "input"):
+            await super().on_event(event)
+        self.call_after_refresh(key_to_paint.end)
+
+    async def run_action(
+        self,
+        action: "str | ActionParseResult",
+        default_namespace: DOMNode | None = None,
+        namespaces: Mapping[str, DOMNode] | None = None,
+    ) -> bool:
+        if tracing.tracer is None:
+            return await super().run_action(action, default_namespace, namespaces)
+        name = action if isinstance(action, str) else action[1]
+        with tracing.begin(f"action {name}", "app"):
+            return await super().run_action(action, default_namespace, namespaces)
+
+    def _on_external_change(self) -> None:
+        if self.state_writer.has_unwritten_changes:
+            # Local changes go out first; their write triggers another change event to pull on.
+            self.state_writer.flush()
+            return
+        try:
+            fresh = self.state_writer.pull()
+        except (OSError, StorageError):
+            return
+        if fresh is None:
+            return
+
+        was_running = self.state.timer.running
+        previous_timer = self.state.timer
+        self.state.update_from(fresh)
+        if self.state.timer is previous_timer:
+            return
+
+        if self.state.timer.running:
+            if self.progress_bar:
+                self.progress_bar.restore_timer_state()
+            self.start_timer_worker()
+        elif was_running:
+            if self.timer_worker:
+                self.timer_worker.cancel()
+                self.timer_worker = None
+            if self.progress_bar:
+                self.progress_bar.reset()
+        self.refresh_bindings()
 
     def _apply_theme(self) -> None:
         if self.theme_mode == ThemeMode.LIGHT:
@@ -121,6 +219,22 @@ class PaperTodoApp(App):
         self.theme_mode = ThemeMode.LIGHT if self.theme_mode == ThemeMode.DARK else ThemeMode.DARK
         self._apply_theme()
 
+    def action_toggle_perf_hud(self) -> None:
+        self.perf_hud.toggle()
+
+    def action_stats(self) -> None:
+        self.push_screen(StatsScreen(self.history))
+
+    def _session_task_text(self) -> str | None:
+        task_index = self.state.timer.task_index
+        return None if task_index is None else self.state.tasks[task_index].text
+
+    def _record_session_finish(self, outcome: SessionOutcome) -> None:
+        try:
+            self.history.record_finish(self.state.timer, self._session_task_text(), outcome)
+        except OSError:
+            self.notify("Could not write session history", severity="warning")
+
     def action_task_action(self, task_num: int) -> None:
         task_index = task_num - 1
         if 0 <= task_index < MAX_TASKS:
@@ -144,26 +258,41 @@ class PaperTodoApp(App):
             elif action == "toggle":
                 self.state.tasks[task_index].text = new_text[:TASK_CHAR_LIMIT]
                 self.state.tasks[task_index].completed = not self.state.tasks[task_index].completed
-            self._refresh_task_rows()
-            save_state(self.state)
+            self.state_writer.record(self.state, journal.task_edited(task_index, self.state.tasks[task_index]))
+            self.state_writer.flush()
 
         self.run_worker(get_task_input())
 
+    def action_backlog(self) -> None:
+        async def pick_backlog_task() -> None:
+            result = await self.app.push_screen_wait(BacklogScreen(self.state.backlog))
+            if result is None:
+                return
+            backlog_index, slot = result
+            self.state.promote(backlog_index, slot)
+            self.state_writer.record(self.state, journal.task_promoted(backlog_index, slot))
+            self.state_writer.flush()
+
+        self.run_worker(pick_backlog_task())
+
     async def _animate_task_selection(self, incomplete_indices: list[int]) -> int:
         frames = generate_knight_rider_frames(incomplete_indices, num_cycles=3)
 
         completed_indices = {i for i in range(MAX_TASKS) if self.state.tasks[i].completed}
 
+        incomplete_set = set(incomplete_indices)
+
         def on_frame(idx: int) -> None:
-            for i, row in enumerate(self.task_rows):
-                if i == idx:
-                    row.set_indicator_state(IndicatorState.BRIGHT)
-                elif i in completed_indices:
-                    row.set_indicator_state(IndicatorState.COMPLETED_DIM)
-                elif i in incomplete_indices:
-                    row.set_indicator_state(IndicatorState.DIM)
-                else:
-                    row.set_indicator_state(IndicatorState.INACTIVE)
+            with self.batch_update():
+                for i, row in enumerate(self.task_rows):
+                    if i == idx:
+                        row.set_indicator_state(IndicatorState.BRIGHT)
+                    elif i in completed_indices:
+                        row.set_indicator_state(IndicatorState.COMPLETED_DIM)
+                    elif i in incomplete_set:
+                        row.set_indicator_state(IndicatorState.DIM)
+                    else:
+                        row.set_indicator_state(IndicatorState.INACTIVE)
 
         final_index = await run_animation(frames, on_frame)
 
@@ -218,6 +347,12 @@ class PaperTodoApp(App):
                 await self.progress_bar.transition_to_running(duration_index, is_break=False)
 
         if self.state.timer.running:
+            self.state_writer.record(self.state, journal.timer_started(self.state.timer))
+            self.state_writer.flush()
+            try:
+                self.history.record_start(self.state.timer, self._session_task_text())
+            except OSError:
+                self.notify("Could not write session history", severity="warning")
             self.start_timer_worker()
             self.refresh_bindings()
             self._refresh_task_rows()
@@ -225,39 +360,42 @@ class PaperTodoApp(App):
             self.progress_bar.reset()
             self._refresh_task_rows()
 
-        save_state(self.state)
-
     def start_timer_worker(self) -> None:
         if self.timer_worker is None:
             self.timer_worker = self.run_worker(self._timer_tick(), exclusive=True)
 
     async def _timer_tick(self) -> None:
-        while self.state.timer.running and self.state.timer.remaining_seconds > 0:
-            await asyncio.sleep(1)
-            self.state.timer.tick()
+        while self.state.timer.running and (remaining := self.state.timer.seconds_remaining()) > 0:
+            await asyncio.sleep(remaining % 1 or 1)
+            # Each tick should land on a whole second of the wall-clock countdown; late wakes show up as jitter.
+            remaining = self.state.timer.seconds_remaining()
+            self.perf_hud.record_tick(round(remaining) - remaining)
 
             if self.progress_bar:
                 elapsed = self.state.timer.duration_seconds - self.state.timer.remaining_seconds
                 self.progress_bar.update_fill(elapsed, self.state.timer.duration_seconds)
 
+            if not self.owns_timer:
+                continue
+
             if self.state.timer.should_warn_ten_percent() and not self.state.timer.warned_ten_percent:
                 self.state.timer.warned_ten_percent = True
+                self.state_writer.record(self.state, journal.timer_changed("timer_updated", self.state.timer))
                 remaining = _format_timer_time(self.state.timer.remaining_seconds)
-                _send_notification("Paper TODO", f"10% remaining: {remaining}", sound="Purr")
+                self.notifier.notify("Paper TODO", f"10% remaining: {remaining}", sound="Purr")
                 self.notify(f"10% remaining: {remaining}", severity="warning")
 
-            save_state(self.state)
-
-        if self.state.timer.is_finished():
+        if self.state.timer.is_finished() and self.owns_timer:
             task_info = "Break" if self.state.timer.is_break else f"Task {(self.state.timer.task_index or 0) + 1}"
-            _send_notification("Paper TODO", f"Time's up! {task_info} complete.", sound="Glass")
+            self.notifier.notify("Paper TODO", f"Time's up! {task_info} complete.", sound="Glass")
+            self._record_session_finish(SessionOutcome.EXPIRED)
             self.state.timer.reset()
+            self.state_writer.record(self.state, journal.timer_reset(self.state.timer))
+            self.state_writer.flush()
             self.timer_worker = None
             self.refresh_bindings()
-            self._refresh_task_rows()
             if self.progress_bar:
                 self.progress_bar.reset()
-            save_state(self.state)
 
     def action_complete_and_end(self) -> None:
         if not self.is_timer_active:
@@ -267,6 +405,7 @@ class PaperTodoApp(App):
         if self.state.timer.task_index is not None:
             task_index = self.state.timer.task_index
             self.state.tasks[task_index].completed = True
+            self.state_writer.record(self.state, journal.task_edited(task_index, self.state.tasks[task_index]))
 
             if self.progress_bar:
                 self.run_worker(self._celebrate_and_stop())
@@ -278,10 +417,11 @@ class PaperTodoApp(App):
             self.timer_worker.cancel()
             self.timer_worker = None
 
+        self._record_session_finish(SessionOutcome.COMPLETED)
         self.state.timer.reset()
+        self.state_writer.record(self.state, journal.timer_reset(self.state.timer))
+        self.state_writer.flush()
         self.refresh_bindings()
-        self._refresh_task_rows()
-        save_state(self.state)
 
         if self.progress_bar:
             await self.progress_bar.celebrate()
@@ -298,12 +438,13 @@ class PaperTodoApp(App):
             self.timer_worker.cancel()
             self.timer_worker = None
 
+        self._record_session_finish(SessionOutcome.ENDED)
         self.state.timer.reset()
+        self.state_writer.record(self.state, journal.timer_reset(self.state.timer))
+        self.state_writer.flush()
         self.refresh_bindings()
-        self._refresh_task_rows()
         if self.progress_bar:
             self.progress_bar.reset()
-        save_state(self.state)
 
 
 class StartTimerConfirmScreen(ModalScreen[bool]):
@@ -336,6 +477,89 @@ class StartTimerConfirmScreen(ModalScreen[bool]):
         self.dismiss(False)
 
 
+class BacklogScreen(ModalScreen[tuple[int, int] | None]):
+    BINDINGS = [
+        *(Binding(str(slot), f"promote({slot})", show=False) for slot in range(1, MAX_TASKS + 1)),
+        Binding("escape", "cancel", "cancel"),
+    ]
+
+    def __init__(self, backlog: list[Task]) -> None:
+        super().__init__()
+        self.backlog = backlog
+
+    def compose(self) -> ComposeResult:
+        with Container(id="dialog"):
+            yield Label(f"Backlog ({len(self.backlog)} tasks)")
+            yield BacklogList(self.backlog, id="backlog-list")
+            yield Label(
+                f"[dim]1-{MAX_TASKS}[/dim] move into slot   [dim]Esc[/dim] cancel",
+                id="backlog-hints",
+            )
+
+    def on_mount(self) -> None:
+        self.query_one(BacklogList).focus()
+
+    def action_promote(self, slot: int) -> None:
+        if self.backlog:
+            self.dismiss((self.query_one(BacklogList).cursor, slot - 1))
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
+
+
+class StatsScreen(ModalScreen[None]):
+    BINDINGS = [
+        Binding("escape,h,H", "close", "close"),
+    ]
+
+    def __init__(self, history: HistoryStore) -> None:
+        super().__init__()
+        self.history = history
+
+    def compose(self) -> ComposeResult:
+        today = self.history.today()
+        week = self.history.this_week()
+        with Container(id="dialog"):
+            yield Label("Session history")
+            yield Label(
+                f"Today: {_format_duration(today['seconds'])} in {today['sessions']} sessions\n"
+                f"This week: {_format_duration(week['seconds'])} in {week['sessions']} sessions",
+                id="stats-rollups",
+            )
+            yield Static("Loading history...", id="stats-body")
+            yield Label("[dim]Esc[/dim] close", id="stats-hints")
+
+    def on_mount(self) -> None:
+        self._aggregate_history()
+
+    @work(thread=True, exclusive=True)
+    def _aggregate_history(self) -> None:
+        try:
+            stats = aggregate_sessions(self.history.load_columns())
+        except OSError:
+            self.app.call_from_thread(self._show_stats, None)
+            return
+        self.app.call_from_thread(self._show_stats, stats)
+
+    def _show_stats(self, stats: SessionStats | None) -> None:
+        if not self.is_attached:
+            return
+        body = self.query_one("#stats-body", Static)
+        if stats is None:
+            body.update("Could not read history")
+            return
+        if not stats.sessions:
+            body.update("No sessions recorded yet")
+            return
+        lines = [f"All time: {_format_duration(stats.total_seconds)} in {stats.sessions} sessions", ""]
+        lines += [f"{_format_duration(seconds):>8}  {name}" for name, seconds in stats.per_task[:STATS_TOP_TASKS]]
+        lines += ["", "  ".join(f"{minutes}m: {_format_duration(seconds)}" for minutes, seconds in stats.per_duration)]
+        body.update("\n".join(lines))
+
+    def action_close(self) -> None:
+        self.dismiss(None)
+
+
 class TaskInputScreen(ModalScreen[tuple[str, str] | None]):
     BINDINGS = [
         Binding("ctrl+d", "toggle_complete", "toggle"),
@@ -381,8 +605,8 @@ class TaskInputScreen(ModalScreen[tuple[str, str] | None]):
         self.dismiss(("save", event.value))
 
 
-def main() -> None:
-    app = PaperTodoApp()
+def main(*, transition_ms: float = SLIDE_DURATION_MS) -> None:
+    app = PaperTodoApp(transition_ms=transition_ms, daemon=DaemonClient.connect())
     app.run()
 
 
@@ -0,0 +1,222 @@
+import argparse
+import sys
+
+from paper_todo.formatting import _format_timer_time, _get_timer_status
+
+
+def _format_status_line(timer) -> str:
+    status = _get_timer_status(timer)
+    if timer.running:
+        return f"{status} {_format_timer_time(timer.remaining_seconds)}"
+    return status
+
+
+def _open_state():
+    # Goes through the daemon when one is running.
+    from paper_todo.daemon import DaemonClient
+    from paper_todo.storage import StateWriter, load_state
+
+    client = DaemonClient.connect()
+    if client is not None:
+        return client.state, client
+    state = load_state()
+    return state, StateWriter(journal=True)
+
+
+def _record_session_finish(timer, task_text: str | None, outcome) -> None:
+    from paper_todo.history import HistoryStore
+
+    try:
+        HistoryStore().record_finish(timer, task_text, outcome)
+    except OSError as exc:
+        print(f"Could not write session history: {exc}", file=sys.stderr)
+
+
+def _cmd_status(args: argparse.Namespace) -> int:
+    state, writer = _open_state()
+    writer.close()
+    print(_format_status_line(state.timer))
+    if not args.short:
+        for i, task in enumerate(state.tasks):
+            mark = "x" if task.completed else " "
+            print(f"{i + 1} [{mark}] {task.text or '(empty)'}")
+        if state.backlog:
+            print(f"{len(state.backlog)} tasks in backlog")
+    return 0
+
+
+def _cmd_add(args: argparse.Namespace) -> int:
+    from paper_todo import journal
+    from paper_todo.models import TASK_CHAR_LIMIT, Task
+
+    state, writer = _open_state()
+    if args.backlog:
+        task = Task(text=args.text[:TASK_CHAR_LIMIT])
+        state.add_to_backlog(task)
+        writer.record(state, journal.backlog_added(task))
+        writer.close()
+        print(f"Added backlog task {len(state.backlog)}")
+        return 0
+
+    slot = next((i for i, task in enumerate(state.tasks) if not task.text), None)
+    if slot is None:
+        writer.close()
+        print("No empty task slot", file=sys.stderr)
+        return 1
+
+    state.tasks[slot].text = args.text[:TASK_CHAR_LIMIT]
+    writer.record(state, journal.task_edited(slot, state.tasks[slot]))
+    writer.close()
+    print(f"Added task {slot + 1}")
+    return 0
+
+
+def _cmd_import(args: argparse.Namespace) -> int:
+    from paper_todo import journal
+    from paper_todo.models import TASK_CHAR_LIMIT, Task
+
+    with args.file:
+        lines = [line.strip() for line in args.file]
+    tasks = [Task(text=line[:TASK_CHAR_LIMIT]) for line in lines if line]
+
+    state, writer = _open_state()
+    for task in tasks:
+        state.add_to_backlog(task)
+        writer.record(state, journal.backlog_added(task))
+    writer.close()
+    print(f"Imported {len(tasks)} tasks into the backlog")
+    return 0
+
+
+def _cmd_done(args: argparse.Namespace) -> int:
+    from paper_todo import journal
+    from paper_todo.history import SessionOutcome
+    from paper_todo.models import MAX_TASKS
+
+    task_index = args.task - 1
+    if not 0 <= task_index < MAX_TASKS:
+        print(f"Task must be between 1 and {MAX_TASKS}", file=sys.stderr)
+        return 1
+
+    state, writer = _open_state()
+    if not state.tasks[task_index].text:
+        writer.close()
+        print(f"Task {task_index + 1} is empty", file=sys.stderr)
+        return 1
+
+    state.tasks[task_index].completed = True
+    writer.record(state, journal.task_edited(task_index, state.tasks[task_index]))
+    if state.timer.running and state.timer.task_index == task_index:
+        _record_session_finish(state.timer, state.tasks[task_index].text, SessionOutcome.COMPLETED)
+        state.timer.reset()
+        writer.record(state, journal.timer_reset(state.timer))
+    writer.close()
+    print(f"Completed task {task_index + 1}")
+    return 0
+
+
+def _cmd_end(args: argparse.Namespace) -> int:
+    from paper_todo import journal
+    from paper_todo.history import SessionOutcome
+
+    state, writer = _open_state()
+    if not state.timer.running:
+        writer.close()
+        print("No active timer", file=sys.stderr)
+        return 1
+
+    task_index = state.timer.task_index
+    task_text = None if task_index is None else state.tasks[task_index].text
+    _record_session_finish(state.timer, task_text, SessionOutcome.ENDED)
+    state.timer.reset()
+    writer.record(state, journal.timer_reset(state.timer))
+    writer.close()
+    print("Timer ended")
+    return 0
+
+
+def _cmd_daemon(args: argparse.Namespace) -> int:
+    from paper_todo.daemon import DaemonError, get_socket_file
+    from paper_todo.daemon import main as run_daemon
+
+    print(f"Serving on {get_socket_file()}", file=sys.stderr)
+    try:
+        run_daemon()
+    except DaemonError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="paper-todo", description="Dice-based TODO TUI")
+    parser.add_argument(
+        "--transition-ms",
+        type=float,
+        default=None,
+        help="length of the timer start transition in milliseconds (0 to skip)",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="record a Chrome trace-event file of the session (open it in ui.perfetto.dev)",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    status = subparsers.add_parser("status", help="show the timer and tasks")
+    status.add_argument("--short", action="store_true", help="only print the timer status line")
+    status.set_defaults(handler=_cmd_status)
+
+    add = subparsers.add_parser("add", help="add a task to the first empty slot")
+    add.add_argument("text")
+    add.add_argument("--backlog", action="store_true", help="add to the backlog instead of a slot")
+    add.set_defaults(handler=_cmd_add)
+
+    import_ = subparsers.add_parser("import", help="append one backlog task per line of a file")
+    import_.add_argument("file", type=argparse.FileType("r"), help="text file, or - for stdin")
+    import_.set_defaults(handler=_cmd_import)
+
+    done = subparsers.add_parser("done", help="mark a task complete")
+    done.add_argument("task", type=int)
+    done.set_defaults(handler=_cmd_done)
+
+    end = subparsers.add_parser("end", help="end the running timer")
+    end.set_defaults(handler=_cmd_end)
+
+    daemon = subparsers.add_parser("daemon", help="run the timer in the background and serve other instances")
+    daemon.set_defaults(handler=_cmd_daemon)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.trace is None:
+        return _run(args)
+
+    from pathlib import Path
+
+    from paper_todo import tracing
+
+    tracing.start()
+    try:
+        return _run(args)
+    finally:
+        tracing.stop(Path(args.trace))
+
+
+def _run(args: argparse.Namespace) -> int:
+    if args.command is not None:
+        return args.handler(args)
+
+    from paper_todo.app import main as run_app
+
+    if args.transition_ms is None:
+        run_app()
+    else:
+        run_app(transition_ms=max(0.0, args.transition_ms))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
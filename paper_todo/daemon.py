@@ -0,0 +1,426 @@
+import asyncio
+import json
+import signal
+import socket
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from paper_todo import journal
+from paper_todo.formatting import _format_timer_time
+from paper_todo.history import HistoryStore, SessionOutcome
+from paper_todo.models import AppState
+from paper_todo.notifications import Notifier
+from paper_todo.storage import (
+    DEFAULT_FLUSH_INTERVAL,
+    WRITE_LATENCY_SAMPLES,
+    StateWriter,
+    StorageError,
+    _get_default_state_file,
+    load_state,
+)
+from paper_todo.watcher import StateWatcher
+
+PROTOCOL_VERSION = 1
+CONNECT_TIMEOUT = 1.0
+TICK_SECONDS = 1.0
+RECV_SIZE = 64 * 1024
+# Subscribers that stop reading are dropped rather than buffered without bound.
+MAX_CLIENT_BUFFER = 1024 * 1024
+
+_TIMER_OPS = frozenset({"timer_started", "timer_updated", "timer_reset"})
+_RECORD_OPS = _TIMER_OPS | {"task_edited", "backlog_added", "task_promoted"}
+
+
+class DaemonError(Exception):
+    pass
+
+
+def get_socket_file(state_file: Path | None = None) -> Path:
+    return (state_file or _get_default_state_file()).with_suffix(".sock")
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def _apply_records(state: AppState, records: list[dict]) -> list[dict]:
+    # Records come off the socket, so anything malformed is skipped rather than trusted.
+    applied = []
+    for record in records:
+        if not isinstance(record, dict) or record.get("op") not in _RECORD_OPS:
+            continue
+        try:
+            journal.apply_record(state, record)
+        except (KeyError, IndexError, TypeError, AttributeError, ValueError):
+            continue
+        applied.append(record)
+    return applied
+
+
+# Newline-delimited JSON: "hello" is answered with a "snapshot" and subscribes the client; "apply" records
+# are persisted and forwarded to the other subscribers as "records".
+class TimerDaemon:
+    def __init__(
+        self,
+        state_file: Path | None = None,
+        *,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        notifier: Notifier | None = None,
+        history: HistoryStore | None = None,
+    ) -> None:
+        self.socket_file = get_socket_file(state_file)
+        self.notifier = notifier or Notifier()
+        self.history = history or HistoryStore()
+        self.state = load_state(state_file)
+        self.state_writer = StateWriter(state_file, flush_interval=flush_interval, journal=True)
+        self.clients: set[asyncio.StreamWriter] = set()
+        self._wake: asyncio.Event | None = None
+        self._stopping: asyncio.Event | None = None
+
+    async def serve(self) -> None:
+        self._wake = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._claim_socket()
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_file)
+        watcher = StateWatcher(self.state_writer.watch_paths, self._on_external_change)
+        self.state_writer.start()
+        watcher.start()
+        try:
+            async with server:
+                await self._run_timer()
+        finally:
+            watcher.stop()
+            for client in list(self.clients):
+                client.close()
+            self.socket_file.unlink(missing_ok=True)
+            self.state_writer.mark_dirty(self.state)
+            self.state_writer.close()
+            self.notifier.close()
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+            self._wake.set()
+
+    def _claim_socket(self) -> None:
+        if not self.socket_file.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_file))
+        except OSError:
+            # Left behind by a daemon that did not shut down cleanly.
+            self.socket_file.unlink(missing_ok=True)
+        else:
+            raise DaemonError(f"A daemon is already serving {self.socket_file}")
+        finally:
+            probe.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    break
+                if not self._dispatch(message, writer):
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    def _dispatch(self, message: dict, writer: asyncio.StreamWriter) -> bool:
+        if not isinstance(message, dict):
+            writer.write(_encode({"t": "error", "message": "messages must be JSON objects"}))
+            return False
+        match message.get("t"):
+            case "hello" if message.get("v") == PROTOCOL_VERSION:
+                writer.write(_encode({"t": "snapshot", "state": self.state.model_dump(mode="json")}))
+                self.clients.add(writer)
+            case "apply":
+                records = message.get("records")
+                if not isinstance(records, list):
+                    writer.write(_encode({"t": "error", "message": "apply needs a list of records"}))
+                    return True
+                applied = _apply_records(self.state, records)
+                self._publish(applied, source=writer)
+                if len(applied) < len(records):
+                    message = f"{len(records) - len(applied)} of {len(records)} records not applied"
+                    writer.write(_encode({"t": "error", "message": message}))
+            case "bye":
+                # Everything the client sent before this has been applied once it reads the reply.
+                writer.write(_encode({"t": "bye"}))
+                return False
+            case _:
+                writer.write(_encode({"t": "error", "message": f"unsupported message {message.get('t')!r}"}))
+                return False
+        return True
+
+    def _publish(self, records: list[dict], *, source: asyncio.StreamWriter | None = None) -> None:
+        # Persists and forwards records that have already been applied to self.state.
+        if not records:
+            return
+        for record in records:
+            self.state_writer.record(self.state, record)
+        self.state_writer.flush()
+        self._broadcast({"t": "records", "records": records}, exclude=source)
+        if any(record["op"] in _TIMER_OPS for record in records):
+            self._wake.set()
+
+    def _broadcast(self, message: dict, *, exclude: asyncio.StreamWriter | None = None) -> None:
+        payload = _encode(message)
+        for client in list(self.clients):
+            if client is exclude:
+                continue
+            if client.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+                self.clients.discard(client)
+                client.close()
+                continue
+            client.write(payload)
+
+    def _on_external_change(self) -> None:
+        if self.state_writer.has_unwritten_changes:
+            self.state_writer.flush()
+            return
+        try:
+            fresh = self.state_writer.pull()
+        except (OSError, StorageError):
+            return
+        if fresh is None:
+            return
+        self.state.update_from(fresh)
+        self._broadcast({"t": "snapshot", "state": self.state.model_dump(mode="json")})
+        self._wake.set()
+
+    async def _run_timer(self) -> None:
+        while not self._stopping.is_set():
+            timer = self.state.timer
+            timeout = min(TICK_SECONDS, timer.seconds_remaining()) if timer.running else None
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except TimeoutError:
+                pass
+            self._check_timer()
+
+    def _check_timer(self) -> None:
+        timer = self.state.timer
+        if not timer.running:
+            return
+        if timer.should_warn_ten_percent():
+            timer.warned_ten_percent = True
+            self._publish([journal.timer_changed("timer_updated", timer)])
+            remaining = _format_timer_time(timer.remaining_seconds)
+            self.notifier.notify("Paper TODO", f"10% remaining: {remaining}", sound="Purr")
+        if timer.is_finished():
+            task_index = timer.task_index
+            task_info = "Break" if timer.is_break else f"Task {(task_index or 0) + 1}"
+            self.notifier.notify("Paper TODO", f"Time's up! {task_info} complete.", sound="Glass")
+            try:
+                task_text = None if task_index is None else self.state.tasks[task_index].text
+                self.history.record_finish(timer, task_text, SessionOutcome.EXPIRED)
+            except OSError:
+                pass
+            timer.reset()
+            self._publish([journal.timer_reset(timer)])
+
+
+# Stands in for both the StateWriter and the StateWatcher; falls back to the state file if the daemon goes away.
+class DaemonClient:
+    def __init__(
+        self,
+        sock: socket.socket,
+        state: AppState,
+        state_file: Path | None = None,
+        *,
+        received: bytes = b"",
+    ) -> None:
+        self.state = state
+        self.state_file = state_file
+        self.on_change: Callable[[], None] | None = None
+        self.write_seconds: deque[float] = deque(maxlen=WRITE_LATENCY_SAMPLES)
+        self.watch_paths: tuple[Path, ...] = ()
+        self._sock = sock
+        self._received = received
+        self._latest = state.model_copy(deep=True)
+        self._changed = False
+        self._closing = False
+        self._fallback: StateWriter | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def connect(cls, state_file: Path | None = None, *, timeout: float = CONNECT_TIMEOUT) -> "DaemonClient | None":
+        socket_file = get_socket_file(state_file)
+        if not socket_file.exists():
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(socket_file))
+            sock.sendall(_encode({"t": "hello", "v": PROTOCOL_VERSION}))
+            line, _, received = _recv_line(sock)
+            message = json.loads(line)
+        except (OSError, ValueError):
+            sock.close()
+            return None
+        if message.get("t") != "snapshot":
+            sock.close()
+            return None
+        sock.settimeout(None)
+        return cls(sock, AppState.model_validate(message["state"]), state_file, received=received)
+
+    @property
+    def connected(self) -> bool:
+        return self._fallback is None
+
+    @property
+    def has_unwritten_changes(self) -> bool:
+        return self._fallback is not None and self._fallback.has_unwritten_changes
+
+    def start(self) -> None:
+        if self._thread is None and self.connected:
+            self._loop = asyncio.get_running_loop()
+            self._thread = threading.Thread(target=self._listen, name="paper-todo-daemon-client", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        # The subscription lasts until close(), so changes made while unmounting still reach the daemon.
+        pass
+
+    def record(self, state: AppState, record: dict) -> None:
+        if self._fallback is not None:
+            self._fallback.record(state, record)
+            return
+        _apply_records(self._latest, [record])
+        started = time.perf_counter()
+        try:
+            self._sock.sendall(_encode({"t": "apply", "records": [record]}))
+        except OSError:
+            self._disconnected()
+            self._fallback.record(state, record)
+            return
+        self.write_seconds.append(time.perf_counter() - started)
+
+    def mark_dirty(self, state: AppState) -> None:
+        # The daemon persists every record it is sent; only a fallback writer needs a snapshot.
+        if self._fallback is not None:
+            self._fallback.mark_dirty(state)
+
+    def flush(self) -> None:
+        if self._fallback is not None:
+            self._fallback.flush()
+
+    def pull(self) -> AppState | None:
+        if self._fallback is not None:
+            return self._fallback.pull()
+        if not self._changed:
+            return None
+        self._changed = False
+        return self._latest.model_copy(deep=True)
+
+    def close(self) -> None:
+        self._closing = True
+        if self._thread is None and self.connected:
+            self._say_goodbye()
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._sock.close()
+        if self._fallback is not None:
+            self._fallback.close()
+
+    def _say_goodbye(self) -> None:
+        # Waits for the daemon to confirm, so a command that exits right after sending has been applied.
+        self._sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            self._sock.sendall(_encode({"t": "bye"}))
+            buffer = self._received
+            while True:
+                line, _, buffer = _recv_line(self._sock, buffer)
+                if json.loads(line).get("t") == "bye":
+                    return
+        except (OSError, ValueError):
+            pass
+
+    def _listen(self) -> None:
+        buffer = self._received
+        while True:
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                self._call_soon(self._receive, message)
+            try:
+                chunk = self._sock.recv(RECV_SIZE)
+            except OSError:
+                chunk = b""
+            if not chunk:
+                self._call_soon(self._disconnected)
+                return
+            buffer += chunk
+
+    def _call_soon(self, callback: Callable, *args: object) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass
+
+    def _receive(self, message: dict) -> None:
+        # Malformed messages, or ones from a newer daemon, are dropped like the daemon drops bad input.
+        if not isinstance(message, dict):
+            return
+        match message.get("t"):
+            case "records":
+                records = message.get("records")
+                if not isinstance(records, list) or not _apply_records(self._latest, records):
+                    return
+            case "snapshot":
+                try:
+                    self._latest = AppState.model_validate(message.get("state"))
+                except ValidationError:
+                    return
+            case _:
+                return
+        self._changed = True
+        if self.on_change is not None:
+            self.on_change()
+
+    def _disconnected(self) -> None:
+        if self._fallback is None and not self._closing:
+            self._fallback = StateWriter(self.state_file, journal=True)
+            self._fallback.start()
+
+
+def _recv_line(sock: socket.socket, buffer: bytes = b"") -> tuple[bytes, bytes, bytes]:
+    while b"\n" not in buffer:
+        chunk = sock.recv(RECV_SIZE)
+        if not chunk:
+            raise ConnectionError("daemon closed the connection")
+        buffer += chunk
+    return buffer.partition(b"\n")
+
+
+def main(state_file: Path | None = None) -> None:
+    daemon = TimerDaemon(state_file)
+
+    async def run() -> None:
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, daemon.stop)
+        await daemon.serve()
+
+    asyncio.run(run())
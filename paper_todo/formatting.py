@@ -0,0 +1,16 @@
+def _format_timer_time(seconds: int) -> str:
+    minutes = seconds // 60
+    secs = seconds % 60
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def _get_timer_status(timer) -> str:
+    if timer.running:
+        task_info = "Break time!" if timer.is_break else f"Task {(timer.task_index or 0) + 1}"
+        return f"▶ {task_info}"
+    return "Ready to start!"
+
+
+def _format_duration(seconds: float) -> str:
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m"
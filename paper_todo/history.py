@@ -0,0 +1,189 @@
+import json
+import os
+import tempfile
+import time
+from array import array
+from dataclasses import dataclass, field
+from datetime import date
+from enum import StrEnum
+from pathlib import Path
+
+from paper_todo.journal import append_records, read_journal
+from paper_todo.models import TimerState
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HISTORY_FILE_NAME = "history.jsonl"
+ROLLUP_FILE_NAME = "history-rollups.json"
+BREAK_LABEL = "Break"
+
+
+class SessionOutcome(StrEnum):
+    COMPLETED = "completed"
+    ENDED = "ended"
+    EXPIRED = "expired"
+
+
+def session_started(timer: TimerState, task_text: str | None, *, now: float) -> dict:
+    return {
+        "op": "session_started",
+        "at": now,
+        "task_index": timer.task_index,
+        "task": task_text,
+        "duration_seconds": timer.duration_seconds,
+        "is_break": timer.is_break,
+    }
+
+
+def session_finished(timer: TimerState, task_text: str | None, outcome: SessionOutcome, *, now: float) -> dict:
+    return {
+        "op": "session_finished",
+        "at": now,
+        "started_at": timer.started_at if timer.started_at is not None else now,
+        "task_index": timer.task_index,
+        "task": task_text,
+        "duration_seconds": timer.duration_seconds,
+        "is_break": timer.is_break,
+        "outcome": outcome.value,
+        "elapsed_seconds": max(0.0, timer.duration_seconds - timer.seconds_remaining(now)),
+    }
+
+
+def _day_key(timestamp: float) -> str:
+    return date.fromtimestamp(timestamp).isoformat()
+
+
+def _week_key(timestamp: float) -> str:
+    year, week, _ = date.fromtimestamp(timestamp).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _add_to_rollup(bucket: dict, key: str, seconds: float) -> None:
+    entry = bucket.setdefault(key, {"seconds": 0.0, "sessions": 0})
+    entry["seconds"] += seconds
+    entry["sessions"] += 1
+
+
+@dataclass
+class SessionColumns:
+    started_at: array = field(default_factory=lambda: array("d"))
+    elapsed_seconds: array = field(default_factory=lambda: array("d"))
+    duration_minutes: array = field(default_factory=lambda: array("q"))
+    task_codes: array = field(default_factory=lambda: array("q"))
+    task_names: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.elapsed_seconds)
+
+
+@dataclass(frozen=True)
+class SessionStats:
+    sessions: int
+    total_seconds: float
+    per_task: list[tuple[str, float]]
+    per_duration: list[tuple[int, float]]
+
+
+def aggregate_sessions(columns: SessionColumns) -> SessionStats:
+    if not len(columns):
+        return SessionStats(0, 0.0, [], [])
+
+    if np is not None:
+        elapsed = np.frombuffer(columns.elapsed_seconds, dtype=np.float64)
+        per_task_totals = np.bincount(
+            np.frombuffer(columns.task_codes, dtype=np.int64), weights=elapsed, minlength=len(columns.task_names)
+        ).tolist()
+        minutes, inverse = np.unique(np.frombuffer(columns.duration_minutes, dtype=np.int64), return_inverse=True)
+        per_duration = list(zip(minutes.tolist(), np.bincount(inverse, weights=elapsed).tolist()))
+        total = float(elapsed.sum())
+    else:
+        per_task_totals = [0.0] * len(columns.task_names)
+        durations: dict[int, float] = {}
+        for code, minutes, seconds in zip(columns.task_codes, columns.duration_minutes, columns.elapsed_seconds):
+            per_task_totals[code] += seconds
+            durations[minutes] = durations.get(minutes, 0.0) + seconds
+        per_duration = sorted(durations.items())
+        total = sum(columns.elapsed_seconds)
+
+    per_task = sorted(zip(columns.task_names, per_task_totals), key=lambda item: item[1], reverse=True)
+    return SessionStats(len(columns), total, per_task, per_duration)
+
+
+class HistoryStore:
+    def __init__(self, history_file: Path | None = None) -> None:
+        self._history_file = history_file
+
+    @property
+    def history_file(self) -> Path:
+        if self._history_file is None:
+            from paper_todo.storage import _get_default_state_file
+
+            self._history_file = _get_default_state_file().with_name(HISTORY_FILE_NAME)
+        return self._history_file
+
+    @property
+    def rollup_file(self) -> Path:
+        return self.history_file.with_name(ROLLUP_FILE_NAME)
+
+    def record_start(self, timer: TimerState, task_text: str | None, *, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        append_records(self.history_file, [session_started(timer, task_text, now=now)])
+
+    def record_finish(
+        self,
+        timer: TimerState,
+        task_text: str | None,
+        outcome: SessionOutcome,
+        *,
+        now: float | None = None,
+    ) -> None:
+        now = time.time() if now is None else now
+        record = session_finished(timer, task_text, outcome, now=now)
+        append_records(self.history_file, [record])
+
+        from paper_todo.storage import _locked
+
+        # The app, the CLI and the daemon can all finish sessions; the lock keeps their updates from racing.
+        with _locked(self.rollup_file.with_suffix(".lock")):
+            rollups = self.rollups()
+            _add_to_rollup(rollups["daily"], _day_key(record["started_at"]), record["elapsed_seconds"])
+            _add_to_rollup(rollups["weekly"], _week_key(record["started_at"]), record["elapsed_seconds"])
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.rollup_file.parent, prefix=f".{self.rollup_file.name}.", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w") as tmp_file:
+                tmp_file.write(json.dumps(rollups))
+            os.replace(tmp_name, self.rollup_file)
+
+    def rollups(self) -> dict:
+        try:
+            rollups = json.loads(self.rollup_file.read_text())
+        except (OSError, ValueError):
+            return {"daily": {}, "weekly": {}}
+        rollups.setdefault("daily", {})
+        rollups.setdefault("weekly", {})
+        return rollups
+
+    def today(self, now: float | None = None) -> dict:
+        return self.rollups()["daily"].get(_day_key(time.time() if now is None else now), {"seconds": 0.0, "sessions": 0})
+
+    def this_week(self, now: float | None = None) -> dict:
+        return self.rollups()["weekly"].get(_week_key(time.time() if now is None else now), {"seconds": 0.0, "sessions": 0})
+
+    def load_columns(self) -> SessionColumns:
+        columns = SessionColumns()
+        codes: dict[str, int] = {}
+        for record in read_journal(self.history_file):
+            if record.get("op") != "session_finished":
+                continue
+            name = BREAK_LABEL if record.get("is_break") else (record.get("task") or "(untitled)")
+            code = codes.setdefault(name, len(codes))
+            columns.started_at.append(record.get("started_at", 0.0))
+            columns.elapsed_seconds.append(record.get("elapsed_seconds", 0.0))
+            columns.duration_minutes.append(record.get("duration_seconds", 0) // 60)
+            columns.task_codes.append(code)
+        columns.task_names = list(codes)
+        return columns
@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+from paper_todo.models import AppState, Task, TimerState
+
+
+def task_edited(index: int, task: Task) -> dict:
+    return {"op": "task_edited", "index": index, "task": task.model_dump()}
+
+
+def backlog_added(task: Task) -> dict:
+    return {"op": "backlog_added", "task": task.model_dump()}
+
+
+def task_promoted(backlog_index: int, slot: int) -> dict:
+    return {"op": "task_promoted", "backlog_index": backlog_index, "slot": slot}
+
+
+def timer_changed(op: str, timer: TimerState) -> dict:
+    return {"op": op, "timer": timer.model_dump()}
+
+
+def timer_started(timer: TimerState) -> dict:
+    return timer_changed("timer_started", timer)
+
+
+def timer_reset(timer: TimerState) -> dict:
+    return timer_changed("timer_reset", timer)
+
+
+def apply_record(state: AppState, record: dict) -> None:
+    match record.get("op"):
+        case "task_edited":
+            state.set_task(record["index"], Task.model_validate(record["task"]))
+        case "backlog_added":
+            state.add_to_backlog(Task.model_validate(record["task"]))
+        case "task_promoted":
+            state.promote(record["backlog_index"], record["slot"])
+        case "timer_started" | "timer_updated" | "timer_reset":
+            state.timer = TimerState.model_validate(record["timer"])
+
+
+def replay(state: AppState, records: list[dict]) -> AppState:
+    for record in records:
+        revision = record.get("rev", 0)
+        if revision <= state.revision:
+            continue
+        try:
+            apply_record(state, record)
+        except (KeyError, IndexError, TypeError, AttributeError, ValueError):
+            continue
+        state.revision = revision
+    return state
+
+
+def get_journal_file(state_file: Path) -> Path:
+    return state_file.with_suffix(".journal")
+
+
+def read_journal(journal_file: Path) -> list[dict]:
+    if not journal_file.exists():
+        return []
+    records = []
+    for line in journal_file.read_bytes().splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records
+
+
+def append_records(journal_file: Path, records: list[dict]) -> int:
+    payload = b"".join(json.dumps(record, separators=(",", ":")).encode() + b"\n" for record in records)
+    with journal_file.open("ab") as handle:
+        handle.write(payload)
+    return len(payload)
@@ -1,10 +1,50 @@
-from pydantic import BaseModel, Field
+import math
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Callable
+
+from pydantic import BaseModel, Field, model_validator
 
 MAX_TASKS = 6
 TASK_CHAR_LIMIT = 60
 
 
-class Task(BaseModel):
+class ChangeKind(StrEnum):
+    TASK = "task"
+    TIMER = "timer"
+    BACKLOG = "backlog"
+
+
+@dataclass(frozen=True)
+class StateChange:
+    kind: ChangeKind
+    field: str | None = None
+    index: int | None = None
+
+
+ChangeListener = Callable[[StateChange], None]
+
+
+class _ObservableModel(BaseModel):
+    # A slot rather than a PrivateAttr so observers stay out of equality, copies and dumps.
+    __slots__ = ("_observer",)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in type(self).model_fields:
+            super().__setattr__(name, value)
+            return
+        old = self.__dict__.get(name)
+        super().__setattr__(name, value)
+        observer = getattr(self, "_observer", None)
+        if observer is not None and old != value:
+            observer(name)
+
+    def _observe(self, observer: Callable[[str], None] | None) -> None:
+        object.__setattr__(self, "_observer", observer)
+
+
+class Task(_ObservableModel):
     text: str = Field(default="", max_length=TASK_CHAR_LIMIT)
     completed: bool = False
 
@@ -16,50 +56,196 @@ def _is_task_incomplete(task: Task) -> bool:
     return bool(task.text and not task.completed)
 
 
-class TimerState(BaseModel):
+class TimerState(_ObservableModel):
     task_index: int | None = None
     duration_seconds: int = 0
-    remaining_seconds: int = 0
     is_break: bool = False
     running: bool = False
     warned_ten_percent: bool = False
-
-    def start(self, task_index: int | None, duration_minutes: int, *, is_break: bool = False) -> None:
+    started_at: float | None = None
+    ends_at: float | None = None
+    paused_at: float | None = None
+    paused_seconds: float = 0.0
+
+    @model_validator(mode="before")
+    @classmethod
+    def _migrate_remaining_seconds(cls, data: Any) -> Any:
+        if not isinstance(data, dict) or "remaining_seconds" not in data:
+            return data
+        data = dict(data)
+        remaining = data.pop("remaining_seconds")
+        if data.get("ends_at") is None and remaining:
+            now = time.time()
+            data["ends_at"] = now + remaining
+            data.setdefault("started_at", data["ends_at"] - data.get("duration_seconds", 0))
+            if not data.get("running"):
+                data["paused_at"] = now
+        return data
+
+    @property
+    def is_paused(self) -> bool:
+        return self.paused_at is not None
+
+    def seconds_remaining(self, now: float | None = None) -> float:
+        if self.ends_at is None:
+            return 0.0
+        reference = self.paused_at if self.paused_at is not None else (time.time() if now is None else now)
+        return max(0.0, self.ends_at + self.paused_seconds - reference)
+
+    @property
+    def remaining_seconds(self) -> int:
+        return math.ceil(self.seconds_remaining())
+
+    def start(
+        self,
+        task_index: int | None,
+        duration_minutes: int,
+        *,
+        is_break: bool = False,
+        now: float | None = None,
+    ) -> None:
+        now = time.time() if now is None else now
         self.task_index = task_index
         self.duration_seconds = duration_minutes * 60
-        self.remaining_seconds = self.duration_seconds
         self.is_break = is_break
         self.running = True
         self.warned_ten_percent = False
+        self.started_at = now
+        self.ends_at = now + self.duration_seconds
+        self.paused_at = None
+        self.paused_seconds = 0.0
+
+    def pause(self, now: float | None = None) -> None:
+        if self.running and self.paused_at is None:
+            self.paused_at = time.time() if now is None else now
 
-    def tick(self) -> None:
-        if self.running and self.remaining_seconds > 0:
-            self.remaining_seconds -= 1
+    def resume(self, now: float | None = None) -> None:
+        if self.paused_at is not None:
+            self.paused_seconds += (time.time() if now is None else now) - self.paused_at
+            self.paused_at = None
 
-    def is_finished(self) -> bool:
-        return self.running and self.remaining_seconds <= 0
+    def is_finished(self, now: float | None = None) -> bool:
+        return self.running and self.seconds_remaining(now) <= 0
 
-    def should_warn_ten_percent(self) -> bool:
+    def should_warn_ten_percent(self, now: float | None = None) -> bool:
         if self.warned_ten_percent or self.duration_seconds == 0:
             return False
         threshold = self.duration_seconds // 10
-        return self.remaining_seconds <= threshold
+        return self.seconds_remaining(now) <= threshold
 
     def reset(self) -> None:
         self.task_index = None
         self.duration_seconds = 0
-        self.remaining_seconds = 0
         self.is_break = False
         self.running = False
         self.warned_ten_percent = False
+        self.started_at = None
+        self.ends_at = None
+        self.paused_at = None
+        self.paused_seconds = 0.0
 
 
 class AppState(BaseModel):
+    __slots__ = ("_listeners", "_incomplete")
+
+    revision: int = 0
     tasks: list[Task] = Field(default_factory=lambda: [Task() for _ in range(MAX_TASKS)])
     timer: TimerState = Field(default_factory=TimerState)
+    backlog: list[Task] = Field(default_factory=list)
+
+    def model_post_init(self, context: Any) -> None:
+        object.__setattr__(self, "_listeners", [])
+        object.__setattr__(self, "_incomplete", set())
+        self._attach_tasks()
+        self._attach_timer()
+
+    def __copy__(self) -> "AppState":
+        copied = super().__copy__()
+        object.__setattr__(copied, "_listeners", [])
+        object.__setattr__(copied, "_incomplete", set(self._incomplete))
+        return copied
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> "AppState":
+        copied = super().__deepcopy__(memo)
+        copied.model_post_init(None)
+        return copied
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "tasks":
+            self._attach_tasks()
+            self._emit(StateChange(ChangeKind.TASK))
+        elif name == "timer":
+            self._attach_timer()
+            self._emit(StateChange(ChangeKind.TIMER))
+        elif name == "backlog":
+            self._emit(StateChange(ChangeKind.BACKLOG))
+
+    def subscribe(self, listener: ChangeListener) -> Callable[[], None]:
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _emit(self, change: StateChange) -> None:
+        for listener in list(self._listeners):
+            listener(change)
+
+    def _attach_tasks(self) -> None:
+        self._incomplete.clear()
+        for index, task in enumerate(self.tasks):
+            self._attach_task(index, task)
+
+    def _attach_task(self, index: int, task: Task) -> None:
+        task._observe(lambda field: self._task_changed(index, field))
+        if _is_task_incomplete(task):
+            self._incomplete.add(index)
+        else:
+            self._incomplete.discard(index)
+
+    def _attach_timer(self) -> None:
+        self.timer._observe(lambda field: self._emit(StateChange(ChangeKind.TIMER, field)))
+
+    def _task_changed(self, index: int, field: str | None) -> None:
+        if _is_task_incomplete(self.tasks[index]):
+            self._incomplete.add(index)
+        else:
+            self._incomplete.discard(index)
+        self._emit(StateChange(ChangeKind.TASK, field, index))
+
+    def set_task(self, index: int, task: Task) -> None:
+        self.tasks[index]._observe(None)
+        self.tasks[index] = task
+        self._attach_task(index, task)
+        self._emit(StateChange(ChangeKind.TASK, None, index))
 
     def get_incomplete_task_indices(self) -> list[int]:
-        return [i for i, task in enumerate(self.tasks) if _is_task_incomplete(task)]
+        return sorted(self._incomplete)
+
+    def update_from(self, other: "AppState") -> None:
+        # Only the parts that differ are replaced, so listeners see one change per affected task or timer.
+        for index, task in enumerate(other.tasks):
+            if self.tasks[index] != task:
+                self.set_task(index, task)
+        if self.timer != other.timer:
+            self.timer = other.timer
+        if self.backlog != other.backlog:
+            self.backlog = other.backlog
+        self.revision = other.revision
+
+    def add_to_backlog(self, task: Task) -> None:
+        self.backlog.append(task)
+        self._emit(StateChange(ChangeKind.BACKLOG))
+
+    def promote(self, backlog_index: int, slot: int) -> None:
+        task = self.backlog[backlog_index]
+        current = self.tasks[slot]
+        # An occupied slot swaps back into the promoted task's backlog position.
+        if current.text:
+            current._observe(None)
+            self.backlog[backlog_index] = current
+        else:
+            del self.backlog[backlog_index]
+        self.set_task(slot, task)
+        self._emit(StateChange(ChangeKind.BACKLOG))
 
 
 def get_incomplete_task_indices(tasks: list[Task]) -> list[int]:
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Protocol, TextIO
+
+from paper_todo import tracing
+
+if TYPE_CHECKING:
+    from textual.app import App
+
+NOTIFIER_ENV_VAR = "PAPER_TODO_NOTIFIER"
+
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_DEDUPE_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class Notification:
+    title: str
+    message: str
+    sound: str = "Glass"
+
+
+class NotificationBackend(Protocol):
+    def send(self, notification: Notification, *, timeout: float) -> None: ...
+
+
+def _applescript_string(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+class OsascriptBackend:
+    def send(self, notification: Notification, *, timeout: float) -> None:
+        script = (
+            f"display notification {_applescript_string(notification.message)} "
+            f"with title {_applescript_string(notification.title)} "
+            f"sound name {_applescript_string(notification.sound)}"
+        )
+        subprocess.run(["osascript", "-e", script], check=False, capture_output=True, timeout=timeout)
+
+
+class NotifySendBackend:
+    def send(self, notification: Notification, *, timeout: float) -> None:
+        subprocess.run(
+            ["notify-send", "--app-name=paper-todo", notification.title, notification.message],
+            check=False,
+            capture_output=True,
+            timeout=timeout,
+        )
+
+
+class TerminalBackend:
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream
+        self._app: "App | None" = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def attach(self, app: "App") -> None:
+        # While a Textual app owns the terminal, writing to /dev/tty from a worker thread can land in the
+        # middle of a frame, so the sequence is handed to the app's loop and written through its driver.
+        self._app = app
+        self._loop = asyncio.get_running_loop()
+
+    def detach(self) -> None:
+        self._app = None
+        self._loop = None
+
+    def send(self, notification: Notification, *, timeout: float) -> None:
+        # OSC 9 shows a desktop notification in terminals that support it; others just ring the bell.
+        payload = f"\x1b]9;{notification.title}: {notification.message}\x07\a"
+        if self.stream is not None:
+            self.stream.write(payload)
+            self.stream.flush()
+            return
+        app, loop = self._app, self._loop
+        if app is not None and loop is not None:
+            try:
+                loop.call_soon_threadsafe(_write_to_driver, app, payload)
+                return
+            except RuntimeError:
+                pass  # The loop has closed, so the app has handed the terminal back.
+        with open("/dev/tty", "w") as tty:
+            tty.write(payload)
+
+
+def _write_to_driver(app: "App", payload: str) -> None:
+    # Mirrors App.bell().
+    if not app.is_headless and app._driver is not None:
+        app._driver.write(payload)
+
+
+class NullBackend:
+    def send(self, notification: Notification, *, timeout: float) -> None:
+        pass
+
+
+class FileBackend:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, notification: Notification, *, timeout: float) -> None:
+        with self._lock, self.path.open("a") as f:
+            f.write(json.dumps(asdict(notification)) + "\n")
+
+    def read(self) -> list[Notification]:
+        if not self.path.exists():
+            return []
+        return [Notification(**json.loads(line)) for line in self.path.read_text().splitlines()]
+
+
+def get_backend(name: str | None = None) -> NotificationBackend:
+    name = name if name is not None else os.environ.get(NOTIFIER_ENV_VAR, "")
+    match name:
+        case "osascript":
+            return OsascriptBackend()
+        case "notify-send":
+            return NotifySendBackend()
+        case "terminal":
+            return TerminalBackend()
+        case "none":
+            return NullBackend()
+        case _ if name.startswith("file:"):
+            return FileBackend(Path(name.removeprefix("file:")))
+
+    if sys.platform == "darwin" and shutil.which("osascript"):
+        return OsascriptBackend()
+    if shutil.which("notify-send"):
+        return NotifySendBackend()
+    return TerminalBackend()
+
+
+_STOP = object()
+
+
+class Notifier:
+    def __init__(
+        self,
+        backend: NotificationBackend | None = None,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        dedupe_seconds: float = DEFAULT_DEDUPE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.backend = backend if backend is not None else get_backend()
+        self.workers = workers
+        self.timeout = timeout
+        self.dedupe_seconds = dedupe_seconds
+        self.sent_count = 0
+        self.failed_count = 0
+        self.dropped_count = 0
+        self._clock = clock
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._recent: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def notify(self, title: str, message: str, *, sound: str = "Glass") -> bool:
+        notification = Notification(title, message, sound)
+        key = (title, message)
+        now = self._clock()
+        with self._lock:
+            last_sent = self._recent.get(key)
+            if last_sent is not None and now - last_sent < self.dedupe_seconds:
+                return False
+            self._recent = {k: t for k, t in self._recent.items() if now - t < self.dedupe_seconds}
+            self._recent[key] = now
+            if not self._threads:
+                self._start()
+        try:
+            self._queue.put_nowait(notification)
+        except queue.Full:
+            with self._lock:
+                self.dropped_count += 1
+            return False
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+    def _start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"paper-todo-notify-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self) -> None:
+        while (notification := self._queue.get()) is not _STOP:
+            try:
+                with tracing.span("notify", "notifications", backend=type(self.backend).__name__):
+                    self.backend.send(notification, timeout=self.timeout)
+            except (OSError, subprocess.SubprocessError):
+                with self._lock:
+                    self.failed_count += 1
+                continue
+            with self._lock:
+                self.sent_count += 1
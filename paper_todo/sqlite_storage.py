@@ -0,0 +1,194 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+from paper_todo.models import AppState, Task, TimerState
+from paper_todo.storage import JsonBackend, StateConflict, StorageError, _construct_state, _last_revision
+
+SCHEMA_VERSION = 1
+
+TIMER_COLUMNS = tuple(TimerState.model_fields)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS tasks (slot INTEGER PRIMARY KEY, text TEXT NOT NULL, completed INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS backlog (id INTEGER PRIMARY KEY, text TEXT NOT NULL, completed INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS timer (id INTEGER PRIMARY KEY CHECK (id = 0), {", ".join(TIMER_COLUMNS)});
+"""
+
+# Fixed SQL strings so sqlite3's statement cache reuses the prepared statements.
+_SET_META = "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+_GET_META = "SELECT value FROM meta WHERE key = ?"
+_UPSERT_TASK = (
+    "INSERT INTO tasks (slot, text, completed) VALUES (?, ?, ?) "
+    "ON CONFLICT (slot) DO UPDATE SET text = excluded.text, completed = excluded.completed"
+)
+_SELECT_TASKS = "SELECT text, completed FROM tasks ORDER BY slot"
+_SELECT_TASK = "SELECT text, completed FROM tasks WHERE slot = ?"
+_INSERT_BACKLOG = "INSERT INTO backlog (text, completed) VALUES (?, ?)"
+_SELECT_BACKLOG = "SELECT text, completed FROM backlog ORDER BY id"
+_SELECT_BACKLOG_IDS = "SELECT id, text, completed FROM backlog ORDER BY id"
+_SELECT_BACKLOG_AT = "SELECT id, text, completed FROM backlog ORDER BY id LIMIT 1 OFFSET ?"
+_UPDATE_BACKLOG = "UPDATE backlog SET text = ?, completed = ? WHERE id = ?"
+_DELETE_BACKLOG = "DELETE FROM backlog WHERE id = ?"
+_UPSERT_TIMER = (
+    f"INSERT INTO timer (id, {', '.join(TIMER_COLUMNS)}) VALUES (0, {', '.join('?' for _ in TIMER_COLUMNS)}) "
+    f"ON CONFLICT (id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in TIMER_COLUMNS)}"
+)
+_SELECT_TIMER = f"SELECT {', '.join(TIMER_COLUMNS)} FROM timer WHERE id = 0"
+
+
+def _timer_row(timer: dict) -> tuple:
+    return tuple(timer.get(column, TimerState.model_fields[column].default) for column in TIMER_COLUMNS)
+
+
+def _row_bytes(row: tuple) -> int:
+    # Payload size of the bound values: UTF-8 text plus eight bytes per number or NULL.
+    return sum(len(value.encode()) if isinstance(value, str) else 8 for value in row)
+
+
+class SqliteBackend:
+    def __init__(self, db_file: Path, *, legacy_state_file: Path | None = None) -> None:
+        self.db_file = db_file
+        self.watch_paths = (db_file, db_file.with_name(f"{db_file.name}-wal"))
+        self.compaction_count = 0
+        self.revision = 0
+        self._written = 0
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.Error as exc:
+            raise StorageError(str(exc)) from exc
+        if self._get_meta("schema_version") is None:
+            self._initialize(legacy_state_file)
+        self.revision = self.current_revision()
+
+    def _get_meta(self, key: str) -> object:
+        row = self._conn.execute(_GET_META, (key,)).fetchone()
+        return row[0] if row else None
+
+    def _initialize(self, legacy_state_file: Path | None) -> None:
+        state = AppState()
+        migrated = legacy_state_file is not None and legacy_state_file.exists()
+        if migrated:
+            state = JsonBackend(legacy_state_file).load()
+        self.write(state, [], snapshot=True)
+        with self._lock, self._conn:
+            self._conn.execute(_SET_META, ("schema_version", SCHEMA_VERSION))
+            if migrated:
+                self._conn.execute(_SET_META, ("migrated_from", str(legacy_state_file)))
+
+    def current_revision(self) -> int:
+        with self._lock:
+            try:
+                return self._get_meta("revision") or 0
+            except sqlite3.Error as exc:
+                raise StorageError(str(exc)) from exc
+
+    def load(self) -> AppState:
+        with self._lock:
+            try:
+                tasks = self._conn.execute(_SELECT_TASKS).fetchall()
+                backlog = self._conn.execute(_SELECT_BACKLOG).fetchall()
+                timer = self._conn.execute(_SELECT_TIMER).fetchone()
+                revision = self._get_meta("revision") or 0
+            except sqlite3.Error as exc:
+                raise StorageError(str(exc)) from exc
+        self.revision = revision
+        return _construct_state(
+            {
+                "revision": revision,
+                "tasks": [{"text": text, "completed": bool(completed)} for text, completed in tasks],
+                "timer": _timer_dict(timer) if timer else TimerState().model_dump(),
+                "backlog": [{"text": text, "completed": bool(completed)} for text, completed in backlog],
+            }
+        )
+
+    def write(self, state: AppState, records: list[dict], *, snapshot: bool) -> int:
+        with self._lock:
+            try:
+                self._written = 0
+                with self._conn:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                    disk_revision = self._get_meta("revision")
+                    if disk_revision is not None and disk_revision != self.revision:
+                        raise StateConflict(self.revision, disk_revision)
+                    if snapshot:
+                        self._write_snapshot(state)
+                        revision = state.revision
+                    elif records:
+                        for record in records:
+                            self._apply_record(record)
+                        revision = _last_revision(records)
+                    else:
+                        return 0
+                    self._execute(_SET_META, ("revision", revision))
+                self.revision = revision
+                return self._written
+            except sqlite3.Error as exc:
+                raise StorageError(str(exc)) from exc
+
+    def _execute(self, sql: str, row: tuple) -> None:
+        self._conn.execute(sql, row)
+        self._written += _row_bytes(row)
+
+    def _write_snapshot(self, state: AppState) -> None:
+        # Only rows that differ from what is stored are written, so a snapshot of a long backlog with one
+        # edit costs one row rather than a rewrite of the table.
+        stored_tasks = self._conn.execute(_SELECT_TASKS).fetchall()
+        for slot, task in enumerate(state.tasks):
+            row = (task.text, int(task.completed))
+            if slot >= len(stored_tasks) or stored_tasks[slot] != row:
+                self._execute(_UPSERT_TASK, (slot, *row))
+        stored_backlog = self._conn.execute(_SELECT_BACKLOG_IDS).fetchall()
+        for (row_id, *stored), task in zip(stored_backlog, state.backlog):
+            row = (task.text, int(task.completed))
+            if tuple(stored) != row:
+                self._execute(_UPDATE_BACKLOG, (*row, row_id))
+        for task in state.backlog[len(stored_backlog) :]:
+            self._execute(_INSERT_BACKLOG, (task.text, int(task.completed)))
+        for row_id, *_ in stored_backlog[len(state.backlog) :]:
+            self._execute(_DELETE_BACKLOG, (row_id,))
+        timer = _timer_row(state.timer.model_dump())
+        stored_timer = self._conn.execute(_SELECT_TIMER).fetchone()
+        if stored_timer is None or _timer_row(_timer_dict(stored_timer)) != timer:
+            self._execute(_UPSERT_TIMER, timer)
+
+    def _apply_record(self, record: dict) -> None:
+        match record.get("op"):
+            case "task_edited":
+                task = Task.model_validate(record["task"])
+                self._execute(_UPSERT_TASK, (record["index"], task.text, task.completed))
+            case "backlog_added":
+                task = Task.model_validate(record["task"])
+                self._execute(_INSERT_BACKLOG, (task.text, task.completed))
+            case "task_promoted":
+                self._promote(record["backlog_index"], record["slot"])
+            case "timer_started" | "timer_updated" | "timer_reset":
+                self._execute(_UPSERT_TIMER, _timer_row(record["timer"]))
+
+    def _promote(self, backlog_index: int, slot: int) -> None:
+        backlog_row = self._conn.execute(_SELECT_BACKLOG_AT, (backlog_index,)).fetchone()
+        if backlog_row is None:
+            return
+        row_id, text, completed = backlog_row
+        current = self._conn.execute(_SELECT_TASK, (slot,)).fetchone()
+        if current and current[0]:
+            self._execute(_UPDATE_BACKLOG, (current[0], current[1], row_id))
+        else:
+            self._execute(_DELETE_BACKLOG, (row_id,))
+        self._execute(_UPSERT_TASK, (slot, text, completed))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _timer_dict(row: tuple) -> dict:
+    timer = dict(zip(TIMER_COLUMNS, row))
+    for column in ("is_break", "running", "warned_ten_percent"):
+        timer[column] = bool(timer[column])
+    return timer
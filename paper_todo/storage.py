@@ -1,8 +1,41 @@
 import json
 import os
+import threading
+import time
+import zlib
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Protocol, TypeVar
 
-from paper_todo.models import AppState
+from pydantic import BaseModel
+
+from paper_todo import tracing
+from paper_todo.journal import append_records, apply_record, get_journal_file, read_journal, replay
+from paper_todo.models import AppState, Task, TimerState
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+STATE_MAGIC = "paper-todo"
+STATE_SCHEMA_VERSION = 2
+
+STORAGE_ENV_VAR = "PAPER_TODO_STORAGE"
+
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_COMPACT_BYTES = 64 * 1024
+MAX_CONFLICT_RETRIES = 5
+WRITE_LATENCY_SAMPLES = 64
 
 
 def _get_default_state_file() -> Path:
@@ -17,20 +50,382 @@ def _get_default_state_file() -> Path:
     return state_dir / "state.json"
 
 
-DEFAULT_STATE_FILE = _get_default_state_file()
+def _json_loads(content: bytes) -> Any:
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def _checksum(body: bytes) -> str:
+    return f"{zlib.crc32(body):08x}"
 
 
-def _parse_state_file(content: str) -> AppState:
+def _encode_state(state: AppState) -> bytes:
+    body = state.model_dump_json().encode()
+    return f"{STATE_MAGIC} {STATE_SCHEMA_VERSION} {_checksum(body)}\n".encode() + body
+
+
+def _construct_trusted(model: type[ModelT], values: dict) -> ModelT:
+    # Equivalent to model_construct() for documents we wrote ourselves, minus its per-field default handling.
+    instance = object.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    if model.__pydantic_post_init__:
+        instance.model_post_init(None)
+    return instance
+
+
+def _construct_state(data: dict) -> AppState:
+    if data.keys() != AppState.model_fields.keys():
+        raise KeyError("state fields do not match schema")
+    return _construct_trusted(
+        AppState,
+        {
+            "revision": data["revision"],
+            "tasks": [_construct_trusted(Task, task) for task in data["tasks"]],
+            "timer": _construct_trusted(TimerState, data["timer"]),
+            "backlog": [_construct_trusted(Task, task) for task in data["backlog"]],
+        },
+    )
+
+
+def _parse_state_file(content: str | bytes) -> AppState:
+    if isinstance(content, str):
+        content = content.encode()
+
+    header, _, body = content.partition(b"\n")
+    match header.decode(errors="replace").split():
+        case [magic, version, checksum] if magic == STATE_MAGIC:
+            if version == str(STATE_SCHEMA_VERSION) and checksum == _checksum(body):
+                try:
+                    return _construct_state(_json_loads(body))
+                except (KeyError, TypeError, ValueError):
+                    pass
+        case _:
+            body = content
+
     try:
-        data = json.loads(content)
-        return AppState.model_validate(data)
-    except (json.JSONDecodeError, ValueError):
+        return AppState.model_validate(_json_loads(body))
+    except ValueError:
         return AppState()
 
 
-def load_state(state_file: Path = DEFAULT_STATE_FILE) -> AppState:
-    return _parse_state_file(state_file.read_text()) if state_file.exists() else AppState()
+def _write_atomic(path: Path, content: bytes) -> int:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+    return len(content)
+
+
+def _write_state(state: AppState, state_file: Path) -> int:
+    return _write_atomic(state_file, _encode_state(state))
+
+
+def get_lock_file(state_file: Path) -> Path:
+    return state_file.with_suffix(".lock")
+
+
+@contextmanager
+def _locked(lock_file: Path, *, shared: bool = False) -> Iterator[int]:
+    # The lock file doubles as the version counter; closing the descriptor releases the flock.
+    # Readers open it read-only so that closing it does not look like a write to file watchers.
+    fd = os.open(lock_file, (os.O_RDONLY if shared else os.O_RDWR) | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield fd
+    finally:
+        os.close(fd)
+
+
+def _read_version(fd: int) -> int | None:
+    os.lseek(fd, 0, os.SEEK_SET)
+    try:
+        return int(os.read(fd, 32))
+    except ValueError:
+        return None
+
+
+def _write_version(fd: int, revision: int) -> None:
+    content = str(revision).encode()
+    os.lseek(fd, 0, os.SEEK_SET)
+    os.write(fd, content)
+    os.ftruncate(fd, len(content))
+
+
+def _last_revision(records: list[dict]) -> int:
+    return max((record.get("rev", 0) for record in records), default=0)
+
+
+class StorageError(Exception):
+    pass
+
+
+class StateConflict(StorageError):
+    def __init__(self, expected: int, actual: int) -> None:
+        super().__init__(f"expected revision {expected}, found {actual}")
+        self.expected = expected
+        self.actual = actual
+
+
+class StorageBackend(Protocol):
+    compaction_count: int
+    revision: int
+    watch_paths: tuple[Path, ...]
+
+    def load(self) -> AppState: ...
+
+    def current_revision(self) -> int: ...
+
+    def write(self, state: AppState, records: list[dict], *, snapshot: bool) -> int: ...
+
+    def close(self) -> None: ...
+
+
+class JsonBackend:
+    def __init__(self, state_file: Path, *, compact_bytes: int = DEFAULT_COMPACT_BYTES) -> None:
+        self.state_file = state_file
+        self.journal_file = get_journal_file(state_file)
+        self.lock_file = get_lock_file(state_file)
+        self.watch_paths = (self.lock_file,)
+        self.compact_bytes = compact_bytes
+        self.compaction_count = 0
+        self.revision = self.current_revision()
+
+    def _read(self) -> AppState:
+        state = _parse_state_file(self.state_file.read_bytes()) if self.state_file.exists() else AppState()
+        return replay(state, read_journal(self.journal_file))
+
+    def _disk_revision(self, fd: int) -> int:
+        version = _read_version(fd)
+        if version is not None:
+            return version
+        # Written before the version counter existed: fall back to the revision stored in the state itself.
+        return self._read().revision if self.state_file.exists() or self.journal_file.exists() else 0
+
+    def current_revision(self) -> int:
+        with _locked(self.lock_file, shared=True) as fd:
+            return self._disk_revision(fd)
+
+    def load(self) -> AppState:
+        with _locked(self.lock_file, shared=True) as fd:
+            state = self._read()
+            version = _read_version(fd)
+        self.revision = state.revision if version is None else version
+        return state
+
+    def write(self, state: AppState, records: list[dict], *, snapshot: bool) -> int:
+        with _locked(self.lock_file) as fd:
+            disk_revision = self._disk_revision(fd)
+            if disk_revision != self.revision:
+                raise StateConflict(self.revision, disk_revision)
+
+            written = 0
+            journal_bytes = self.journal_file.stat().st_size if self.journal_file.exists() else 0
+            if records:
+                appended = append_records(self.journal_file, records)
+                journal_bytes += appended
+                written += appended
+            if snapshot or journal_bytes >= self.compact_bytes:
+                # Compaction folds the journal into the stored snapshot instead of serializing the caller's
+                # state, which may already hold changes whose records are still queued and would replay twice.
+                written += _write_state(state if snapshot else self._read(), self.state_file)
+                if journal_bytes:
+                    self.journal_file.unlink(missing_ok=True)
+                    self.compaction_count += 1
+
+            self.revision = _last_revision(records) if records else state.revision
+            _write_version(fd, self.revision)
+        return written
+
+    def close(self) -> None:
+        pass
+
+
+def open_backend(
+    state_file: Path | None = None,
+    *,
+    kind: str | None = None,
+    compact_bytes: int = DEFAULT_COMPACT_BYTES,
+) -> StorageBackend:
+    kind = kind or os.environ.get(STORAGE_ENV_VAR) or "json"
+    state_file = state_file or _get_default_state_file()
+    match kind:
+        case "json":
+            return JsonBackend(state_file, compact_bytes=compact_bytes)
+        case "sqlite":
+            from paper_todo.sqlite_storage import SqliteBackend
+
+            return SqliteBackend(state_file.with_suffix(".db"), legacy_state_file=state_file)
+        case _:
+            raise ValueError(f"Unknown storage backend: {kind!r}")
+
+
+def load_state(state_file: Path | None = None) -> AppState:
+    with tracing.span("load_state", "storage"):
+        backend = open_backend(state_file)
+        try:
+            return backend.load()
+        finally:
+            backend.close()
+
+
+def save_state(state: AppState, state_file: Path | None = None) -> None:
+    with tracing.span("save_state", "storage"):
+        backend = open_backend(state_file)
+        try:
+            backend.write(state, [], snapshot=True)
+        finally:
+            backend.close()
+
+
+class StateWriter:
+    def __init__(
+        self,
+        state_file: Path | None = None,
+        *,
+        backend: StorageBackend | None = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        journal: bool = False,
+        compact_bytes: int = DEFAULT_COMPACT_BYTES,
+    ) -> None:
+        self.backend = backend or open_backend(state_file, compact_bytes=compact_bytes)
+        self.flush_interval = flush_interval
+        self.journal = journal
+        self.flush_count = 0
+        self.bytes_written = 0
+        self.conflict_count = 0
+        # Seconds taken by each recent write, appended from the writer thread.
+        self.write_seconds: deque[float] = deque(maxlen=WRITE_LATENCY_SAMPLES)
+        self._state: AppState | None = None
+        self._pending: list[dict] = []
+        self._snapshot_due = False
+        self._in_flight = False
+        self._stale = False
+        self._urgent = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def compaction_count(self) -> int:
+        return self.backend.compaction_count
+
+    @property
+    def watch_paths(self) -> tuple[Path, ...]:
+        return self.backend.watch_paths
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._closed = False
+            self._thread = threading.Thread(target=self._run, name="paper-todo-writer", daemon=True)
+            self._thread.start()
+
+    def record(self, state: AppState, record: dict) -> None:
+        # Revisions are assigned when the records are written, after checking what is already on disk.
+        # Without a journal the records are only kept to rebase the snapshot onto a conflicting write.
+        with self._condition:
+            self._state = state
+            self._pending.append(record)
+            if not self.journal:
+                self._snapshot_due = True
+
+    def mark_dirty(self, state: AppState) -> None:
+        with self._condition:
+            self._state = state
+            self._snapshot_due = True
+
+    def flush(self) -> None:
+        with self._condition:
+            self._urgent = True
+            self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._write_pending()
+        self.backend.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not (self._closed or self._urgent):
+                    self._condition.wait(self.flush_interval)
+                closed = self._closed
+                self._urgent = False
+            self._write_pending()
+            if closed:
+                return
+
+    @property
+    def has_unwritten_changes(self) -> bool:
+        with self._condition:
+            return bool(self._pending or self._snapshot_due or self._in_flight)
+
+    def pull(self) -> AppState | None:
+        # Wait for local changes to be written first, so they are not replaced by an older stored copy.
+        if self.has_unwritten_changes:
+            return None
+        with self._io_lock:
+            if not self._stale and self.backend.current_revision() == self.backend.revision:
+                return None
+            state = self.backend.load()
+            self._stale = False
+            return state
 
+    def _write_pending(self) -> None:
+        with self._condition:
+            state = self._state
+            records, self._pending = self._pending, []
+            snapshot_due, self._snapshot_due = self._snapshot_due, False
+            if state is None or not (records or snapshot_due):
+                return
+            if snapshot_due:
+                # Snapshot the state as of the drained records; the UI keeps mutating the live one.
+                state = state.model_copy(deep=True)
+            self._in_flight = True
+        try:
+            with self._io_lock, tracing.span("save_state", "storage", records=len(records), snapshot=snapshot_due):
+                started = time.perf_counter()
+                written = self._write_rebasing(state, records, snapshot_due)
+                self.write_seconds.append(time.perf_counter() - started)
+        except (OSError, StorageError):
+            with self._condition:
+                self._pending[:0] = records
+                self._snapshot_due = self._snapshot_due or snapshot_due
+            return
+        finally:
+            with self._condition:
+                self._in_flight = False
+        self.bytes_written += written
+        self.flush_count += 1
 
-def save_state(state: AppState, state_file: Path = DEFAULT_STATE_FILE) -> None:
-    state_file.write_text(state.model_dump_json(indent=2))
+    def _write_rebasing(self, state: AppState, records: list[dict], snapshot: bool) -> int:
+        target = state
+        for _ in range(MAX_CONFLICT_RETRIES):
+            base = self.backend.revision
+            numbered = []
+            if self.journal:
+                numbered = [{**record, "rev": base + offset} for offset, record in enumerate(records, 1)]
+            with self._condition:
+                target.revision = base + (len(numbered) or 1)
+            try:
+                return self.backend.write(target, numbered, snapshot=snapshot)
+            except StateConflict:
+                self.conflict_count += 1
+                self._stale = True
+                if not records:
+                    # Without records there is nothing to rebase; the newer stored state wins and pull() loads it.
+                    return 0
+                target = self.backend.load()
+                for record in records:
+                    try:
+                        apply_record(target, record)
+                    except (KeyError, IndexError, TypeError, AttributeError, ValueError):
+                        continue
+        raise StorageError(f"gave up after {MAX_CONFLICT_RETRIES} conflicting writes")
@@ -1,6 +1,30 @@
+import json
 import os
+import re
+import select
+import sys
+import time
 from dataclasses import dataclass
 from enum import StrEnum
+from pathlib import Path
+
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = None
+    tty = None
+
+THEME_CACHE_FILE_NAME = "theme-cache.json"
+# Local terminals answer within a millisecond or two; a slow link misses the answer rather than the first paint.
+OSC11_TIMEOUT = 0.005
+# Cached answers, including "no answer", are re-checked after a day so a changed terminal profile is picked up.
+THEME_CACHE_SECONDS = 24 * 60 * 60
+_OSC11_QUERY = b"\x1b]11;?\x1b\\"
+# Every terminal answers a primary device attributes request, so its reply marks the end of the answers.
+_DA1_QUERY = b"\x1b[c"
+_OSC11_REPLY = re.compile(rb"\x1b\]11;rgb:([0-9a-fA-F]{1,4})/([0-9a-fA-F]{1,4})/([0-9a-fA-F]{1,4})")
+_DA1_REPLY = re.compile(rb"\x1b\[\?[0-9;]*c")
 
 
 class ThemeMode(StrEnum):
@@ -54,7 +78,7 @@ PALETTES = {
 }
 
 
-def _detect_terminal_theme() -> ThemeMode | None:
+def _colorfgbg_theme() -> ThemeMode | None:
     if (colorfgbg := os.environ.get("COLORFGBG")):
         parts = colorfgbg.split(";")
         if len(parts) >= 2:
@@ -66,18 +90,132 @@ def _detect_terminal_theme() -> ThemeMode | None:
                     return ThemeMode.LIGHT
             except ValueError:
                 pass
+    return None
+
 
+def _terminal_program_theme() -> ThemeMode | None:
     if os.environ.get("TERM_PROGRAM") in ("iTerm.app", "Apple_Terminal", "Hyper", "WezTerm"):
         return ThemeMode.DARK
-
     return None
 
 
-def detect_system_theme() -> ThemeMode:
+def _parse_background(reply: bytes) -> tuple[float, float, float] | None:
+    if (match := _OSC11_REPLY.search(reply)) is None:
+        return None
+    red, green, blue = (int(channel, 16) / (16 ** len(channel) - 1) for channel in match.groups())
+    return red, green, blue
+
+
+def _theme_for_background(background: tuple[float, float, float]) -> ThemeMode:
+    red, green, blue = background
+    luminance = 0.2126 * red + 0.7152 * green + 0.0722 * blue
+    return ThemeMode.DARK if luminance < 0.5 else ThemeMode.LIGHT
+
+
+def _read_reply(fd: int, deadline: float) -> bytes:
+    reply = b""
+    while not _DA1_REPLY.search(reply) and (remaining := deadline - time.monotonic()) > 0:
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            break
+        chunk = os.read(fd, 1024)
+        if not chunk:
+            break
+        reply += chunk
+    return reply
+
+
+def _query_background(timeout: float = OSC11_TIMEOUT) -> tuple[float, float, float] | None:
+    if termios is None or not (sys.stdin.isatty() and sys.stdout.isatty()):
+        return None
+    try:
+        fd = os.open("/dev/tty", os.O_RDWR | os.O_NOCTTY)
+    except OSError:
+        return None
+    try:
+        saved = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd, termios.TCSANOW)
+            os.write(fd, _OSC11_QUERY + _DA1_QUERY)
+            reply = _read_reply(fd, time.monotonic() + timeout)
+            # Drop anything already in the input queue so a straggling answer is not read as keystrokes.
+            termios.tcflush(fd, termios.TCIFLUSH)
+        finally:
+            termios.tcsetattr(fd, termios.TCSANOW, saved)
+    except (OSError, termios.error):
+        return None
+    finally:
+        os.close(fd)
+    return _parse_background(reply)
+
+
+def _terminal_identity() -> str:
+    markers = [os.environ.get("TERM_PROGRAM", ""), os.environ.get("TERM", "")]
+    if os.environ.get("TMUX"):
+        markers.append("tmux")
+    if os.environ.get("SSH_CONNECTION") or os.environ.get("SSH_TTY"):
+        markers.append("ssh")
+    return "|".join(markers)
+
+
+def get_theme_cache_file() -> Path:
+    from paper_todo.storage import _get_default_state_file
+
+    return _get_default_state_file().with_name(THEME_CACHE_FILE_NAME)
+
+
+def _read_theme_cache(cache_file: Path) -> dict[str, dict]:
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_theme_cache(cache_file: Path, cache: dict[str, dict]) -> None:
+    tmp_file = cache_file.with_name(f".{cache_file.name}.tmp")
+    tmp_file.write_text(json.dumps(cache))
+    tmp_file.replace(cache_file)
+
+
+def _cached_theme(entry: object, now: float) -> tuple[bool, ThemeMode | None]:
+    # Returns whether the entry is usable, and the mode it holds (None when the terminal did not answer).
+    if not isinstance(entry, dict) or not isinstance(entry.get("at"), (int, float)):
+        return False, None
+    if not 0 <= now - entry["at"] < THEME_CACHE_SECONDS:
+        return False, None
+    if entry.get("mode") is None:
+        return True, None
+    try:
+        return True, ThemeMode(entry["mode"])
+    except ValueError:
+        return False, None
+
+
+def detect_system_theme(*, cache_file: Path | None = None) -> ThemeMode:
     if (env_scheme := os.environ.get("COLORSCHEME")):
         return ThemeMode.LIGHT if "light" in env_scheme.lower() else ThemeMode.DARK
-
-    if (terminal_theme := _detect_terminal_theme()):
+    if (colorfgbg_theme := _colorfgbg_theme()):
+        return colorfgbg_theme
+
+    # Terminals are queried once; later launches in the same kind of terminal reuse the answer.
+    cache_file = cache_file or get_theme_cache_file()
+    identity = _terminal_identity()
+    cache = _read_theme_cache(cache_file)
+    now = time.time()
+    cached, mode = _cached_theme(cache.get(identity), now)
+    if not cached:
+        background = _query_background()
+        mode = None if background is None else _theme_for_background(background)
+        cache[identity] = {"mode": None if mode is None else mode.value, "at": now}
+        try:
+            _write_theme_cache(cache_file, cache)
+        except OSError:
+            pass
+    if mode is not None:
+        return mode
+
+    if (terminal_theme := _terminal_program_theme()):
         return terminal_theme
 
     return ThemeMode.DARK
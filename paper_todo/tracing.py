@@ -0,0 +1,148 @@
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any
+
+_NULL_SPAN = nullcontext()
+
+# Chrome trace-event recorder (open the output in https://ui.perfetto.dev). While this is None the
+# helpers below return a shared no-op, so instrumented call sites cost a global lookup and a call.
+tracer: "Tracer | None" = None
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.events: list[dict] = []
+        self._pid = os.getpid()
+        self._origin = time.perf_counter_ns()
+        self._thread_names: dict[int, str] = {}
+        self._ids = itertools.count(1)
+
+    def now(self) -> float:
+        return (time.perf_counter_ns() - self._origin) / 1000
+
+    def _tid(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        return tid
+
+    def add(self, event: dict) -> None:
+        # list.append is atomic, so the writer and notification threads can record without a lock.
+        self.events.append({"pid": self._pid, "tid": self._tid(), **event})
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def to_json(self) -> dict:
+        metadata = [
+            {"ph": "M", "name": "thread_name", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self._thread_names.items()
+        ]
+        return {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_json()))
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_cat", "_args", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: dict[str, Any]) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._args = args
+        self._start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self._start = self._tracer.now()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        duration = self._tracer.now() - self._start
+        self._tracer.add(
+            {"ph": "X", "name": self._name, "cat": self._cat, "ts": self._start, "dur": duration, "args": self._args}
+        )
+
+
+# Ended from another callback or task, so it is recorded as a nestable async event.
+class AsyncSpan:
+    __slots__ = ("_tracer", "_name", "_cat", "_id", "_ended")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: dict[str, Any]) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._id = tracer.next_id()
+        self._ended = False
+        tracer.add({"ph": "b", "name": name, "cat": cat, "id": self._id, "ts": tracer.now(), "args": args})
+
+    def end(self) -> None:
+        if not self._ended:
+            self._ended = True
+            self._tracer.add(
+                {"ph": "e", "name": self._name, "cat": self._cat, "id": self._id, "ts": self._tracer.now()}
+            )
+
+    def __enter__(self) -> "AsyncSpan":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.end()
+
+
+class _NullAsyncSpan:
+    __slots__ = ()
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NullAsyncSpan":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+_NULL_ASYNC_SPAN = _NullAsyncSpan()
+
+
+def span(name: str, cat: str, **args: Any) -> Any:
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, cat, args)
+
+
+def begin(name: str, cat: str, **args: Any) -> AsyncSpan | _NullAsyncSpan:
+    if tracer is None:
+        return _NULL_ASYNC_SPAN
+    return AsyncSpan(tracer, name, cat, args)
+
+
+def instant(name: str, cat: str, **args: Any) -> None:
+    if tracer is not None:
+        tracer.add({"ph": "i", "s": "t", "name": name, "cat": cat, "ts": tracer.now(), "args": args})
+
+
+def counter(name: str, cat: str, **values: float) -> None:
+    if tracer is not None:
+        tracer.add({"ph": "C", "name": name, "cat": cat, "ts": tracer.now(), "args": values})
+
+
+def start() -> Tracer:
+    global tracer
+    tracer = Tracer()
+    return tracer
+
+
+def stop(path: Path | None = None) -> Tracer | None:
+    global tracer
+    stopped, tracer = tracer, None
+    if stopped is not None and path is not None:
+        stopped.write(path)
+    return stopped
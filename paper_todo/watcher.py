@@ -0,0 +1,128 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+POLL_INTERVAL = 1.0
+
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_Q_OVERFLOW = 0x4000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * _EVENT_HEADER.size
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, "inotify_init1") else None
+
+
+def _stat_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+# Watches the parent directories with inotify, since the files may be replaced or not exist yet, and
+# falls back to polling stat results. Bursts of events become a single on_change call.
+class StateWatcher:
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        on_change: Callable[[], None],
+        *,
+        poll_interval: float = POLL_INTERVAL,
+        use_inotify: bool = True,
+    ) -> None:
+        self.paths = tuple(paths)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.mode: str | None = None
+        self._names = {path.name.encode() for path in self.paths}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._fd: int | None = None
+        self._poll_handle: asyncio.TimerHandle | None = None
+        self._stats: list[tuple[int, int, int] | None] = []
+        self._scheduled = False
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self.use_inotify and (fd := self._open_inotify()) is not None:
+            self._fd = fd
+            self._loop.add_reader(fd, self._read_events)
+            self.mode = "inotify"
+        else:
+            self._stats = [_stat_key(path) for path in self.paths]
+            self._poll_handle = self._loop.call_later(self.poll_interval, self._poll)
+            self.mode = "poll"
+
+    def stop(self) -> None:
+        if self._fd is not None:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        if self._poll_handle is not None:
+            self._poll_handle.cancel()
+            self._poll_handle = None
+        self.mode = None
+
+    def _open_inotify(self) -> int | None:
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        for directory in {path.parent for path in self.paths}:
+            if libc.inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK) < 0:
+                os.close(fd)
+                return None
+        return fd
+
+    def _read_events(self) -> None:
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return
+        offset = 0
+        changed = False
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + name_length].rstrip(b"\0")
+            offset += name_length
+            changed = changed or mask & _IN_Q_OVERFLOW or name in self._names
+        if changed:
+            self._schedule()
+
+    def _poll(self) -> None:
+        stats = [_stat_key(path) for path in self.paths]
+        if stats != self._stats:
+            self._stats = stats
+            self._schedule()
+        self._poll_handle = self._loop.call_later(self.poll_interval, self._poll)
+
+    def _schedule(self) -> None:
+        if not self._scheduled:
+            self._scheduled = True
+            self._loop.call_soon(self._fire)
+
+    def _fire(self) -> None:
+        self._scheduled = False
+        self.on_change()
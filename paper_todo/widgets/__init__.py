@@ -1,6 +1,17 @@
+from paper_todo.widgets.backlog_list import BacklogList
 from paper_todo.widgets.duration_indicator import DurationIndicator
+from paper_todo.widgets.perf_hud import PerfHud
 from paper_todo.widgets.progress_bar import ProgressBarTimer
+from paper_todo.widgets.progress_track import ProgressTrack
 from paper_todo.widgets.task_indicator import TaskIndicator
 from paper_todo.widgets.task_row import TaskRow
 
-__all__ = ["DurationIndicator", "ProgressBarTimer", "TaskIndicator", "TaskRow"]
+__all__ = [
+    "BacklogList",
+    "DurationIndicator",
+    "PerfHud",
+    "ProgressBarTimer",
+    "ProgressTrack",
+    "TaskIndicator",
+    "TaskRow",
+]
@@ -0,0 +1,81 @@
+from rich.segment import Segment
+from textual.binding import Binding
+from textual.geometry import Region, Size
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from paper_todo.models import Task
+
+
+class BacklogList(ScrollView, can_focus=True):
+    COMPONENT_CLASSES = {
+        "backlog-list--task",
+        "backlog-list--completed",
+        "backlog-list--cursor",
+    }
+
+    BINDINGS = [
+        Binding("up,k", "cursor_up", show=False),
+        Binding("down,j", "cursor_down", show=False),
+        Binding("pageup", "page_up", show=False),
+        Binding("pagedown", "page_down", show=False),
+        Binding("home", "first", show=False),
+        Binding("end", "last", show=False),
+    ]
+
+    cursor = reactive(0)
+
+    def __init__(self, tasks: list[Task], *, id: str | None = None) -> None:
+        super().__init__(id=id)
+        self.tasks = tasks
+        self.virtual_size = Size(0, len(tasks))
+
+    def set_tasks(self, tasks: list[Task]) -> None:
+        self.tasks = tasks
+        self.virtual_size = Size(0, len(tasks))
+        self.cursor = self.validate_cursor(self.cursor)
+        self.refresh()
+
+    def validate_cursor(self, cursor: int) -> int:
+        return max(0, min(cursor, len(self.tasks) - 1))
+
+    def watch_cursor(self, old: int, new: int) -> None:
+        scroll_y = self.scroll_offset.y
+        width = self.size.width
+        self.refresh(Region(0, old - scroll_y, width, 1), Region(0, new - scroll_y, width, 1))
+        self.scroll_to_region(Region(0, new, width, 1), animate=False)
+
+    def render_line(self, y: int) -> Strip:
+        index = self.scroll_offset.y + y
+        width = self.size.width
+        if index >= len(self.tasks):
+            return Strip.blank(width, self.rich_style)
+
+        task = self.tasks[index]
+        if index == self.cursor:
+            style = self.get_component_rich_style("backlog-list--cursor")
+        elif task.completed:
+            style = self.get_component_rich_style("backlog-list--completed")
+        else:
+            style = self.get_component_rich_style("backlog-list--task")
+        mark = "x" if task.completed else " "
+        return Strip([Segment(f"{index + 1:>4} [{mark}] {task.text}", style)]).adjust_cell_length(width, style)
+
+    def action_cursor_up(self) -> None:
+        self.cursor -= 1
+
+    def action_cursor_down(self) -> None:
+        self.cursor += 1
+
+    def action_page_up(self) -> None:
+        self.cursor -= max(1, self.size.height - 1)
+
+    def action_page_down(self) -> None:
+        self.cursor += max(1, self.size.height - 1)
+
+    def action_first(self) -> None:
+        self.cursor = 0
+
+    def action_last(self) -> None:
+        self.cursor = len(self.tasks) - 1
@@ -31,6 +31,8 @@ class DurationIndicator(Static):
         return self._state
 
     def set_state(self, state: DurationState) -> None:
+        if state == self._state:
+            return
         self._state = state
         self._apply_state()
 
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Sequence
+
+from textual.timer import Timer
+from textual.widgets import Static
+
+from paper_todo.animation import get_scheduler
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+REFRESH_SECONDS = 1.0
+LAG_PROBE_SECONDS = 0.25
+SAMPLE_WINDOW = 120
+FPS_WINDOW_SECONDS = 1.0
+
+
+def _rss() -> str:
+    try:
+        with open("/proc/self/statm") as statm:
+            return f"{int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20:.1f}MiB"
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return "-"
+    # Only the peak is available without /proc; macOS reports it in bytes and Linux in kilobytes.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return f"{(peak if sys.platform == 'darwin' else peak * 1024) / 2**20:.1f}MiB peak"
+
+
+def _format_ms(seconds: float, *, signed: bool = False) -> str:
+    return f"{seconds * 1000:{'+' if signed else ''}.1f}ms"
+
+
+def _last_and_worst(samples: Sequence[float], *, signed: bool = False) -> str:
+    if not samples:
+        return "-"
+    worst = max(samples, key=abs)
+    return f"{_format_ms(samples[-1], signed=signed)}  worst {_format_ms(worst, signed=signed)}"
+
+
+def _frames_per_second(frame_times: Sequence[float], now: float) -> str:
+    recent = sum(1 for stamp in frame_times if now - stamp <= FPS_WINDOW_SECONDS)
+    return f"{recent / FPS_WINDOW_SECONDS:.0f}" if recent else "idle"
+
+
+class PerfHud(Static):
+    def __init__(self, write_seconds: Sequence[float], **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.write_seconds = write_seconds
+        self.frame_times: deque[float] = deque(maxlen=SAMPLE_WINDOW)
+        self.loop_lag: deque[float] = deque(maxlen=SAMPLE_WINDOW)
+        self.tick_jitter: deque[float] = deque(maxlen=SAMPLE_WINDOW)
+        self._probe: asyncio.TimerHandle | None = None
+        self._refresh_timer: Timer | None = None
+        self.display = False
+
+    @property
+    def sampling(self) -> bool:
+        return self._probe is not None
+
+    def on_mount(self) -> None:
+        self._refresh_timer = self.set_interval(REFRESH_SECONDS, self.refresh_stats, pause=True)
+
+    def on_unmount(self) -> None:
+        self._stop_sampling()
+
+    def toggle(self) -> None:
+        if self.sampling:
+            self._stop_sampling()
+            self.display = False
+        else:
+            self._start_sampling()
+            self.refresh_stats()
+            self.display = True
+
+    def record_frame(self, apply_seconds: float, present_seconds: float) -> None:
+        self.frame_times.append(time.monotonic())
+
+    def record_tick(self, jitter_seconds: float) -> None:
+        if self.sampling:
+            self.tick_jitter.append(jitter_seconds)
+
+    def render_stats(self) -> str:
+        return "\n".join(
+            [
+                f"fps   {_frames_per_second(self.frame_times, time.monotonic())}",
+                f"save  {_last_and_worst(list(self.write_seconds))}",
+                f"lag   {_last_and_worst(self.loop_lag)}",
+                f"tick  {_last_and_worst(self.tick_jitter, signed=True)}",
+                f"rss   {_rss()}",
+            ]
+        )
+
+    def refresh_stats(self) -> None:
+        self.update(self.render_stats())
+
+    def _start_sampling(self) -> None:
+        get_scheduler().frame_observers.append(self.record_frame)
+        loop = asyncio.get_running_loop()
+        self._probe = loop.call_later(LAG_PROBE_SECONDS, self._probe_lag, loop.time() + LAG_PROBE_SECONDS)
+        if self._refresh_timer is not None:
+            self._refresh_timer.resume()
+
+    def _stop_sampling(self) -> None:
+        if self.record_frame in get_scheduler().frame_observers:
+            get_scheduler().frame_observers.remove(self.record_frame)
+        if self._probe is not None:
+            self._probe.cancel()
+            self._probe = None
+        if self._refresh_timer is not None:
+            self._refresh_timer.pause()
+
+    def _probe_lag(self, due: float) -> None:
+        loop = asyncio.get_running_loop()
+        self.loop_lag.append(max(0.0, loop.time() - due))
+        self._probe = loop.call_later(LAG_PROBE_SECONDS, self._probe_lag, loop.time() + LAG_PROBE_SECONDS)
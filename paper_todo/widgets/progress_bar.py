@@ -5,16 +5,21 @@ from textual.app import ComposeResult
 from textual.containers import Horizontal
 from textual.widgets import Label, Static
 
+from paper_todo import tracing
 from paper_todo.animation import (
     RAINBOW_CYCLE_MS,
+    SLIDE_DURATION_MS,
+    RepeatingTimeline,
     generate_knight_rider_frames,
     generate_slide_frames,
-    get_rainbow_color,
+    get_scheduler,
     run_animation,
+    slide_timeline,
 )
 from paper_todo.models import AppState
-from paper_todo.theme import ThemeMode, get_palette
+from paper_todo.theme import ThemeMode
 from paper_todo.widgets.duration_indicator import DurationIndicator, DurationState
+from paper_todo.widgets.progress_track import ProgressTrack
 
 
 class ProgressBarState(StrEnum):
@@ -28,33 +33,44 @@ class ProgressBarState(StrEnum):
 DURATION_LABELS = ["1", "2", "3", "4", "5", "★"]
 DURATION_MINUTES = [10, 20, 30, 40, 50, 10]
 
+TRANSITION_HOLD_MS = 300
+
 
 class ProgressBarTimer(Static):
-    def __init__(self, state: AppState, theme_mode: ThemeMode = ThemeMode.DARK) -> None:
+    def __init__(
+        self,
+        state: AppState,
+        theme_mode: ThemeMode = ThemeMode.DARK,
+        *,
+        transition_ms: float = SLIDE_DURATION_MS,
+    ) -> None:
         super().__init__()
         self.app_state = state
         self.theme_mode = theme_mode
+        self.transition_ms = transition_ms
         self._bar_state = ProgressBarState.IDLE
         self._selected_index: int | None = None
         self._active_index: int | None = None
         self._fill_percent: float = 0.0
         self._is_break: bool = False
         self._rainbow_offset: int = 0
-        self._celebration_task: asyncio.Task | None = None
+        self.indicators = [DurationIndicator(label, state=DurationState.DIM) for label in DURATION_LABELS]
+        self.track = ProgressTrack(id="progress-bar")
+        self.status = Label("", id="timer-status")
+        self._status_text = ""
+        self._rainbow_timeline: RepeatingTimeline | None = None
 
     def compose(self) -> ComposeResult:
         with Horizontal(id="duration-row"):
-            for i, label in enumerate(DURATION_LABELS):
-                yield DurationIndicator(label, state=DurationState.DIM)
-        yield Static("", id="progress-bar")
-        yield Label("", id="timer-status")
+            yield from self.indicators
+        yield self.track
+        yield self.status
 
     def on_mount(self) -> None:
         self._refresh_display()
 
     def _refresh_display(self) -> None:
-        indicators = list(self.query(DurationIndicator))
-        for i, indicator in enumerate(indicators):
+        for i, indicator in enumerate(self.indicators):
             match self._bar_state:
                 case ProgressBarState.IDLE:
                     indicator.set_state(DurationState.DIM)
@@ -75,56 +91,35 @@ class ProgressBarTimer(Static):
         self._update_fill()
 
     def _update_status_text(self) -> None:
-        status = self.query_one("#timer-status", Label)
         match self._bar_state:
             case ProgressBarState.IDLE:
-                status.update("Press S to start")
+                text = "Press S to start"
             case ProgressBarState.SELECTING:
-                status.update("Selecting duration...")
+                text = "Selecting duration..."
             case ProgressBarState.TRANSITIONING:
-                status.update("Starting timer...")
+                text = "Starting timer..."
             case ProgressBarState.RUNNING:
                 remaining = self.app_state.timer.remaining_seconds
                 minutes = remaining // 60
                 seconds = remaining % 60
                 task_info = "Break" if self._is_break else f"Task {(self.app_state.timer.task_index or 0) + 1}"
-                status.update(f"{task_info}: {minutes:02d}:{seconds:02d}")
+                text = f"{task_info}: {minutes:02d}:{seconds:02d}"
             case ProgressBarState.CELEBRATION:
-                status.update("Complete!")
+                text = "Complete!"
+
+        if text != self._status_text:
+            self._status_text = text
+            self.status.update(text)
 
     def _update_fill(self) -> None:
-        bar = self.query_one("#progress-bar", Static)
-
-        try:
-            bar_width = bar.size.width
-        except Exception:
-            bar_width = 60
-
-        if bar_width <= 0:
-            bar_width = 60
-
-        filled_width = int(bar_width * self._fill_percent)
-        empty_width = bar_width - filled_width
-
-        palette = get_palette(self.theme_mode)
-
-        if self._bar_state == ProgressBarState.CELEBRATION or self._is_break:
-            fill_chars = []
-            for i in range(filled_width):
-                color = get_rainbow_color(i + self._rainbow_offset)
-                fill_chars.append(f"[{color}]█[/]")
-            fill_str = "".join(fill_chars)
-            empty_str = f"[{palette.surface}]{'░' * empty_width}[/]" if empty_width > 0 else ""
-            line = fill_str + empty_str
-            bar.update(f"{line}\n{line}\n{line}")
-        else:
-            if filled_width > 0:
-                fill_str = f"[{palette.blue}]{'█' * filled_width}[/]"
-            else:
-                fill_str = ""
-            empty_str = f"[{palette.surface}]{'░' * empty_width}[/]" if empty_width > 0 else ""
-            line = fill_str + empty_str
-            bar.update(f"{line}\n{line}\n{line}")
+        rainbow = self._bar_state == ProgressBarState.CELEBRATION or self._is_break
+        with tracing.span("update_fill", "widgets"):
+            self.track.set_fill(
+                self._fill_percent,
+                theme_mode=self.theme_mode,
+                rainbow=rainbow,
+                phase=self._rainbow_offset,
+            )
 
     async def animate_duration_selection(self) -> int:
         self._bar_state = ProgressBarState.SELECTING
@@ -135,7 +130,8 @@ class ProgressBarTimer(Static):
 
         def on_frame(idx: int) -> None:
             self._active_index = idx
-            self._refresh_display()
+            with self.app.batch_update():
+                self._refresh_display()
 
         final_index = await run_animation(frames, on_frame)
         self._selected_index = final_index
@@ -148,15 +144,21 @@ class ProgressBarTimer(Static):
         self._is_break = is_break
         self._refresh_display()
 
-        await asyncio.sleep(0.3)
+        # Time-to-running is bounded by 2 * transition_ms; a transition_ms of 0 starts immediately.
+        if self.transition_ms > 0:
+            await asyncio.sleep(min(TRANSITION_HOLD_MS, self.transition_ms) / 1000)
+
+            slide_positions = generate_slide_frames(
+                start_position=selected_index / 5,
+                end_position=1.0,
+                duration_ms=self.transition_ms,
+            )
 
-        slide_frames = generate_slide_frames(
-            start_position=selected_index / 5,
-            end_position=1.0,
-        )
+            def on_frame(idx: int) -> None:
+                self._fill_percent = slide_positions[idx]
+                self._update_fill()
 
-        for _ in slide_frames:
-            await asyncio.sleep(0.016)
+            await run_animation(slide_timeline(self.transition_ms), on_frame)
 
         self._bar_state = ProgressBarState.RUNNING
         self._fill_percent = 0.0
@@ -166,19 +168,21 @@ class ProgressBarTimer(Static):
             self._start_rainbow_animation()
 
     def _start_rainbow_animation(self) -> None:
-        async def rainbow_loop() -> None:
-            try:
-                while self._bar_state in (ProgressBarState.RUNNING, ProgressBarState.CELEBRATION) and self._is_break:
-                    self._rainbow_offset += 1
-                    if self.is_mounted:
-                        self._update_fill()
-                    await asyncio.sleep(RAINBOW_CYCLE_MS / 1000)
-            except Exception:
-                pass
-
-        if self._celebration_task:
-            self._celebration_task.cancel()
-        self._celebration_task = asyncio.create_task(rainbow_loop())
+        def on_tick(tick: int) -> None:
+            if self._bar_state not in (ProgressBarState.RUNNING, ProgressBarState.CELEBRATION) or not self._is_break:
+                self._stop_rainbow_animation()
+                return
+            self._rainbow_offset = tick
+            if self.is_mounted:
+                self._update_fill()
+
+        self._stop_rainbow_animation()
+        self._rainbow_timeline = get_scheduler().repeat(RAINBOW_CYCLE_MS, on_tick)
+
+    def _stop_rainbow_animation(self) -> None:
+        if self._rainbow_timeline:
+            self._rainbow_timeline.cancel()
+            self._rainbow_timeline = None
 
     def update_fill(self, elapsed_seconds: int, total_seconds: int) -> None:
         if total_seconds > 0:
@@ -200,9 +204,7 @@ class ProgressBarTimer(Static):
         self.reset()
 
     def reset(self) -> None:
-        if self._celebration_task:
-            self._celebration_task.cancel()
-            self._celebration_task = None
+        self._stop_rainbow_animation()
 
         self._bar_state = ProgressBarState.IDLE
         self._selected_index = None
@@ -0,0 +1,60 @@
+from functools import lru_cache
+
+from rich.segment import Segment
+from rich.style import Style
+from textual.strip import Strip
+from textual.widget import Widget
+
+from paper_todo.animation import RAINBOW_COLORS
+from paper_todo.theme import ThemeMode, get_palette
+
+TRACK_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def _track_styles(theme_mode: ThemeMode) -> tuple[Style, Style, tuple[Style, ...]]:
+    palette = get_palette(theme_mode)
+    return (
+        Style(color=palette.blue),
+        Style(color=palette.surface),
+        tuple(Style(color=color) for color in RAINBOW_COLORS),
+    )
+
+
+@lru_cache(maxsize=TRACK_CACHE_SIZE)
+def _render_track(width: int, filled: int, theme_mode: ThemeMode, rainbow: bool, phase: int) -> Strip:
+    fill_style, empty_style, rainbow_styles = _track_styles(theme_mode)
+    segments = []
+    if rainbow:
+        segments.extend(Segment("█", rainbow_styles[(i + phase) % len(rainbow_styles)]) for i in range(filled))
+    elif filled > 0:
+        segments.append(Segment("█" * filled, fill_style))
+    if width > filled:
+        segments.append(Segment("░" * (width - filled), empty_style))
+    return Strip(segments, width)
+
+
+class ProgressTrack(Widget):
+    def __init__(self, *, id: str | None = None) -> None:
+        super().__init__(id=id)
+        self._fill_percent = 0.0
+        self._theme_mode = ThemeMode.DARK
+        self._rainbow = False
+        self._phase = 0
+        self._painted_key: tuple | None = None
+
+    def _key(self, width: int) -> tuple[int, int, ThemeMode, bool, int]:
+        return (width, int(width * self._fill_percent), self._theme_mode, self._rainbow, self._phase)
+
+    def set_fill(self, fill_percent: float, *, theme_mode: ThemeMode, rainbow: bool, phase: int) -> None:
+        self._fill_percent = fill_percent
+        self._theme_mode = theme_mode
+        self._rainbow = rainbow
+        self._phase = phase % len(RAINBOW_COLORS) if rainbow else 0
+        if self._key(self.size.width) != self._painted_key:
+            self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        key = self._key(self.size.width)
+        self._painted_key = key
+        return _render_track(*key)
@@ -32,6 +32,8 @@ class TaskIndicator(Static):
         return self._state
 
     def set_state(self, state: IndicatorState) -> None:
+        if state == self._state:
+            return
         self._state = state
         self._apply_state()
 
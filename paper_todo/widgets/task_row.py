@@ -1,57 +1,81 @@
+from typing import Callable
+
 from textual.app import ComposeResult
 from textual.containers import Horizontal
 from textual.widgets import Label
 
-from paper_todo.models import Task
+from paper_todo.models import AppState, ChangeKind, StateChange, Task
 from paper_todo.widgets.task_indicator import IndicatorState, TaskIndicator
 
+ACTIVE_TIMER_FIELDS = frozenset({None, "running", "task_index"})
+
 
 class TaskRow(Horizontal):
-    def __init__(self, index: int, task_model: Task) -> None:
+    def __init__(self, index: int, state: AppState) -> None:
         super().__init__()
         self.index = index
-        self._task_data = task_model
+        self.state = state
         self.indicator: TaskIndicator | None = None
+        self.label: Label | None = None
+        self._rendered: tuple[str, bool, bool] | None = None
+        self._unsubscribe: Callable[[], None] | None = None
 
     @property
     def task_model(self) -> Task:
-        return self._task_data
+        return self.state.tasks[self.index]
 
-    @task_model.setter
-    def task_model(self, value: Task) -> None:
-        self._task_data = value
+    @property
+    def is_active(self) -> bool:
+        return self.state.timer.running and self.state.timer.task_index == self.index
 
     def compose(self) -> ComposeResult:
-        initial_state = IndicatorState.INACTIVE if self._task_data.completed else IndicatorState.DIM
+        initial_state = IndicatorState.INACTIVE if self.task_model.completed else IndicatorState.DIM
         self.indicator = TaskIndicator(self.index + 1, state=initial_state)
+        self.label = Label(self._format_text(), classes="task-text")
         yield self.indicator
-        yield Label(self._format_text(), classes="task-text")
+        yield self.label
+
+    def on_mount(self) -> None:
+        self._unsubscribe = self.state.subscribe(self._on_state_change)
+        self.refresh_display()
+
+    def on_unmount(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def _on_state_change(self, change: StateChange) -> None:
+        match change.kind:
+            case ChangeKind.TASK if change.index in (None, self.index):
+                self.refresh_display()
+            case ChangeKind.TIMER if change.field in ACTIVE_TIMER_FIELDS:
+                if self._rendered is None or self._rendered[2] != self.is_active:
+                    self.refresh_display()
 
     def _format_text(self) -> str:
-        return self._task_data.text or "(empty)"
-
-    def refresh_display(self, *, is_active: bool = False) -> None:
-        label = self.query_one(".task-text", Label)
-        text = self._task_data.text or "(empty)"
-
-        label.update(text)
-        if self._task_data.completed:
-            label.add_class("completed")
-            label.remove_class("active")
-        elif is_active:
-            label.remove_class("completed")
-            label.add_class("active")
-        else:
-            label.remove_class("completed", "active")
+        return self.task_model.text or "(empty)"
+
+    def refresh_display(self) -> None:
+        task = self.task_model
+        is_active = self.is_active
 
         if self.indicator:
-            if self._task_data.completed:
+            if task.completed:
                 self.indicator.set_state(IndicatorState.INACTIVE)
             elif is_active:
                 self.indicator.set_state(IndicatorState.BRIGHT)
             else:
                 self.indicator.set_state(IndicatorState.DIM)
 
+        rendered = (self._format_text(), task.completed, is_active)
+        if self.label is None or rendered == self._rendered:
+            return
+        self._rendered = rendered
+
+        self.label.update(rendered[0])
+        self.label.set_class(task.completed, "completed")
+        self.label.set_class(is_active and not task.completed, "active")
+
     def set_indicator_state(self, state: IndicatorState) -> None:
         if self.indicator:
             self.indicator.set_state(state)
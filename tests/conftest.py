@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_home(tmp_path, monkeypatch):
+    # Instances coordinate through the shared state directory, so every test gets its own.
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
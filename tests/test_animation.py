@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import pytest
+
+from paper_todo.animation import (
+    KNIGHT_RIDER_TOTAL_MS,
+    MIN_FRAME_INTERVAL_MS,
+    AnimationFrame,
+    FramePacer,
+    generate_knight_rider_frames,
+    generate_slide_frames,
+    get_scheduler,
+    run_animation,
+    slide_timeline,
+)
+
+
+async def test_run_animation_returns_final_index():
+    applied = []
+    frames = [AnimationFrame(index=i, delay_ms=20) for i in range(5)]
+
+    assert await run_animation(frames, applied.append) == 4
+    assert applied == [0, 1, 2, 3, 4]
+
+
+async def test_run_animation_empty_frames():
+    assert await run_animation([], lambda _: None) == -1
+
+
+async def test_run_animation_drops_late_frames():
+    applied = []
+
+    def slow_frame(idx: int) -> None:
+        applied.append(idx)
+        time.sleep(0.03)
+
+    frames = [AnimationFrame(index=i, delay_ms=10) for i in range(10)]
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    assert await run_animation(frames, slow_frame) == 9
+    assert applied[-1] == 9
+    assert len(applied) < len(frames)
+    assert loop.time() - start < 0.3 + 0.03 * len(applied)
+
+
+async def test_timelines_share_one_scheduler():
+    applied = []
+    ticks = []
+    scheduler = get_scheduler()
+    rainbow = scheduler.repeat(5, ticks.append)
+
+    await asyncio.gather(
+        run_animation([AnimationFrame(index=i, delay_ms=10) for i in range(3)], applied.append),
+        run_animation([AnimationFrame(index=i, delay_ms=10) for i in range(10, 13)], applied.append),
+    )
+    rainbow.cancel()
+
+    assert get_scheduler() is scheduler
+    assert sorted(applied) == [0, 1, 2, 10, 11, 12]
+    assert ticks == sorted(ticks)
+    assert ticks
+
+
+def test_frame_pacer_clamps_interval():
+    pacer = FramePacer(min_interval_ms=16, max_interval_ms=250)
+    assert pacer.interval == 0.016
+
+    for _ in range(50):
+        pacer.record(1.0)
+    assert pacer.interval == 0.25
+
+
+async def test_slow_presentation_lowers_rate_but_keeps_duration_and_final_index():
+    applied = []
+    loop = asyncio.get_running_loop()
+    scheduler = get_scheduler()
+    scheduler.presenter = lambda callback: loop.call_later(0.04, callback)
+
+    frames = [AnimationFrame(index=i, delay_ms=10) for i in range(30)]
+    start = loop.time()
+
+    assert await run_animation(frames, applied.append) == 29
+    elapsed = loop.time() - start
+    assert applied[-1] == 29
+    assert len(applied) < len(frames) / 2
+    assert scheduler.pacer.interval > 0.016
+    assert 0.3 <= elapsed < 0.4
+
+
+async def test_frame_observers_see_apply_and_present_time():
+    timings = []
+    loop = asyncio.get_running_loop()
+    scheduler = get_scheduler()
+    scheduler.presenter = lambda callback: loop.call_later(0.01, callback)
+    scheduler.frame_observers.append(lambda apply, present: timings.append((apply, present)))
+
+    def slow_frame(idx: int) -> None:
+        time.sleep(0.005)
+
+    await run_animation([AnimationFrame(index=i, delay_ms=20) for i in range(3)], slow_frame)
+    await asyncio.sleep(0.02)
+
+    assert len(timings) == 3
+    assert all(apply >= 0.005 and present >= 0.009 for apply, present in timings)
+
+
+def test_slide_frames_ease_between_positions():
+    positions = generate_slide_frames(0.2, 1.0, duration_ms=400, fps=30)
+
+    assert positions[0] == 0.2
+    assert positions[-1] == 1.0
+    assert positions == sorted(positions)
+
+
+def test_slide_timeline_is_cached_and_spans_duration():
+    frames = slide_timeline(400, 30)
+
+    assert slide_timeline(400, 30) is frames
+    assert sum(frame.delay_ms for frame in frames) == pytest.approx(400)
+    assert len(frames) == len(generate_slide_frames(0.0, 1.0, duration_ms=400, fps=30))
+
+
+@pytest.mark.parametrize("final_index", range(6))
+def test_knight_rider_stops_on_final_index(final_index):
+    frames = generate_knight_rider_frames(list(range(6)), final_index=final_index)
+
+    assert frames[-1].index == final_index
+    assert frames[0].index == 0
+    assert frames.total_ms <= KNIGHT_RIDER_TOTAL_MS + 1e-6
+
+
+@pytest.mark.parametrize("num_positions", [6, 50, 500])
+def test_knight_rider_fits_total_duration(num_positions):
+    positions = list(range(num_positions))
+    frames = generate_knight_rider_frames(positions, final_index=num_positions // 3)
+
+    assert frames[-1].index == num_positions // 3
+    assert frames.total_ms == pytest.approx(KNIGHT_RIDER_TOTAL_MS)
+    assert min(frame.delay_ms for frame in frames) >= MIN_FRAME_INTERVAL_MS
+
+
+def test_knight_rider_frames_are_memoized():
+    first = generate_knight_rider_frames([0, 2, 4], final_index=2)
+    assert generate_knight_rider_frames([0, 2, 4], final_index=2) is first
+    assert generate_knight_rider_frames([0, 2, 4], final_index=4) is not first
+
+
+def test_knight_rider_unknown_final_index_is_appended():
+    frames = generate_knight_rider_frames([1, 4], final_index=9, num_cycles=1)
+    assert [frame.index for frame in frames] == [1, 4, 9]
@@ -1,10 +1,7 @@
 import pytest
 
-from paper_todo.app import (
-    _calculate_duration_and_break,
-    _format_timer_time,
-    _get_timer_status,
-)
+from paper_todo.app import _calculate_duration_and_break
+from paper_todo.formatting import _format_timer_time, _get_timer_status
 from paper_todo.models import TimerState
 
 
@@ -1,9 +1,14 @@
+import time
 from unittest.mock import patch
 
 import pytest
 
+from paper_todo import journal, tracing
 from paper_todo.app import PaperTodoApp
+from paper_todo.history import HistoryStore
 from paper_todo.models import AppState, Task, TimerState
+from paper_todo.notifications import FileBackend, Notifier
+from paper_todo.storage import StateWriter, load_state
 
 
 def _fresh_state() -> AppState:
@@ -83,7 +88,7 @@ async def test_action_blocked_during_timer(key, check_screen_stack):
     state = _fresh_state()
     state.tasks[0].text = "Test task"
     state.timer.start(0, 10, is_break=False)
-    initial_remaining = state.timer.remaining_seconds
+    initial_ends_at = state.timer.ends_at
     with patch("paper_todo.app.load_state", return_value=state):
         app = PaperTodoApp()
         async with app.run_test() as pilot:
@@ -92,7 +97,7 @@ async def test_action_blocked_during_timer(key, check_screen_stack):
             await pilot.pause(delay=0.5)
             if check_screen_stack:
                 assert len(pilot.app.screen_stack) == 1
-            assert app.state.timer.remaining_seconds == initial_remaining
+            assert app.state.timer.ends_at == initial_ends_at
 
 
 async def test_start_no_incomplete_tasks():
@@ -135,7 +140,8 @@ async def test_start_with_confirmation(random_choices, expected_minutes, is_brea
             await pilot.pause(delay=1.0)
             assert app.state.timer.running
             assert app.state.timer.is_break is is_break
-            assert app.state.timer.remaining_seconds == expected_minutes * 60
+            assert app.state.timer.duration_seconds == expected_minutes * 60
+            assert expected_minutes * 60 - 5 <= app.state.timer.remaining_seconds <= expected_minutes * 60
 
 
 async def test_start_with_confirmation_cancel():
@@ -204,3 +210,157 @@ async def test_timer_persists_on_mount():
             await pilot.pause()
             assert app.state.timer.running
             assert app.state.timer.remaining_seconds == 600
+
+
+async def test_timer_restore_includes_time_elapsed_while_closed():
+    state = _fresh_state()
+    state.tasks[0].text = "Task"
+    state.timer.start(0, 10, is_break=False, now=time.time() - 300)
+    with patch("paper_todo.app.load_state", return_value=state):
+        app = PaperTodoApp()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            assert app.state.timer.running
+            assert 290 <= app.state.timer.remaining_seconds <= 300
+            assert app.progress_bar._fill_percent >= 0.5
+
+
+async def test_timer_expired_while_closed_finishes_on_mount(tmp_path):
+    state = _fresh_state()
+    state.tasks[0].text = "Task"
+    state.timer.start(0, 10, is_break=False, now=time.time() - 3600)
+    backend = FileBackend(tmp_path / "notifications.jsonl")
+    with patch("paper_todo.app.load_state", return_value=state):
+        app = PaperTodoApp(notifier=Notifier(backend))
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await pilot.pause()
+            assert not app.state.timer.running
+
+    assert [n.message for n in backend.read()] == ["Time's up! Task 1 complete."]
+
+
+async def test_backlog_promotes_task_into_slot():
+    state = _fresh_state()
+    state.backlog = [Task(text=f"Backlog {i}") for i in range(500)]
+    with patch("paper_todo.app.load_state", return_value=state):
+        app = PaperTodoApp()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await pilot.press("b")
+            await pilot.pause()
+            assert len(list(app.screen.query("*"))) < 20
+            await pilot.press("down", "down", "3")
+            await pilot.pause()
+
+            assert app.state.tasks[2].text == "Backlog 2"
+            assert len(app.state.backlog) == 499
+
+
+async def test_task_change_only_rerenders_its_row():
+    with patch("paper_todo.app.load_state", return_value=_fresh_state()):
+        app = PaperTodoApp()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            with (
+                patch.object(app.task_rows[0], "refresh_display") as changed_row,
+                patch.object(app.task_rows[1], "refresh_display") as other_row,
+            ):
+                app.state.tasks[0].text = "Only me"
+
+            changed_row.assert_called_once()
+            other_row.assert_not_called()
+
+
+async def test_ended_session_is_recorded_in_history(tmp_path):
+    state = _fresh_state()
+    state.tasks[0].text = "Test task"
+    state.timer.start(0, 10, is_break=False, now=time.time() - 120)
+    store = HistoryStore(tmp_path / "history.jsonl")
+    with patch("paper_todo.app.load_state", return_value=state):
+        app = PaperTodoApp(history=store)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await pilot.press("e")
+            await pilot.pause()
+            await pilot.press("h")
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert "Test task" in str(app.screen.query_one("#stats-body").render())
+
+    assert store.today()["sessions"] == 1
+    assert 120 <= store.load_columns().elapsed_seconds[0] < 130
+
+
+async def test_external_change_updates_only_affected_row():
+    state = load_state()
+    with patch("paper_todo.app.load_state", return_value=state):
+        app = PaperTodoApp()
+        app.state_watcher.poll_interval = 0.01
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            refreshed = []
+            for row in app.task_rows:
+                row.refresh_display = lambda row=row: refreshed.append(row.index)
+
+            other = load_state()
+            other.tasks[2].text = "From another terminal"
+            other.timer.start(2, 20)
+            writer = StateWriter(journal=True)
+            writer.record(other, journal.task_edited(2, other.tasks[2]))
+            writer.record(other, journal.timer_started(other.timer))
+            writer.close()
+            await pilot.pause(0.2)
+
+            assert app.state.tasks[2].text == "From another terminal"
+            assert app.state.timer.running
+            assert app.timer_worker is not None
+            assert set(refreshed) == {2}
+
+
+async def test_tracing_follows_a_key_press_to_the_saved_state():
+    state = _fresh_state()
+    state.tasks[0].text = "Test task"
+    state.timer.start(0, 10, is_break=False)
+    recorder = tracing.start()
+    try:
+        with patch("paper_todo.app.load_state", return_value=state):
+            app = PaperTodoApp()
+            async with app.run_test() as pilot:
+                await pilot.pause()
+                await pilot.press("c")
+                await pilot.pause()
+    finally:
+        tracing.stop()
+
+    names = {event["name"] for event in recorder.events}
+    assert {"key c", "dispatch c", "action complete_and_end", "save_state"} <= names
+    assert any(name.startswith("state ") for name in names)
+    key_phases = [event["ph"] for event in recorder.events if event["name"] == "key c"]
+    assert key_phases == ["b", "e"]
+
+
+async def test_perf_hud_samples_only_while_shown():
+    state = _fresh_state()
+    state.tasks[0].text = "Test task"
+    state.timer.start(0, 10, is_break=False)
+    with patch("paper_todo.app.load_state", return_value=state):
+        app = PaperTodoApp()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            main_region = app.query_one("#main-content").region
+            assert not app.perf_hud.display
+
+            await pilot.press("p")
+            await pilot.pause(1.1)
+            assert app.perf_hud.display
+            assert app.query_one("#main-content").region == main_region
+            assert app.perf_hud.loop_lag
+            assert app.perf_hud.tick_jitter
+            assert "rss" in str(app.perf_hud.render())
+
+            await pilot.press("p")
+            await pilot.pause()
+            assert not app.perf_hud.display
+            assert not app.perf_hud.sampling
@@ -0,0 +1,42 @@
+import json
+
+from benchmarks import bench_ui
+from benchmarks.suite import BENCHMARKS, compare, main
+
+
+def test_suite_covers_track_widths_from_40_to_400():
+    assert {"track.fill.width=40", "track.fill.width=400"} <= BENCHMARKS.keys()
+
+
+def test_compare_flags_only_regressions_past_threshold():
+    baseline = {"fast": {"seconds": 1.0}, "slow": {"seconds": 1.0}, "gone": {"seconds": 1.0}}
+    results = {"fast": {"seconds": 1.2}, "slow": {"seconds": 1.3}, "new": {"seconds": 5.0}}
+
+    assert compare(baseline, results, threshold=0.25) == ["slow"]
+
+
+def test_check_fails_against_faster_baseline(tmp_path):
+    baseline_file = tmp_path / "baseline.json"
+    args = ["-k", "incomplete_indices.state", "--repeat", "1", "--baseline", str(baseline_file)]
+    assert main([*args, "--save-baseline"]) == 0
+
+    document = json.loads(baseline_file.read_text())
+    document["results"]["incomplete_indices.state"]["seconds"] /= 10
+    baseline_file.write_text(json.dumps(document))
+
+    assert main([*args, "--check"]) == 1
+
+
+def test_check_without_baseline_is_an_error(tmp_path):
+    assert main(["-k", "nothing", "--check", "--baseline", str(tmp_path / "missing.json")]) == 2
+
+
+def test_ui_scenario_report_is_machine_readable(tmp_path):
+    output = tmp_path / "ui.json"
+
+    assert bench_ui.main(["theme_toggles", "--iterations", "1", "--output", str(output)]) == 0
+
+    report = json.loads(output.read_text())["scenarios"]["theme_toggles"]
+    assert report["repaint"]["count"] > 0
+    assert {"p50_ms", "p95_ms", "p99_ms"} <= report["loop_lag"].keys()
+    assert report["allocations"].keys() == {"net_blocks", "gc_collections", "tracemalloc_peak_bytes"}
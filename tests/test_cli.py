@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+from paper_todo.cli import _format_status_line, main
+from paper_todo.history import HistoryStore
+from paper_todo.models import AppState, TimerState
+from paper_todo.storage import _get_default_state_file, load_state, save_state
+
+
+@pytest.fixture
+def state_file():
+    return _get_default_state_file()
+
+
+def test_format_status_line_running():
+    timer = TimerState()
+    timer.start(task_index=2, duration_minutes=20, now=0)
+    timer.pause(now=75)
+    assert _format_status_line(timer) == "▶ Task 3 18:45"
+
+
+def test_status_short(state_file, capsys):
+    assert main(["status", "--short"]) == 0
+    assert capsys.readouterr().out == "Ready to start!\n"
+
+
+def test_add_fills_first_empty_slot(state_file, capsys):
+    state = AppState()
+    state.tasks[0].text = "Existing"
+    save_state(state, state_file)
+
+    assert main(["add", "New task"]) == 0
+
+    assert capsys.readouterr().out == "Added task 2\n"
+    assert load_state(state_file).tasks[1].text == "New task"
+
+
+def test_add_to_backlog(state_file, capsys):
+    assert main(["add", "--backlog", "Someday"]) == 0
+
+    assert capsys.readouterr().out == "Added backlog task 1\n"
+    assert load_state(state_file).backlog[0].text == "Someday"
+
+
+def test_import_appends_lines_to_backlog(state_file, tmp_path, capsys):
+    tasks_file = tmp_path / "tasks.txt"
+    tasks_file.write_text("".join(f"Task {i}\n" for i in range(300)) + "\n")
+
+    assert main(["import", str(tasks_file)]) == 0
+
+    assert capsys.readouterr().out == "Imported 300 tasks into the backlog\n"
+    loaded = load_state(state_file)
+    assert len(loaded.backlog) == 300
+    assert loaded.backlog[-1].text == "Task 299"
+    assert all(not task.text for task in loaded.tasks)
+
+
+def test_add_without_empty_slot_fails(state_file):
+    state = AppState()
+    for task in state.tasks:
+        task.text = "Full"
+    save_state(state, state_file)
+
+    assert main(["add", "Overflow"]) == 1
+
+
+def test_done_ends_timer_for_that_task(state_file):
+    state = AppState()
+    state.tasks[2].text = "Active"
+    state.timer.start(task_index=2, duration_minutes=10)
+    save_state(state, state_file)
+
+    assert main(["done", "3"]) == 0
+
+    loaded = load_state(state_file)
+    assert loaded.tasks[2].completed is True
+    assert loaded.timer.running is False
+
+
+@pytest.mark.parametrize("task", ["0", "7"])
+def test_done_rejects_out_of_range(state_file, task):
+    assert main(["done", task]) == 1
+
+
+def test_done_rejects_empty_slot(state_file, capsys):
+    save_state(AppState(), state_file)
+
+    assert main(["done", "2"]) == 1
+    assert "Task 2 is empty" in capsys.readouterr().err
+    assert load_state(state_file).tasks[1].completed is False
+
+
+def test_end_without_timer_fails(state_file):
+    assert main(["end"]) == 1
+
+
+def test_end_resets_timer(state_file, capsys):
+    state = AppState()
+    state.timer.start(task_index=None, duration_minutes=10, is_break=True)
+    save_state(state, state_file)
+
+    assert main(["end"]) == 0
+    assert not load_state(state_file).timer.running
+    assert HistoryStore().today()["sessions"] == 1
+
+
+def test_trace_option_writes_trace_after_the_app_exits(tmp_path, monkeypatch):
+    from paper_todo import app, tracing
+
+    monkeypatch.setattr(app, "main", lambda **kwargs: tracing.instant("ran", "test"))
+    output = tmp_path / "trace.json"
+
+    assert main(["--trace", str(output)]) == 0
+    assert tracing.tracer is None
+    events = json.loads(output.read_text())["traceEvents"]
+    assert [event["name"] for event in events if event["ph"] != "M"] == ["ran"]
+
+
+def test_trace_option_covers_subcommands(tmp_path):
+    from paper_todo import tracing
+
+    output = tmp_path / "trace.json"
+
+    assert main(["--trace", str(output), "add", "Traced"]) == 0
+    assert tracing.tracer is None
+    events = json.loads(output.read_text())["traceEvents"]
+    assert {"load_state", "save_state"} <= {event["name"] for event in events}
+
+
+@pytest.mark.parametrize("command", [["done", "1"], ["end"]])
+def test_timer_is_reset_when_history_cannot_be_written(state_file, capsys, command):
+    state = AppState()
+    state.tasks[0].text = "Active"
+    state.timer.start(task_index=0, duration_minutes=10)
+    save_state(state, state_file)
+    HistoryStore().history_file.mkdir()
+
+    assert main(command) == 0
+
+    assert "Could not write session history" in capsys.readouterr().err
+    assert load_state(state_file).timer.running is False
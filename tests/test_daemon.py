@@ -0,0 +1,212 @@
+import asyncio
+import json
+import socket
+import time
+from unittest.mock import patch
+
+import pytest
+
+from paper_todo import journal
+from paper_todo.app import PaperTodoApp
+from paper_todo.cli import main
+from paper_todo.daemon import DaemonClient, DaemonError, TimerDaemon, _encode, _recv_line, get_socket_file
+from paper_todo.history import HistoryStore
+from paper_todo.models import AppState, Task
+from paper_todo.notifications import FileBackend, Notifier
+from paper_todo.storage import _get_default_state_file, load_state, save_state
+
+
+async def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def daemon(tmp_path):
+    state_file = _get_default_state_file()
+    state = AppState()
+    state.tasks[0].text = "Existing"
+    save_state(state, state_file)
+    running = TimerDaemon(
+        state_file,
+        flush_interval=60,
+        notifier=Notifier(FileBackend(tmp_path / "notifications.jsonl")),
+        history=HistoryStore(tmp_path / "history.jsonl"),
+    )
+    task = asyncio.create_task(running.serve())
+    await _wait_for(get_socket_file(state_file).exists)
+    yield running
+    running.stop()
+    await task
+
+
+async def test_client_receives_snapshot_and_other_clients_changes(daemon):
+    first = await asyncio.to_thread(DaemonClient.connect)
+    second = await asyncio.to_thread(DaemonClient.connect)
+    assert first.state.tasks[0].text == "Existing"
+    changes = []
+    second.on_change = lambda: changes.append(None)
+    second.start()
+    try:
+        first.state.tasks[1].text = "From first"
+        first.record(first.state, journal.task_edited(1, first.state.tasks[1]))
+        await _wait_for(lambda: changes)
+
+        fresh = second.pull()
+        assert fresh.tasks[1].text == "From first"
+        assert second.pull() is None
+        assert daemon.state.tasks[1].text == "From first"
+    finally:
+        await asyncio.to_thread(first.close)
+        await asyncio.to_thread(second.close)
+
+
+async def test_daemon_expires_timer_once_and_notifies_subscribers(daemon, tmp_path):
+    client = await asyncio.to_thread(DaemonClient.connect)
+    client.on_change = lambda: None
+    client.start()
+    try:
+        client.state.timer.start(0, 10, is_break=False, now=time.time() - 599.9)
+        client.record(client.state, journal.timer_started(client.state.timer))
+
+        await _wait_for(lambda: not daemon.state.timer.running)
+        await _wait_for(lambda: (fresh := client.pull()) is not None and not fresh.timer.running)
+    finally:
+        await asyncio.to_thread(client.close)
+
+    backend = FileBackend(tmp_path / "notifications.jsonl")
+    await _wait_for(lambda: len(backend.read()) == 2)
+    assert [n.message.split(":")[0] for n in backend.read()] == ["10% remaining", "Time's up! Task 1 complete."]
+    assert HistoryStore(tmp_path / "history.jsonl").today()["sessions"] == 1
+
+
+def _exchange(messages: list[object]) -> list[dict]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(str(get_socket_file()))
+        replies, buffer = [], b""
+        for message in messages:
+            sock.sendall(_encode(message))
+            line, _, buffer = _recv_line(sock, buffer)
+            replies.append(json.loads(line))
+        return replies
+
+
+async def test_malformed_messages_get_error_replies(daemon):
+    valid = journal.task_edited(1, Task(text="Valid"))
+    replies = await asyncio.to_thread(
+        _exchange,
+        [
+            {"t": "apply", "records": "nope"},
+            {"t": "apply", "records": [{"index": 0}, ["op"], {"op": "task_edited", "index": 0}, valid]},
+            {"t": "bye"},
+        ],
+    )
+    assert [reply["t"] for reply in replies] == ["error", "error", "bye"]
+    assert replies[1]["message"] == "3 of 4 records not applied"
+    assert daemon.state.tasks[1].text == "Valid"
+
+    assert await asyncio.to_thread(_exchange, [[1, 2]]) == [{"t": "error", "message": "messages must be JSON objects"}]
+    client = await asyncio.to_thread(DaemonClient.connect)
+    assert client is not None
+    await asyncio.to_thread(client.close)
+
+
+async def test_client_drops_malformed_messages(daemon):
+    client = await asyncio.to_thread(DaemonClient.connect)
+    try:
+        for message in (
+            [1, 2],
+            {"t": "records"},
+            {"t": "records", "records": "nope"},
+            {"t": "records", "records": [{"op": "task_edited", "index": "0"}]},
+            {"t": "snapshot"},
+            {"t": "snapshot", "state": {"tasks": "nope"}},
+        ):
+            client._receive(message)
+        assert client.pull() is None
+    finally:
+        await asyncio.to_thread(client.close)
+
+
+async def test_cli_commands_go_through_the_daemon(daemon, capsys):
+    assert await asyncio.to_thread(main, ["add", "Via daemon"]) == 0
+    assert daemon.state.tasks[1].text == "Via daemon"
+
+    assert await asyncio.to_thread(main, ["status"]) == 0
+    assert "2 [ ] Via daemon" in capsys.readouterr().out
+
+
+async def test_state_is_persisted_when_daemon_stops(tmp_path):
+    running = TimerDaemon(flush_interval=60, notifier=Notifier(FileBackend(tmp_path / "n.jsonl")))
+    task = asyncio.create_task(running.serve())
+    await _wait_for(get_socket_file().exists)
+    await asyncio.to_thread(main, ["add", "--backlog", "Someday"])
+
+    running.stop()
+    await task
+
+    assert not get_socket_file().exists()
+    assert [t.text for t in load_state().backlog] == ["Someday"]
+
+
+async def test_second_daemon_is_refused_and_stale_socket_reclaimed(daemon, tmp_path):
+    with pytest.raises(DaemonError):
+        await TimerDaemon(notifier=Notifier(FileBackend(tmp_path / "n.jsonl"))).serve()
+
+    stale = tmp_path / "stale" / "state.json"
+    stale.parent.mkdir()
+    get_socket_file(stale).write_text("")
+    other = TimerDaemon(stale, notifier=Notifier(FileBackend(tmp_path / "n.jsonl")))
+    task = asyncio.create_task(other.serve())
+    await _wait_for(get_socket_file(stale).is_socket)
+    client = await asyncio.to_thread(DaemonClient.connect, stale)
+    assert client is not None
+    await asyncio.to_thread(client.close)
+    other.stop()
+    await task
+
+
+async def test_client_falls_back_to_the_state_file_when_daemon_stops(tmp_path):
+    running = TimerDaemon(flush_interval=60, notifier=Notifier(FileBackend(tmp_path / "n.jsonl")))
+    task = asyncio.create_task(running.serve())
+    await _wait_for(get_socket_file().exists)
+    client = await asyncio.to_thread(DaemonClient.connect)
+    client.start()
+
+    running.stop()
+    await task
+    await _wait_for(lambda: not client.connected)
+
+    client.state.add_to_backlog(Task(text="After daemon"))
+    client.record(client.state, journal.backlog_added(client.state.backlog[-1]))
+    await asyncio.to_thread(client.close)
+    assert [t.text for t in load_state().backlog] == ["After daemon"]
+
+
+async def test_app_applies_deltas_and_leaves_expiry_to_the_daemon(daemon, tmp_path):
+    app_client = await asyncio.to_thread(DaemonClient.connect)
+    backend = FileBackend(tmp_path / "app-notifications.jsonl")
+    with patch("paper_todo.app.load_state", side_effect=AssertionError("daemon clients do not load")):
+        app = PaperTodoApp(daemon=app_client, notifier=Notifier(backend))
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        assert app.state.tasks[0].text == "Existing"
+        assert not app.owns_timer
+
+        other = await asyncio.to_thread(DaemonClient.connect)
+        other.state.tasks[2].text = "Typed elsewhere"
+        other.record(other.state, journal.task_edited(2, other.state.tasks[2]))
+        other.state.timer.start(2, 10, is_break=False, now=time.time() - 599.5)
+        other.record(other.state, journal.timer_started(other.state.timer))
+        await asyncio.to_thread(other.close)
+
+        await _wait_for(lambda: app.state.tasks[2].text == "Typed elsewhere")
+        await _wait_for(lambda: not daemon.state.timer.running)
+        await _wait_for(lambda: not app.state.timer.running)
+        await pilot.pause()
+
+    assert backend.read() == []
+    assert HistoryStore(tmp_path / "history.jsonl").today()["sessions"] == 1
@@ -0,0 +1,89 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from paper_todo import history
+from paper_todo.history import HistoryStore, SessionOutcome, aggregate_sessions
+from paper_todo.models import TimerState
+
+MONDAY = datetime(2025, 3, 3, 9, 0).timestamp()
+NEXT_MONDAY = datetime(2025, 3, 10, 9, 0).timestamp()
+
+
+def _finish(store: HistoryStore, started_at: float, minutes: int, task: str | None, *, elapsed: float) -> None:
+    timer = TimerState()
+    timer.start(None if task is None else 0, minutes, is_break=task is None, now=started_at)
+    store.record_finish(timer, task, SessionOutcome.COMPLETED, now=started_at + elapsed)
+
+
+def test_record_finish_keeps_elapsed_time_after_reset(tmp_path):
+    store = HistoryStore(tmp_path / "history.jsonl")
+    timer = TimerState()
+    timer.start(0, 20, now=MONDAY)
+    store.record_start(timer, "Write", now=MONDAY)
+    store.record_finish(timer, "Write", SessionOutcome.ENDED, now=MONDAY + 300)
+    timer.reset()
+
+    [column_elapsed] = store.load_columns().elapsed_seconds
+    assert column_elapsed == 300
+    assert store.today(MONDAY) == {"seconds": 300, "sessions": 1}
+
+
+def test_rollups_are_updated_incrementally(tmp_path):
+    store = HistoryStore(tmp_path / "history.jsonl")
+    _finish(store, MONDAY, 10, "Write", elapsed=600)
+    _finish(store, MONDAY + 3600, 20, "Read", elapsed=1200)
+    _finish(store, NEXT_MONDAY, 10, None, elapsed=600)
+
+    rollups = store.rollups()
+
+    assert rollups["daily"]["2025-03-03"] == {"seconds": 1800, "sessions": 2}
+    assert rollups["weekly"]["2025-W10"] == {"seconds": 1800, "sessions": 2}
+    assert rollups["weekly"]["2025-W11"] == {"seconds": 600, "sessions": 1}
+    assert store.this_week(NEXT_MONDAY)["sessions"] == 1
+
+
+def test_missing_history_has_empty_rollups(tmp_path):
+    store = HistoryStore(tmp_path / "history.jsonl")
+
+    assert store.today() == {"seconds": 0.0, "sessions": 0}
+    assert len(store.load_columns()) == 0
+    assert aggregate_sessions(store.load_columns()).sessions == 0
+
+
+def test_concurrent_finishes_all_reach_the_rollups(tmp_path):
+    store = HistoryStore(tmp_path / "history.jsonl")
+
+    def finish_several() -> None:
+        for _ in range(10):
+            _finish(store, MONDAY, 10, "Write", elapsed=60)
+
+    threads = [threading.Thread(target=finish_several) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.today(MONDAY) == {"seconds": 2400, "sessions": 40}
+    assert [path.name for path in tmp_path.iterdir() if path.name.endswith(".tmp")] == []
+
+
+@pytest.mark.parametrize("with_numpy", [True, False])
+def test_aggregate_sessions(tmp_path, monkeypatch, with_numpy):
+    if with_numpy and history.np is None:
+        pytest.skip("numpy not installed")
+    if not with_numpy:
+        monkeypatch.setattr(history, "np", None)
+    store = HistoryStore(tmp_path / "history.jsonl")
+    _finish(store, MONDAY, 10, "Write", elapsed=600)
+    _finish(store, MONDAY, 20, "Read", elapsed=300)
+    _finish(store, MONDAY, 20, "Write", elapsed=1200)
+    _finish(store, MONDAY, 10, None, elapsed=600)
+
+    stats = aggregate_sessions(store.load_columns())
+
+    assert stats.sessions == 4
+    assert stats.total_seconds == 2700
+    assert stats.per_task == [("Write", 1800), ("Break", 600), ("Read", 300)]
+    assert stats.per_duration == [(10, 1200), (20, 1500)]
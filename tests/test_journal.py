@@ -0,0 +1,70 @@
+from paper_todo import journal
+from paper_todo.models import AppState, Task, TimerState
+
+
+def test_replay_applies_records_in_revision_order():
+    state = AppState()
+    timer = TimerState()
+    timer.start(task_index=1, duration_minutes=20)
+    timer.warned_ten_percent = True
+    records = [
+        {**journal.timer_started(timer), "rev": 1},
+        {**journal.timer_changed("timer_updated", timer), "rev": 2},
+    ]
+
+    replayed = journal.replay(state, records)
+
+    assert replayed.revision == 2
+    assert replayed.timer.running is True
+    assert replayed.timer.task_index == 1
+    assert replayed.timer.warned_ten_percent is True
+    assert replayed.timer.ends_at == timer.ends_at
+
+
+def test_replay_skips_records_already_in_snapshot():
+    state = AppState(revision=5)
+    state.tasks[0].text = "Newer"
+    stale = {"op": "task_edited", "index": 0, "task": {"text": "Older"}, "rev": 3}
+
+    assert journal.replay(state, [stale]).tasks[0].text == "Newer"
+
+
+def test_read_journal_skips_torn_lines(tmp_path):
+    journal_file = tmp_path / "state.journal"
+    record = {"op": "task_edited", "index": 0, "task": {"text": "Kept"}, "rev": 1}
+    journal.append_records(journal_file, [record])
+    with journal_file.open("ab") as handle:
+        handle.write(b'{"op": "ta')
+
+    assert journal.read_journal(journal_file) == [record]
+
+
+def test_replay_ignores_unknown_ops():
+    state = journal.replay(AppState(), [{"op": "from_the_future", "rev": 1}])
+    assert state.revision == 1
+
+
+def test_replay_skips_wrong_typed_records():
+    records = [
+        {"op": "task_edited", "index": "0", "task": {"text": "Wrong"}, "rev": 1},
+        {"op": "backlog_added", "task": "Wrong", "rev": 2},
+        {"op": "task_edited", "index": 1, "task": {"text": "Kept"}, "rev": 3},
+    ]
+
+    state = journal.replay(AppState(), records)
+
+    assert [task.text for task in state.tasks[:2]] == ["", "Kept"]
+    assert state.backlog == []
+    assert state.revision == 3
+
+
+def test_replay_backlog_add_and_promote():
+    records = [
+        {**journal.backlog_added(Task(text="Someday")), "rev": 1},
+        {**journal.task_promoted(0, 4), "rev": 2},
+    ]
+
+    state = journal.replay(AppState(), records)
+
+    assert state.tasks[4].text == "Someday"
+    assert state.backlog == []
@@ -2,6 +2,9 @@ import pytest
 
 from paper_todo.models import (
     TASK_CHAR_LIMIT,
+    AppState,
+    ChangeKind,
+    StateChange,
     Task,
     TimerState,
     get_incomplete_task_indices,
@@ -22,18 +25,42 @@ def test_task_max_length_rejected():
         Task(text="x" * (TASK_CHAR_LIMIT + 1))
 
 
-@pytest.mark.parametrize(
-    ("running", "initial_remaining", "expected_remaining"),
-    [
-        (True, 60, 59),
-        (False, 100, 100),
-    ],
-    ids=["running-decrements", "stopped-unchanged"],
-)
-def test_timer_tick(running, initial_remaining, expected_remaining):
-    timer = TimerState(running=running, remaining_seconds=initial_remaining)
-    timer.tick()
-    assert timer.remaining_seconds == expected_remaining
+def test_timer_remaining_derived_from_deadline():
+    timer = TimerState()
+    timer.start(task_index=0, duration_minutes=10, now=1000.0)
+
+    assert timer.ends_at == 1600.0
+    assert timer.seconds_remaining(now=1000.0) == 600
+    assert timer.seconds_remaining(now=1059.5) == 540.5
+    assert timer.seconds_remaining(now=2000.0) == 0
+
+
+def test_timer_pause_offsets_deadline():
+    timer = TimerState()
+    timer.start(task_index=0, duration_minutes=10, now=1000.0)
+
+    timer.pause(now=1100.0)
+    assert timer.seconds_remaining(now=1500.0) == 500
+    timer.resume(now=1500.0)
+
+    assert timer.paused_seconds == 400
+    assert timer.seconds_remaining(now=1600.0) == 400
+
+
+def test_timer_migrates_legacy_remaining_seconds():
+    timer = TimerState.model_validate(
+        {"running": True, "duration_seconds": 600, "remaining_seconds": 300, "task_index": 1}
+    )
+
+    assert timer.ends_at is not None
+    assert 299 <= timer.remaining_seconds <= 300
+    assert "remaining_seconds" not in timer.model_dump()
+
+
+def test_timer_stopped_with_remaining_is_paused():
+    timer = TimerState(running=False, remaining_seconds=100)
+    assert timer.is_paused
+    assert timer.remaining_seconds == 100
 
 
 @pytest.mark.parametrize(
@@ -52,16 +79,14 @@ def test_timer_is_finished(running, remaining, expected):
 
 def test_timer_should_warn_ten_percent():
     timer = TimerState()
-    timer.start(task_index=0, duration_minutes=10, is_break=False)
+    timer.start(task_index=0, duration_minutes=10, is_break=False, now=1000.0)
+    assert timer.ends_at == 1600.0
 
-    timer.remaining_seconds = 61
-    assert timer.should_warn_ten_percent() is False
-
-    timer.remaining_seconds = 60
-    assert timer.should_warn_ten_percent() is True
+    assert timer.should_warn_ten_percent(now=1539.0) is False
+    assert timer.should_warn_ten_percent(now=1540.0) is True
 
     timer.warned_ten_percent = True
-    assert timer.should_warn_ten_percent() is False
+    assert timer.should_warn_ten_percent(now=1540.0) is False
 
 
 def test_get_incomplete_task_indices():
@@ -75,3 +100,77 @@ def test_get_incomplete_task_indices():
     ]
 
     assert get_incomplete_task_indices(tasks) == [0, 3, 5]
+
+
+def test_promote_into_empty_slot_removes_from_backlog():
+    state = AppState(backlog=[Task(text="First"), Task(text="Second")])
+
+    state.promote(1, 2)
+
+    assert state.tasks[2].text == "Second"
+    assert [task.text for task in state.backlog] == ["First"]
+    assert state.get_incomplete_task_indices() == [2]
+
+
+def test_promote_into_occupied_slot_swaps():
+    state = AppState(backlog=[Task(text="Backlog")])
+    state.tasks[0].text = "Current"
+
+    state.promote(0, 0)
+
+    assert state.tasks[0].text == "Backlog"
+    assert [task.text for task in state.backlog] == ["Current"]
+
+
+def test_state_emits_fine_grained_changes():
+    state = AppState()
+    changes = []
+    state.subscribe(changes.append)
+
+    state.tasks[2].text = "Write"
+    state.tasks[2].text = "Write"
+    state.timer.start(task_index=2, duration_minutes=10, now=0)
+
+    assert changes[0] == StateChange(ChangeKind.TASK, "text", 2)
+    assert len([c for c in changes if c.kind == ChangeKind.TASK]) == 1
+    assert StateChange(ChangeKind.TIMER, "running") in changes
+
+
+def test_incomplete_index_is_maintained_incrementally():
+    state = AppState()
+    state.tasks[1].text = "One"
+    state.tasks[4].text = "Four"
+    assert state.get_incomplete_task_indices() == [1, 4]
+
+    state.tasks[1].completed = True
+    state.set_task(5, Task(text="Five"))
+
+    assert state.get_incomplete_task_indices() == [4, 5]
+
+
+def test_unsubscribe_stops_changes():
+    state = AppState()
+    changes = []
+    unsubscribe = state.subscribe(changes.append)
+    unsubscribe()
+
+    state.tasks[0].text = "Quiet"
+
+    assert changes == []
+
+
+def test_update_from_only_emits_for_differences():
+    state = AppState()
+    state.tasks[0].text = "Same"
+    other = state.model_copy(deep=True)
+    other.tasks[3].text = "External"
+    other.revision = 7
+    changes = []
+    state.subscribe(changes.append)
+
+    state.update_from(other)
+
+    assert changes == [StateChange(ChangeKind.TASK, None, 3)]
+    assert state.tasks[3].text == "External"
+    assert state.get_incomplete_task_indices() == [0, 3]
+    assert state.revision == 7
@@ -0,0 +1,110 @@
+import asyncio
+import io
+import subprocess
+import threading
+
+import pytest
+
+from paper_todo import notifications
+from paper_todo.app import PaperTodoApp
+from paper_todo.notifications import (
+    FileBackend,
+    Notification,
+    Notifier,
+    NullBackend,
+    OsascriptBackend,
+    TerminalBackend,
+    get_backend,
+)
+
+
+class BlockingBackend:
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.sent: list[Notification] = []
+
+    def send(self, notification: Notification, *, timeout: float) -> None:
+        self.release.wait(timeout)
+        self.sent.append(notification)
+
+
+def test_notifier_delivers_through_backend(tmp_path):
+    backend = FileBackend(tmp_path / "notifications.jsonl")
+    notifier = Notifier(backend)
+
+    assert notifier.notify("Paper TODO", "Time's up!", sound="Purr")
+    notifier.close()
+
+    assert backend.read() == [Notification("Paper TODO", "Time's up!", "Purr")]
+    assert notifier.sent_count == 1
+
+
+def test_notifier_deduplicates_within_window():
+    now = [0.0]
+    notifier = Notifier(NullBackend(), dedupe_seconds=30, clock=lambda: now[0])
+
+    assert notifier.notify("Paper TODO", "10% remaining")
+    assert not notifier.notify("Paper TODO", "10% remaining")
+    now[0] = 31.0
+    assert notifier.notify("Paper TODO", "10% remaining")
+    notifier.close()
+
+
+def test_notifier_drops_when_queue_is_full():
+    backend = BlockingBackend()
+    notifier = Notifier(backend, workers=1, queue_size=1, dedupe_seconds=0)
+
+    results = [notifier.notify("Paper TODO", f"message {i}") for i in range(5)]
+    backend.release.set()
+    notifier.close()
+
+    assert not all(results)
+    assert notifier.dropped_count == results.count(False)
+    assert len(backend.sent) == results.count(True)
+
+
+def test_notifier_counts_backend_failures():
+    class TimingOutBackend:
+        def send(self, notification: Notification, *, timeout: float) -> None:
+            raise subprocess.TimeoutExpired("osascript", timeout)
+
+    notifier = Notifier(TimingOutBackend(), timeout=0.1)
+    notifier.notify("Paper TODO", "Time's up!")
+    notifier.close()
+
+    assert notifier.failed_count == 1
+    assert notifier.sent_count == 0
+
+
+def test_terminal_backend_writes_osc9():
+    stream = io.StringIO()
+    TerminalBackend(stream).send(Notification("Paper TODO", "Time's up!"), timeout=1)
+    assert stream.getvalue() == "\x1b]9;Paper TODO: Time's up!\x07\a"
+
+
+async def test_terminal_backend_writes_through_the_running_app(monkeypatch):
+    written = []
+    monkeypatch.setattr(notifications, "_write_to_driver", lambda app, payload: written.append(payload))
+    backend = TerminalBackend()
+    app = PaperTodoApp(notifier=Notifier(backend))
+    async with app.run_test() as pilot:
+        await asyncio.to_thread(backend.send, Notification("Paper TODO", "Time's up!"), timeout=1)
+        await pilot.pause()
+
+    assert written == ["\x1b]9;Paper TODO: Time's up!\x07\a"]
+    assert backend._app is None
+
+
+@pytest.mark.parametrize(
+    ("name", "backend_type"),
+    [("osascript", OsascriptBackend), ("terminal", TerminalBackend), ("none", NullBackend)],
+)
+def test_get_backend_by_name(name, backend_type):
+    assert isinstance(get_backend(name), backend_type)
+
+
+def test_get_backend_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("PAPER_TODO_NOTIFIER", f"file:{tmp_path / 'out.jsonl'}")
+    backend = get_backend()
+    assert isinstance(backend, FileBackend)
+    assert backend.path == tmp_path / "out.jsonl"
@@ -0,0 +1,25 @@
+from paper_todo.widgets import perf_hud
+from paper_todo.widgets.perf_hud import _frames_per_second, _last_and_worst, _rss
+
+
+def test_last_and_worst_keeps_sign_of_largest_deviation():
+    assert _last_and_worst([]) == "-"
+    assert _last_and_worst([0.001, -0.004, 0.002], signed=True) == "+2.0ms  worst -4.0ms"
+    assert _last_and_worst([0.0125, 0.003]) == "3.0ms  worst 12.5ms"
+
+
+def test_frames_per_second_counts_only_the_last_second():
+    assert _frames_per_second([], now=10.0) == "idle"
+    assert _frames_per_second([8.0, 8.5], now=10.0) == "idle"
+    assert _frames_per_second([8.0] + [9.0 + i / 30 for i in range(30)], now=10.0) == "30"
+
+
+def test_rss_without_proc_is_labelled_as_the_peak(monkeypatch):
+    def no_proc(*args, **kwargs):
+        raise OSError
+
+    monkeypatch.setattr(perf_hud, "open", no_proc, raising=False)
+    if perf_hud.resource is None:
+        assert _rss() == "-"
+    else:
+        assert _rss().endswith("MiB peak")
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+import pytest
+from textual.app import App
+
+from paper_todo.animation import RAINBOW_COLORS
+from paper_todo.theme import ThemeMode, get_palette
+from paper_todo.widgets import DurationIndicator, ProgressTrack, TaskIndicator
+from paper_todo.widgets.duration_indicator import DurationState
+from paper_todo.widgets.progress_track import _render_track
+from paper_todo.widgets.task_indicator import IndicatorState
+
+
+def test_render_track_layout():
+    strip = _render_track(10, 4, ThemeMode.DARK, False, 0)
+
+    assert strip.text == "████░░░░░░"
+    assert strip.cell_length == 10
+    assert str(list(strip)[0].style.color.name) == get_palette(ThemeMode.DARK).blue
+
+
+def test_render_track_is_cached():
+    assert _render_track(40, 10, ThemeMode.LIGHT, True, 3) is _render_track(40, 10, ThemeMode.LIGHT, True, 3)
+
+
+@pytest.mark.parametrize("phase", range(len(RAINBOW_COLORS)))
+def test_render_track_rainbow_phase(phase):
+    first_cell = list(_render_track(8, 8, ThemeMode.DARK, True, phase))[0]
+    assert first_cell.style.color.name == RAINBOW_COLORS[phase]
+
+
+async def test_progress_track_rows_share_one_strip():
+    class TrackApp(App):
+        def compose(self):
+            yield ProgressTrack(id="progress-bar")
+
+    app = TrackApp()
+    async with app.run_test(size=(20, 5)) as pilot:
+        track = app.query_one(ProgressTrack)
+        track.styles.height = 3
+        track.set_fill(0.5, theme_mode=ThemeMode.DARK, rainbow=False, phase=0)
+        await pilot.pause()
+
+        assert track.render_line(0) is track.render_line(2)
+        assert track.render_line(0).text == "█" * 10 + "░" * 10
+
+
+@pytest.mark.parametrize(
+    ("make_indicator", "state"),
+    [
+        (lambda state: DurationIndicator("1", state=state), DurationState.DIM),
+        (lambda state: TaskIndicator(1, state=state), IndicatorState.BRIGHT),
+    ],
+)
+def test_indicator_set_state_skips_unchanged(make_indicator, state):
+    indicator = make_indicator(state)
+    with patch.object(indicator, "add_class") as add_class, patch.object(indicator, "remove_class") as remove_class:
+        indicator.set_state(state)
+
+    add_class.assert_not_called()
+    remove_class.assert_not_called()
@@ -0,0 +1,113 @@
+import pytest
+
+from paper_todo import journal
+from paper_todo.models import AppState, Task
+from paper_todo.sqlite_storage import SqliteBackend
+from paper_todo.storage import StateWriter, StorageError, load_state, open_backend, save_state
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SqliteBackend(tmp_path / "state.db")
+    yield backend
+    backend.close()
+
+
+def _state() -> AppState:
+    state = AppState()
+    state.tasks[0].text = "First"
+    state.tasks[1].completed = True
+    state.backlog = [Task(text=f"Backlog {i}") for i in range(3)]
+    state.timer.start(task_index=0, duration_minutes=20, now=1000.0)
+    return state
+
+
+def test_uses_wal_journal_mode(backend):
+    assert backend._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_snapshot_roundtrip(backend):
+    state = _state()
+    backend.write(state, [], snapshot=True)
+    assert backend.load() == state
+
+
+def test_record_updates_single_row(backend):
+    state = _state()
+    backend.write(state, [], snapshot=True)
+
+    state.tasks[3].text = "Edited"
+    state.revision += 1
+    written = backend.write(state, [{**journal.task_edited(3, state.tasks[3]), "rev": state.revision}], snapshot=False)
+
+    # The task row (slot, "Edited", completed) plus the ("revision", rev) meta row.
+    assert written == (8 + len("Edited") + 8) + (len("revision") + 8)
+    assert backend.load() == state
+
+
+def test_snapshot_writes_only_changed_rows(backend):
+    state = _state()
+    backend.write(state, [], snapshot=True)
+    statements = []
+    backend._conn.set_trace_callback(statements.append)
+
+    state.backlog[1].text = "Changed"
+    state.backlog.pop()
+    state.revision += 1
+    backend.write(state, [], snapshot=True)
+
+    writes = [s for s in statements if s.split()[0] in ("INSERT", "UPDATE", "DELETE")]
+    assert len(writes) == 3  # the edited backlog row, the dropped one and the revision
+    assert backend.load() == state
+
+
+def test_promote_matches_in_memory_state(backend):
+    state = _state()
+    backend.write(state, [], snapshot=True)
+
+    state.promote(1, 4)
+    state.promote(0, 0)
+    records = [
+        {**journal.task_promoted(1, 4), "rev": 1},
+        {**journal.task_promoted(0, 0), "rev": 2},
+    ]
+    state.revision = 2
+    backend.write(state, records, snapshot=False)
+
+    assert backend.load() == state
+
+
+def test_migrates_existing_json_state(tmp_path):
+    state = _state()
+    save_state(state, tmp_path / "state.json")
+
+    backend = SqliteBackend(tmp_path / "state.db", legacy_state_file=tmp_path / "state.json")
+    try:
+        assert backend.load() == state
+    finally:
+        backend.close()
+    assert (tmp_path / "state.json").exists()
+
+
+def test_state_writer_with_sqlite_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("PAPER_TODO_STORAGE", "sqlite")
+    state_file = tmp_path / "state.json"
+    writer = StateWriter(state_file, journal=True)
+    state = load_state(state_file)
+    state.tasks[2].text = "Stored"
+    writer.record(state, journal.task_edited(2, state.tasks[2]))
+    writer.close()
+
+    assert isinstance(writer.backend, SqliteBackend)
+    assert not state_file.exists()
+    assert load_state(state_file).tasks[2].text == "Stored"
+
+
+def test_open_backend_rejects_unknown_kind(tmp_path):
+    with pytest.raises(ValueError):
+        open_backend(tmp_path / "state.json", kind="csv")
+
+
+def test_storage_errors_are_wrapped(tmp_path):
+    with pytest.raises(StorageError):
+        SqliteBackend(tmp_path / "missing" / "state.db")
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+ENTRY_POINT_IMPORT_BUDGET_US = 50_000
+# From the first import to the first painted frame of the TUI, headless; generous enough for a loaded CI runner.
+FIRST_FRAME_BUDGET_SECONDS = 2.0
+HEAVY_MODULES = ("textual", "pydantic", "paper_todo.widgets", "paper_todo.app")
+
+
+def _import_times(statement: str, env: dict[str, str] | None = None) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_entry_point_import_within_budget():
+    times = _import_times("from paper_todo.cli import main")
+    assert times["paper_todo.cli"] < ENTRY_POINT_IMPORT_BUDGET_US
+
+
+def test_tui_first_frame_within_budget():
+    # Goes through the real entry point, cli.main() -> app.main(), and stops once the first frame is ready.
+    script = textwrap.dedent(
+        """
+        import time
+
+        started = time.perf_counter()
+
+        import paper_todo.app
+        from paper_todo.cli import main
+
+
+        class FirstFrame(paper_todo.app.PaperTodoApp):
+            def run(self, **kwargs):
+                return super().run(headless=True, **kwargs)
+
+            def on_ready(self):
+                print(time.perf_counter() - started)
+                self.exit()
+
+
+        paper_todo.app.PaperTodoApp = FirstFrame
+        main([])
+        """
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert float(result.stdout.split()[-1]) < FIRST_FRAME_BUDGET_SECONDS
+
+
+@pytest.mark.parametrize("module", HEAVY_MODULES)
+def test_entry_point_does_not_import_heavy_modules(module):
+    assert module not in _import_times("from paper_todo.cli import main")
+
+
+def test_storage_import_has_no_filesystem_side_effects(tmp_path):
+    env = {"XDG_DATA_HOME": str(tmp_path), "PATH": ""}
+    _import_times("import paper_todo.storage", env=env)
+    assert not (tmp_path / "paper-todo").exists()
@@ -1,10 +1,23 @@
 import json
+import time
+import zlib
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from paper_todo.models import AppState
-from paper_todo.storage import _get_default_state_file, _parse_state_file, load_state, save_state
+from paper_todo import journal
+from paper_todo.models import TASK_CHAR_LIMIT, AppState, Task
+from paper_todo.storage import (
+    STATE_MAGIC,
+    STATE_SCHEMA_VERSION,
+    StateWriter,
+    _encode_state,
+    _get_default_state_file,
+    _parse_state_file,
+    load_state,
+    save_state,
+)
 
 
 def test_get_default_state_file_with_xdg(tmp_path, monkeypatch):
@@ -31,13 +44,49 @@ def test_parse_state_file_valid():
     assert parsed.tasks[0].text == "Test task"
 
 
+def test_parse_state_file_trusted_path_skips_validation():
+    state = AppState()
+    state.tasks[3].text = "Trusted"
+    state.timer.start(task_index=3, duration_minutes=20)
+    state.backlog.append(Task(text="Later"))
+
+    with patch.object(AppState, "model_validate", side_effect=AssertionError("validated")):
+        parsed = _parse_state_file(_encode_state(state))
+
+    assert parsed == state
+    assert isinstance(parsed.tasks[3], Task)
+    assert isinstance(parsed.backlog[0], Task)
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        b"paper-todo 2 00000000",
+        b"paper-todo 1 {checksum}",
+    ],
+    ids=["checksum-mismatch", "schema-mismatch"],
+)
+def test_parse_state_file_validates_untrusted_header(header):
+    state = AppState()
+    state.tasks[0].text = "Validated"
+    body = state.model_dump_json().encode()
+    header = header.replace(b"{checksum}", f"{zlib.crc32(body):08x}".encode())
+
+    with patch.object(AppState, "model_validate", wraps=AppState.model_validate) as validate:
+        parsed = _parse_state_file(header + b"\n" + body)
+
+    validate.assert_called_once()
+    assert parsed.tasks[0].text == "Validated"
+
+
 @pytest.mark.parametrize(
     "invalid_content",
     [
         "invalid json {",
         '{"invalid": "data"}',
+        'paper-todo 2 00000000\n{"tasks": 5}',
     ],
-    ids=["malformed-json", "wrong-schema"],
+    ids=["malformed-json", "wrong-schema", "corrupt-body"],
 )
 def test_parse_state_file_invalid(invalid_content):
     result = _parse_state_file(invalid_content)
@@ -72,7 +121,9 @@ def test_save_state(tmp_path):
     save_state(state, state_file)
 
     assert state_file.exists()
-    data = json.loads(state_file.read_text())
+    header, _, body = state_file.read_bytes().partition(b"\n")
+    assert header.split()[:2] == [STATE_MAGIC.encode(), str(STATE_SCHEMA_VERSION).encode()]
+    data = json.loads(body)
     assert data["tasks"][0]["text"] == "Save test"
     assert data["timer"]["task_index"] == 2
 
@@ -82,11 +133,232 @@ def test_load_save_roundtrip(tmp_path):
     original = AppState()
     original.tasks[0].text = "Roundtrip test"
     original.tasks[1].completed = True
-    original.timer.remaining_seconds = 300
+    original.timer.start(task_index=0, duration_minutes=5, now=1000.0)
+    original.timer.pause(now=1000.0)
 
     save_state(original, state_file)
     loaded = load_state(state_file)
 
     assert loaded.tasks[0].text == "Roundtrip test"
     assert loaded.tasks[1].completed is True
+    assert loaded.timer.ends_at == 1300.0
     assert loaded.timer.remaining_seconds == 300
+
+
+def test_state_writer_coalesces_dirty_marks(tmp_path):
+    state_file = tmp_path / "state.json"
+    writer = StateWriter(state_file, flush_interval=60)
+    writer.start()
+    state = AppState()
+    for i in range(10):
+        state.tasks[0].text = f"Edit {i}"
+        writer.mark_dirty(state)
+    assert not state_file.exists()
+
+    writer.close()
+
+    assert writer.flush_count == 1
+    assert writer.bytes_written == len(state_file.read_bytes())
+    assert len(writer.write_seconds) == 1
+    assert load_state(state_file).tasks[0].text == "Edit 9"
+
+
+def test_state_writer_flush_writes_without_waiting_for_interval(tmp_path):
+    state_file = tmp_path / "state.json"
+    writer = StateWriter(state_file, flush_interval=60)
+    writer.start()
+    state = AppState()
+    state.tasks[0].text = "Urgent"
+
+    writer.mark_dirty(state)
+    writer.flush()
+    for _ in range(200):
+        if writer.flush_count:
+            break
+        time.sleep(0.01)
+
+    assert writer.flush_count == 1
+    assert load_state(state_file).tasks[0].text == "Urgent"
+    writer.close()
+    assert writer.flush_count == 1
+
+
+def test_state_writer_close_without_changes_does_not_write(tmp_path):
+    state_file = tmp_path / "state.json"
+    writer = StateWriter(state_file, flush_interval=60)
+    writer.start()
+    writer.close()
+
+    assert writer.flush_count == 0
+    assert not state_file.exists()
+
+
+def test_state_writer_journal_appends_records_instead_of_snapshot(tmp_path):
+    state_file = tmp_path / "state.json"
+    writer = StateWriter(state_file, flush_interval=60, journal=True)
+    state = AppState()
+    state.tasks[2].text = "Journaled"
+    writer.record(state, journal.task_edited(2, state.tasks[2]))
+    writer.close()
+
+    assert not state_file.exists()
+    assert journal.get_journal_file(state_file).exists()
+    assert load_state(state_file).tasks[2].text == "Journaled"
+
+
+def test_state_writer_journal_compacts_past_threshold(tmp_path):
+    state_file = tmp_path / "state.json"
+    writer = StateWriter(state_file, flush_interval=60, journal=True, compact_bytes=1)
+    state = AppState()
+    state.tasks[0].text = "Compacted"
+    writer.record(state, journal.task_edited(0, state.tasks[0]))
+    writer.close()
+
+    assert writer.compaction_count == 1
+    assert not journal.get_journal_file(state_file).exists()
+    loaded = load_state(state_file)
+    assert loaded.tasks[0].text == "Compacted"
+    assert loaded.revision == 1
+
+
+def test_compaction_does_not_snapshot_changes_whose_records_are_still_queued(tmp_path):
+    state_file = tmp_path / "state.json"
+    first = journal.backlog_added(Task(text="A" * TASK_CHAR_LIMIT))
+    writer = StateWriter(state_file, flush_interval=60, journal=True, compact_bytes=len(json.dumps(first)) - 1)
+    state = AppState()
+    state.add_to_backlog(Task(text="A" * TASK_CHAR_LIMIT))
+    writer.record(state, first)
+    # The UI thread has already appended Y when the writer drains and compacts; Y's record follows later.
+    state.add_to_backlog(Task(text="Y"))
+    writer._write_pending()
+    writer.record(state, journal.backlog_added(state.backlog[-1]))
+    writer.close()
+
+    assert writer.compaction_count == 1
+    assert [task.text for task in load_state(state_file).backlog] == ["A" * TASK_CHAR_LIMIT, "Y"]
+
+
+def test_load_state_replays_journal_tail_over_snapshot(tmp_path):
+    state_file = tmp_path / "state.json"
+    state = AppState()
+    state.tasks[0].text = "Snapshot"
+    save_state(state, state_file)
+
+    writer = StateWriter(state_file, flush_interval=60, journal=True)
+    state.tasks[1].text = "Tail"
+    writer.record(state, journal.task_edited(1, state.tasks[1]))
+    writer.close()
+
+    loaded = load_state(state_file)
+    assert loaded.tasks[0].text == "Snapshot"
+    assert loaded.tasks[1].text == "Tail"
+
+
+def test_save_state_discards_journal(tmp_path):
+    state_file = tmp_path / "state.json"
+    journal_file = journal.get_journal_file(state_file)
+    journal.append_records(journal_file, [{"op": "task_edited", "index": 0, "task": {"text": "Stale"}, "rev": 1}])
+
+    save_state(AppState(), state_file)
+
+    assert not journal_file.exists()
+    assert load_state(state_file).tasks[0].text == ""
+
+
+def test_concurrent_writers_rebase_instead_of_overwriting(tmp_path):
+    state_file = tmp_path / "state.json"
+    first = StateWriter(state_file, flush_interval=60, journal=True)
+    second = StateWriter(state_file, flush_interval=60, journal=True)
+    first_state = AppState()
+    second_state = AppState()
+
+    first_state.tasks[0].text = "From first"
+    first.record(first_state, journal.task_edited(0, first_state.tasks[0]))
+    first.close()
+    second_state.tasks[1].text = "From second"
+    second.record(second_state, journal.task_edited(1, second_state.tasks[1]))
+    second.close()
+
+    loaded = load_state(state_file)
+    assert [task.text for task in loaded.tasks[:2]] == ["From first", "From second"]
+    assert loaded.revision == 2
+    assert second.conflict_count == 1
+
+
+def test_snapshot_writers_rebase_instead_of_overwriting(tmp_path):
+    state_file = tmp_path / "state.json"
+    first = StateWriter(state_file, flush_interval=60)
+    second = StateWriter(state_file, flush_interval=60)
+    first_state = AppState()
+    second_state = AppState()
+
+    first_state.tasks[0].text = "From first"
+    first.record(first_state, journal.task_edited(0, first_state.tasks[0]))
+    first.close()
+    second_state.tasks[1].text = "From second"
+    second.record(second_state, journal.task_edited(1, second_state.tasks[1]))
+    second.close()
+
+    loaded = load_state(state_file)
+    assert [task.text for task in loaded.tasks[:2]] == ["From first", "From second"]
+    assert not journal.get_journal_file(state_file).exists()
+    assert second.conflict_count == 1
+
+
+def test_stale_snapshot_does_not_overwrite_newer_revision(tmp_path):
+    state_file = tmp_path / "state.json"
+    stale = StateWriter(state_file, flush_interval=60, journal=True)
+    writer = StateWriter(state_file, flush_interval=60, journal=True)
+    state = AppState()
+    state.tasks[0].text = "Newer"
+    writer.record(state, journal.task_edited(0, state.tasks[0]))
+    writer.close()
+
+    stale.mark_dirty(AppState())
+    stale.close()
+
+    assert load_state(state_file).tasks[0].text == "Newer"
+
+
+def test_pull_returns_state_written_by_another_writer(tmp_path):
+    state_file = tmp_path / "state.json"
+    reader = StateWriter(state_file, flush_interval=60, journal=True)
+    assert reader.pull() is None
+
+    writer = StateWriter(state_file, flush_interval=60, journal=True)
+    state = AppState()
+    state.tasks[4].text = "External"
+    writer.record(state, journal.task_edited(4, state.tasks[4]))
+    writer.close()
+
+    pulled = reader.pull()
+    assert pulled is not None
+    assert pulled.tasks[4].text == "External"
+    assert reader.pull() is None
+    reader.close()
+
+
+def test_pull_waits_for_pending_local_records(tmp_path):
+    state_file = tmp_path / "state.json"
+    save_state(AppState(), state_file)
+    writer = StateWriter(state_file, flush_interval=60, journal=True)
+    state = AppState()
+    state.tasks[0].text = "Local"
+    writer.record(state, journal.task_edited(0, state.tasks[0]))
+
+    assert writer.pull() is None
+    writer.close()
+
+
+def test_legacy_state_without_version_counter_keeps_its_revision(tmp_path):
+    state_file = tmp_path / "state.json"
+    state_file.write_bytes(_encode_state(AppState(revision=9)))
+    writer = StateWriter(state_file, flush_interval=60, journal=True)
+    state = load_state(state_file)
+    state.tasks[0].text = "After upgrade"
+    writer.record(state, journal.task_edited(0, state.tasks[0]))
+    writer.close()
+
+    loaded = load_state(state_file)
+    assert loaded.tasks[0].text == "After upgrade"
+    assert loaded.revision == 10
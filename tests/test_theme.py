@@ -0,0 +1,96 @@
+import json
+import os
+import time
+import tty
+
+import pytest
+
+from paper_todo import theme
+from paper_todo.theme import ThemeMode, detect_system_theme
+
+
+@pytest.fixture(autouse=True)
+def plain_terminal(monkeypatch):
+    for name in ("COLORSCHEME", "COLORFGBG", "TERM_PROGRAM", "TMUX", "SSH_CONNECTION", "SSH_TTY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("TERM", "xterm-256color")
+
+
+@pytest.mark.parametrize(
+    ("reply", "expected"),
+    [
+        (b"\x1b]11;rgb:2424/2727/3a3a\x1b\\\x1b[?62;22c", ThemeMode.DARK),
+        (b"\x1b]11;rgb:fa/f4/ed\x07", ThemeMode.LIGHT),
+        (b"\x1b]11;rgb:f/f/f\x1b\\", ThemeMode.LIGHT),
+    ],
+)
+def test_background_reply_picks_theme(reply, expected):
+    assert theme._theme_for_background(theme._parse_background(reply)) == expected
+
+
+def test_unanswered_query_is_not_a_background():
+    assert theme._parse_background(b"\x1b[?1;2c") is None
+
+
+def test_read_reply_stops_at_device_attributes_instead_of_timeout():
+    terminal, app_side = os.openpty()
+    tty.setcbreak(app_side)
+    try:
+        os.write(terminal, b"\x1b[?62;22c")
+        started = time.monotonic()
+        assert theme._read_reply(app_side, started + 5) == b"\x1b[?62;22c"
+        assert time.monotonic() - started < 1
+    finally:
+        os.close(terminal)
+        os.close(app_side)
+
+
+def test_detected_background_is_cached_per_terminal(tmp_path, monkeypatch):
+    cache_file = tmp_path / "theme-cache.json"
+    queries = []
+    monkeypatch.setattr(theme, "_query_background", lambda: queries.append(None) or (0.98, 0.96, 0.93))
+
+    assert detect_system_theme(cache_file=cache_file) == ThemeMode.LIGHT
+    assert detect_system_theme(cache_file=cache_file) == ThemeMode.LIGHT
+    assert len(queries) == 1
+
+    monkeypatch.setenv("TMUX", "/tmp/tmux-1000/default,1,0")
+    assert detect_system_theme(cache_file=cache_file) == ThemeMode.LIGHT
+    assert len(queries) == 2
+
+
+def test_unanswered_query_is_cached_and_falls_back(tmp_path, monkeypatch):
+    cache_file = tmp_path / "theme-cache.json"
+    queries = []
+    monkeypatch.setattr(theme, "_query_background", lambda: queries.append(None))
+    monkeypatch.setenv("TERM_PROGRAM", "WezTerm")
+
+    assert detect_system_theme(cache_file=cache_file) == ThemeMode.DARK
+    assert detect_system_theme(cache_file=cache_file) == ThemeMode.DARK
+    assert len(queries) == 1
+
+
+def test_expired_cache_entry_is_queried_again(tmp_path, monkeypatch):
+    cache_file = tmp_path / "theme-cache.json"
+    stale = time.time() - theme.THEME_CACHE_SECONDS - 1
+    cache_file.write_text(json.dumps({"|xterm-256color": {"mode": "dark", "at": stale}}))
+    monkeypatch.setattr(theme, "_query_background", lambda: (0.98, 0.96, 0.93))
+
+    assert detect_system_theme(cache_file=cache_file) == ThemeMode.LIGHT
+
+
+@pytest.mark.parametrize(("name", "value"), [("COLORSCHEME", "Catppuccin Latte light"), ("COLORFGBG", "0;15")])
+def test_environment_overrides_cache(tmp_path, monkeypatch, name, value):
+    cache_file = tmp_path / "theme-cache.json"
+    cache_file.write_text(json.dumps({"|xterm-256color": {"mode": "dark", "at": time.time()}}))
+    monkeypatch.setenv(name, value)
+
+    assert detect_system_theme(cache_file=cache_file) == ThemeMode.LIGHT
+
+
+def test_corrupt_cache_is_ignored(tmp_path, monkeypatch):
+    cache_file = tmp_path / "theme-cache.json"
+    cache_file.write_text('{"|xterm-256color": "sepia"}')
+    monkeypatch.setattr(theme, "_query_background", lambda: (0.1, 0.1, 0.1))
+
+    assert detect_system_theme(cache_file=cache_file) == ThemeMode.DARK
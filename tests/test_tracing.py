@@ -0,0 +1,67 @@
+import json
+import threading
+
+import pytest
+
+from paper_todo import tracing
+
+
+@pytest.fixture
+def tracer():
+    recorder = tracing.start()
+    yield recorder
+    tracing.stop()
+
+
+def test_helpers_are_no_ops_when_disabled():
+    assert tracing.tracer is None
+
+    with tracing.span("work", "test", size=1):
+        pass
+    with tracing.begin("async", "test") as pending:
+        pending.end()
+    tracing.instant("mark", "test")
+    tracing.counter("gauge", "test", value=1)
+
+    assert tracing.stop() is None
+
+
+def test_span_records_a_complete_event(tracer):
+    with tracing.span("work", "test", size=3):
+        pass
+
+    (event,) = tracer.events
+    assert event["ph"] == "X"
+    assert (event["name"], event["cat"], event["args"]) == ("work", "test", {"size": 3})
+    assert event["dur"] >= 0
+
+
+def test_begin_pairs_with_a_single_end(tracer):
+    first = tracing.begin("key a", "input")
+    second = tracing.begin("key b", "input")
+    first.end()
+    first.end()
+    second.end()
+
+    phases = [(event["ph"], event["id"]) for event in tracer.events]
+    assert phases == [("b", 1), ("b", 2), ("e", 1), ("e", 2)]
+
+
+def test_stop_writes_trace_with_thread_names(tracer, tmp_path):
+    def worker() -> None:
+        with tracing.span("save_state", "storage"):
+            pass
+
+    thread = threading.Thread(target=worker, name="state-writer")
+    thread.start()
+    thread.join()
+    tracing.counter("frame cost (ms)", "animation", apply=1.5)
+
+    output = tmp_path / "trace.json"
+    assert tracing.stop(output) is tracer
+    assert tracing.tracer is None
+
+    document = json.loads(output.read_text())
+    names = {event["args"]["name"] for event in document["traceEvents"] if event["ph"] == "M"}
+    assert {"state-writer", threading.current_thread().name} <= names
+    assert [event["ph"] for event in document["traceEvents"] if event["ph"] != "M"] == ["X", "C"]
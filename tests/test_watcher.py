@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from paper_todo.models import AppState
+from paper_todo.storage import JsonBackend
+from paper_todo.watcher import StateWatcher, _load_libc
+
+
+@pytest.mark.parametrize(
+    "use_inotify",
+    [
+        pytest.param(True, marks=pytest.mark.skipif(_load_libc() is None, reason="inotify unavailable")),
+        False,
+    ],
+)
+async def test_watcher_coalesces_writes_to_watched_files(tmp_path, use_inotify):
+    watched = tmp_path / "state.lock"
+    changes = []
+    watcher = StateWatcher([watched], lambda: changes.append(None), poll_interval=0.01, use_inotify=use_inotify)
+    watcher.start()
+    try:
+        assert watcher.mode == ("inotify" if use_inotify else "poll")
+        (tmp_path / "unrelated.txt").write_text("ignored")
+        await asyncio.sleep(0.05)
+        assert changes == []
+
+        watched.write_text("1")
+        watched.write_text("2")
+        await asyncio.sleep(0.05)
+        assert len(changes) == 1
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.skipif(_load_libc() is None, reason="inotify unavailable")
+async def test_reading_the_revision_does_not_wake_the_watcher(tmp_path):
+    backend = JsonBackend(tmp_path / "state.json")
+    backend.write(AppState(), [], snapshot=True)
+    changes = []
+    watcher = StateWatcher(backend.watch_paths, lambda: changes.append(None))
+    watcher.start()
+    try:
+        backend.current_revision()
+        backend.load()
+        await asyncio.sleep(0.05)
+        assert changes == []
+    finally:
+        watcher.stop()